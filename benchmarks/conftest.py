@@ -0,0 +1,72 @@
+import json
+import os
+
+import pytest
+
+from src.tombola_manager import (claims_window, control_window, diagnostics_window, game_storage, main_window,
+                                 number_board, view_window)
+from src.tombola_manager.game_journal import GameJournal
+from src.tombola_manager.save_writer import SaveWriter
+from src.tombola_manager.tombola_game import TombolaGame
+
+import fake_tk
+
+WINDOW_MODULES = (claims_window, control_window, diagnostics_window, main_window, number_board, view_window)
+
+
+@pytest.fixture
+def games_dir(tmp_path, monkeypatch):
+    """Run in an empty temporary directory so saves land in tmp_path/games"""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(game_storage, "_storage", None)
+    yield tmp_path / "games"
+    # Saves still queued use relative paths: write them before leaving tmp_path
+    SaveWriter().flush()
+
+
+@pytest.fixture
+def fake_tk_backend(monkeypatch):
+    """Swap tkinter for the counting fake in every window module.
+
+    Set TOMBOLA_BENCH_REAL_TK=1 to keep the real Tk (e.g. under xvfb-run).
+    """
+    if os.environ.get("TOMBOLA_BENCH_REAL_TK"):
+        yield None
+        return
+    for module in WINDOW_MODULES:
+        for name, fake in fake_tk.MODULE_ATTRIBUTES.items():
+            if hasattr(module, name):
+                monkeypatch.setattr(module, name, fake)
+    fake_tk.tk_calls.clear()
+    yield fake_tk.tk_calls
+
+
+@pytest.fixture(scope="session", autouse=True)
+def stop_save_writer():
+    yield
+    SaveWriter().close()
+
+
+def make_game(name, calls=45, log_size=100):
+    """A game with the given number of calls and log entries"""
+    game = TombolaGame(name)
+    for number in range(1, calls + 1):
+        game.add_number(number * 2 - 1 if number <= 45 else (number - 45) * 2)
+    for i in range(log_size):
+        game.log_action('added_number', i % 90 + 1)
+    return game
+
+
+def write_games(directory, count, log_size=100):
+    """Save count games into directory the way the app does"""
+    for i in range(count):
+        GameJournal(f"game{i:05d}", str(directory)).compact(make_game(f"game{i:05d}", i % 90, log_size))
+
+
+def write_legacy_game(directory, name, log_size):
+    """Save a game in the original single-file JSON format"""
+    game = make_game(name, 60, log_size)
+    os.makedirs(directory, exist_ok=True)
+    with open(os.path.join(directory, f"{name}.json"), "w") as f:
+        json.dump({"name": name, "numbers": list(game.numbers), "date": game.date,
+                   "log": [entry.render() for entry in game.log], "last_number": game.last_number, "state": game.state}, f)
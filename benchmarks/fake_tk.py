@@ -0,0 +1,85 @@
+"""Display-free stand-in for the parts of tkinter the windows use.
+
+Every widget accepts any call and counts it in ``tk_calls``, so the
+benchmarks measure the Python side of a redraw plus the number of Tk
+round-trips it would make, without needing a display.
+"""
+import itertools
+import types
+from collections import Counter
+
+tk_calls = Counter()
+_item_ids = itertools.count()
+
+
+class FakeWidget:
+    def __init__(self, *args, **kwargs):
+        self._options = dict(kwargs)
+
+    def __getattr__(self, name):
+        def method(*args, **kwargs):
+            tk_calls[name] += 1
+            if name == "insert":
+                return f"I{next(_item_ids)}"
+            if name in ("after", "after_idle"):
+                return f"after#{next(_item_ids)}"
+            if name == "get":
+                return self._options.get("value", "")
+            if name in ("get_children", "curselection", "winfo_children"):
+                return ()
+            if name in ("winfo_width", "winfo_height"):
+                return 1920
+            return None
+        return method
+
+    def __getitem__(self, key):
+        return self._options.get(key)
+
+    def __setitem__(self, key, value):
+        tk_calls["config"] += 1
+        self._options[key] = value
+
+
+class FakeVar(FakeWidget):
+    def get(self):
+        return self._options.get("value", "")
+
+    def set(self, value):
+        self._options["value"] = value
+
+
+class TclError(Exception):
+    pass
+
+
+def _namespace(**names):
+    return types.SimpleNamespace(**names)
+
+
+tk = _namespace(
+    Tk=FakeWidget, Toplevel=FakeWidget, Label=FakeWidget, Button=FakeWidget, Entry=FakeWidget,
+    Text=FakeWidget, Listbox=FakeWidget, Frame=FakeWidget, Canvas=FakeWidget,
+    StringVar=FakeVar, IntVar=FakeVar, BooleanVar=FakeVar, TclError=TclError,
+    END="end", WORD="word",
+)
+ttk = _namespace(
+    Style=FakeWidget, Frame=FakeWidget, LabelFrame=FakeWidget, Label=FakeWidget,
+    Button=FakeWidget, Entry=FakeWidget, Combobox=FakeWidget, Notebook=FakeWidget,
+    Treeview=FakeWidget, Scrollbar=FakeWidget,
+)
+scrolledtext = _namespace(ScrolledText=FakeWidget)
+messagebox = _namespace(
+    showwarning=lambda *args, **kwargs: None,
+    showerror=lambda *args, **kwargs: None,
+    showinfo=lambda *args, **kwargs: None,
+    askyesno=lambda *args, **kwargs: True,
+)
+filedialog = _namespace(askopenfilename=lambda *args, **kwargs: "",
+                        asksaveasfilename=lambda *args, **kwargs: "")
+tkfont = _namespace(Font=FakeWidget)
+
+# Module attributes replaced in each window module
+MODULE_ATTRIBUTES = {
+    "tk": tk, "ttk": ttk, "scrolledtext": scrolledtext,
+    "messagebox": messagebox, "filedialog": filedialog, "tkfont": tkfont,
+}
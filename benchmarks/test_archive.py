@@ -0,0 +1,30 @@
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from src.tombola_manager.game_archive import GameArchive, archive_games, pack_game, save_document, unpack_game
+
+from conftest import write_games
+
+GAMES = 200
+
+
+@pytest.mark.benchmark(group="archive")
+def test_pack_game(benchmark, games_dir):
+    write_games(games_dir, 1, log_size=1000)
+    document = save_document("game00000", str(games_dir))
+    assert unpack_game(benchmark(pack_game, document)) == document
+
+
+@pytest.mark.benchmark(group="archive")
+def test_read_one_of_many(benchmark, games_dir, tmp_path):
+    write_games(games_dir, GAMES, log_size=200)
+    path = str(tmp_path / "games.tmba")
+    archive_games(path, directory=str(games_dir))
+    document = save_document("game00100", str(games_dir))
+
+    def run():
+        with GameArchive(path) as archive:
+            return archive.read("game00100")
+
+    assert benchmark(run) == document
@@ -0,0 +1,48 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from src.tombola_manager.broadcast_server import BroadcastServer
+from src.tombola_manager.tombola_game import TombolaGame
+
+
+async def _connect(port, count):
+    clients = []
+    for _ in range(count):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(b"GET /events HTTP/1.1\r\nHost: bench\r\n\r\n")
+        await reader.readuntil(b"\r\n\r\n")
+        await reader.readuntil(b"\n\n")  # snapshot
+        clients.append((reader, writer))
+    return clients
+
+
+@pytest.mark.benchmark(group="broadcast")
+@pytest.mark.parametrize("clients", [10, 300])
+def test_call_reaches_every_client(benchmark, clients):
+    """Time from a call on the game to its delta being read by every connected client"""
+    game = TombolaGame("bench")
+    server = BroadcastServer(game, host="127.0.0.1", port=0)
+    server.start()
+    loop = asyncio.new_event_loop()
+    connections = loop.run_until_complete(_connect(server.port, clients))
+    numbers = iter(list(range(1, 91)) * 10)
+
+    async def receive_all():
+        await asyncio.gather(*(reader.readuntil(b"\n\n") for reader, _ in connections))
+
+    def call():
+        number = next(numbers)
+        if not game.add_number(number):
+            game.remove_number(number)
+        loop.run_until_complete(receive_all())
+
+    try:
+        benchmark.pedantic(call, rounds=50, iterations=1)
+    finally:
+        for _, writer in connections:
+            writer.close()
+        loop.close()
+        server.stop()
@@ -0,0 +1,42 @@
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from src.tombola_manager.card_registry import CardRegistry
+from src.tombola_manager.claims_window import ClaimsWindow
+from src.tombola_manager.control_window import ControlWindow
+from src.tombola_manager.tombola_game import TombolaGame
+
+CLAIMS = 500
+
+
+def _game_with_cards(count):
+    """A game with count cards loaded (each the numbers 1-15 shifted) and 40 calls"""
+    game = TombolaGame("bench")
+    cards = CardRegistry()
+    for i in range(count):
+        start = i % 75
+        numbers = list(range(start + 1, start + 16))
+        cards.add_card([numbers[0:5], numbers[5:10], numbers[10:15]])
+    game.set_cards(cards)
+    game.add_numbers(range(1, 81, 2))
+    return game
+
+
+@pytest.mark.benchmark(group="claims")
+def test_check_cards(benchmark):
+    game = _game_with_cards(CLAIMS)
+    checks = benchmark(game.check_cards, range(1, CLAIMS + 1))
+    assert len(checks) == CLAIMS
+
+
+@pytest.mark.benchmark(group="claims")
+def test_claims_panel(benchmark, games_dir, fake_tk_backend):
+    """Typed claims checked by the service and shown in the panel"""
+    game = _game_with_cards(CLAIMS)
+    control = ControlWindow(game)
+    claims = ClaimsWindow(control.service, control.window)
+    text = "\n".join(" ".join(map(str, range(line, line + 10))) for line in range(1, CLAIMS + 1, 10))
+    claims.claims_text.get = lambda *args: text
+    benchmark(claims.check)
+    assert claims.claims == text
@@ -0,0 +1,30 @@
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from src.tombola_manager.diagnostics import Diagnostics
+from src.tombola_manager.diagnostics_window import DiagnosticsWindow
+
+
+@pytest.mark.benchmark(group="diagnostics")
+def test_timer_overhead(benchmark):
+    """Cost of timing one stage, paid on every call"""
+    diagnostics = Diagnostics()
+
+    def timed_block():
+        with diagnostics.timer("bench.empty"):
+            pass
+
+    benchmark(timed_block)
+
+
+@pytest.mark.benchmark(group="diagnostics")
+def test_panel_refresh(benchmark, fake_tk_backend):
+    """One refresh of the diagnostics panel with a few dozen stages and counters"""
+    diagnostics = Diagnostics()
+    for i in range(30):
+        for ns in range(1000, 100000, 1000):
+            diagnostics.record(f"bench.stage{i}", ns)
+        diagnostics.count(f"bench.counter{i}", i)
+    window = DiagnosticsWindow()
+    benchmark(window.refresh)
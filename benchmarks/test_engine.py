@@ -0,0 +1,107 @@
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+import asyncio
+
+from src.tombola_manager.card_registry import CardRegistry
+from src.tombola_manager.game_engine import GameEngine
+from src.tombola_manager.game_service import GameService
+from src.tombola_manager.tombola_game import TombolaGame
+
+
+def _card_rows(i):
+    # 15 distinct numbers spread over three rows, varied per card
+    numbers = [(i * 7 + k * 6) % 90 + 1 for k in range(15)]
+    return [numbers[0:5], numbers[5:10], numbers[10:15]]
+
+
+def _play_full_game(game):
+    for number in range(1, 91):
+        game.add_number(number)
+    for number in range(1, 91):
+        game.remove_number(number)
+
+
+@pytest.mark.benchmark(group="engine")
+def test_add_remove_throughput(benchmark):
+    game = TombolaGame("bench")
+    benchmark(_play_full_game, game)
+
+
+@pytest.mark.benchmark(group="engine")
+@pytest.mark.parametrize("cards", [600, 6000])
+def test_add_remove_throughput_with_cards(benchmark, cards):
+    game = TombolaGame("bench")
+    registry = CardRegistry()
+    for i in range(cards):
+        registry.add_card(_card_rows(i))
+    game.set_cards(registry)
+    benchmark(_play_full_game, game)
+
+
+@pytest.mark.benchmark(group="engine")
+def test_snapshot(benchmark):
+    game = TombolaGame("bench")
+    for number in range(1, 46):
+        game.add_number(number)
+    for i in range(1000):
+        game.log_action('added_number', i % 90 + 1)
+    benchmark(game.snapshot)
+
+
+@pytest.mark.benchmark(group="service")
+def test_service_call_cycle(benchmark, games_dir):
+    """Validation, mutation, logging and queueing the save, as done on the Tk thread"""
+    service = GameService(TombolaGame("bench"))
+
+    def cycle():
+        for number in range(1, 91):
+            service.add_number(str(number))
+        for number in range(1, 91):
+            service.remove_number(str(number))
+
+    benchmark(cycle)
+    service.flush()
+
+
+@pytest.mark.benchmark(group="history")
+@pytest.mark.parametrize("moves", [100, 10000])
+def test_board_at(benchmark, moves):
+    """Rebuilding the board at an arbitrary move, against history length"""
+    game = TombolaGame("bench")
+    while len(game.history) < moves:
+        for number in range(1, 91):
+            game.add_number(number)
+        for number in range(1, 91):
+            game.remove_number(number)
+    positions = iter(range(10 ** 9))
+    benchmark(lambda: game.history.board_at(next(positions) * 7919 % moves))
+
+
+@pytest.mark.benchmark(group="multi-game")
+@pytest.mark.parametrize("games", [1, 100, 1000])
+def test_engine_command_latency(benchmark, games_dir, games):
+    """One add or remove through the async engine API, against the number of live games"""
+    engine = GameEngine()
+    loop = asyncio.new_event_loop()
+    names = [f"hall{i:04d}" for i in range(games)]
+
+    async def open_all():
+        await asyncio.gather(*(engine.open_game(name) for name in names))
+
+    loop.run_until_complete(open_all())
+    commands = iter(range(10 ** 9))
+
+    def command():
+        i = next(commands)
+        name = names[i * 7919 % games]
+        number = str(i % 90 + 1)
+        if not loop.run_until_complete(engine.add_number(name, number)).ok:
+            loop.run_until_complete(engine.remove_number(name, number))
+
+    try:
+        benchmark.pedantic(command, rounds=500, iterations=1)
+    finally:
+        loop.run_until_complete(engine.shutdown())
+        loop.close()
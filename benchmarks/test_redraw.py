@@ -0,0 +1,145 @@
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from src.tombola_manager.control_window import ControlWindow
+from src.tombola_manager.game_catalog import CATALOG_FILE, GameCatalog
+from src.tombola_manager.main_window import MainWindow
+from src.tombola_manager.number_board import BOARD_ENV, BOARDS
+from src.tombola_manager.tombola_game import TombolaGame
+from src.tombola_manager.view_window import ViewWindow
+
+from conftest import write_games
+
+
+def _windows():
+    game = TombolaGame("bench")
+    view = ViewWindow(game)
+    control = ControlWindow(game)
+    return game, view, control
+
+
+@pytest.fixture(params=sorted(BOARDS))
+def board(request, monkeypatch):
+    """Run once with each board renderer"""
+    monkeypatch.setenv(BOARD_ENV, request.param)
+    return request.param
+
+
+@pytest.mark.benchmark(group="redraw")
+def test_window_creation(benchmark, games_dir, fake_tk_backend, board):
+    benchmark(_windows)
+
+
+@pytest.mark.benchmark(group="redraw")
+def test_redraw_after_call(benchmark, games_dir, fake_tk_backend, board):
+    """View and control redraw after one call, with the Tk calls it makes"""
+    game, view, control = _windows()
+    numbers = iter(range(1, 91))
+
+    def call():
+        control.service.add_number(str(next(numbers)))
+        # What after_idle would run at the end of the Tk event
+        view.updates.flush()
+        control.updates.flush()
+
+    if fake_tk_backend is not None:
+        fake_tk_backend.clear()
+    benchmark.pedantic(call, rounds=90, iterations=1)
+    if fake_tk_backend is not None:
+        benchmark.extra_info["tk_calls_per_call"] = sum(fake_tk_backend.values()) / 90
+
+
+@pytest.mark.benchmark(group="redraw")
+@pytest.mark.parametrize("views", [1, 4])
+def test_call_burst(benchmark, games_dir, fake_tk_backend, views):
+    """Ten quick calls redrawn once per window, against the number of views"""
+    game, view, control = _windows()
+    windows = [view, control] + [ViewWindow(game) for _ in range(views - 1)]
+    bursts = iter(range(1, 91, 10))
+
+    def burst():
+        first = next(bursts)
+        for number in range(first, first + 10):
+            control.service.add_number(str(number))
+        for window in windows:
+            window.updates.flush()
+
+    if fake_tk_backend is not None:
+        fake_tk_backend.clear()
+    benchmark.pedantic(burst, rounds=9, iterations=1)
+    if fake_tk_backend is not None:
+        benchmark.extra_info["tk_calls_per_burst"] = sum(fake_tk_backend.values()) / 9
+
+
+@pytest.mark.benchmark(group="redraw")
+@pytest.mark.parametrize("mode", ["single", "batch"])
+def test_catch_up(benchmark, games_dir, fake_tk_backend, mode):
+    """Entering 20 numbers from paper one by one, each redrawn, or as one batch"""
+    numbers = list(range(1, 21))
+
+    def setup():
+        game, view, control = _windows()
+        return (view, control), {}
+
+    def catch_up(view, control):
+        if mode == "batch":
+            control.service.add_numbers(" ".join(map(str, numbers)))
+            view.updates.flush()
+            control.updates.flush()
+        else:
+            for number in numbers:
+                control.service.add_number(str(number))
+                view.updates.flush()
+                control.updates.flush()
+
+    benchmark.pedantic(catch_up, setup=setup, rounds=20, iterations=1)
+
+
+@pytest.mark.benchmark(group="redraw")
+def test_view_resize(benchmark, games_dir, fake_tk_backend):
+    """Font update of the board after a resize, with the Tk calls it makes"""
+    game, view, control = _windows()
+    for number in range(1, 46):
+        game.add_number(number)
+    view.update_display()
+    widths = iter(range(800, 10 ** 6, 40))
+
+    def resize():
+        view.window.winfo_width = lambda: next(widths)
+        view.adjust_font_size()
+
+    if fake_tk_backend is not None:
+        fake_tk_backend.clear()
+    benchmark.pedantic(resize, rounds=50, iterations=1)
+    if fake_tk_backend is not None:
+        benchmark.extra_info["tk_calls_per_resize"] = sum(fake_tk_backend.values()) / 50
+
+
+@pytest.mark.benchmark(group="games-dir")
+@pytest.mark.parametrize("games", [100, 2000])
+def test_games_list(benchmark, games_dir, fake_tk_backend, games):
+    """Refresh of the MainWindow load list for a large games directory, catalog up to date"""
+    write_games(games_dir, games)
+    window = MainWindow()
+    benchmark(window.update_games_list)
+
+
+@pytest.mark.benchmark(group="games-dir")
+def test_catalog_cold_build(benchmark, games_dir):
+    """First catalog build, which has to read every save"""
+    write_games(games_dir, 2000)
+
+    def build():
+        (games_dir / CATALOG_FILE).unlink(missing_ok=True)
+        GameCatalog(str(games_dir)).refresh()
+
+    benchmark.pedantic(build, rounds=3, iterations=1)
+
+
+@pytest.mark.benchmark(group="games-dir")
+def test_open_game_from_large_dir(benchmark, games_dir, fake_tk_backend):
+    write_games(games_dir, 2000)
+    window = MainWindow()
+    window.games_table.selection = lambda: ("game01999",)
+    benchmark(window.load_game)
@@ -0,0 +1,17 @@
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+pytest.importorskip("numpy")
+
+from src.tombola_manager.draw_simulator import generated_cards, simulate
+
+
+@pytest.mark.benchmark(group="simulator")
+@pytest.mark.parametrize("sold", [60, 600])
+def test_simulate_draws(benchmark, sold):
+    cards = generated_cards(sold, seed=1)
+    result = benchmark(simulate, cards, 5000, seed=2, workers=1, chunk_draws=1000)
+    assert result.draws == 5000
+    assert result.calls["tombola"].sum() == 5000
+    # Same seed, same result in a process pool
+    assert result.summary() == simulate(cards, 5000, seed=2, workers=2, chunk_draws=1000).summary()
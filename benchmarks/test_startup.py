@@ -0,0 +1,30 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# What main.py imports before the start screen shows; prints the modules that must wait for a game
+STARTUP_IMPORT = """
+import sys
+from src.tombola_manager.main_window import MainWindow
+print(" ".join(name for name in ("asyncio", "src.tombola_manager.control_window",
+                                 "src.tombola_manager.view_window", "src.tombola_manager.translations.it")
+               if name in sys.modules))
+"""
+
+
+def _import_main_window():
+    return subprocess.run([sys.executable, "-c", STARTUP_IMPORT], cwd=ROOT, check=True,
+                          capture_output=True, text=True).stdout
+
+
+@pytest.mark.benchmark(group="startup")
+def test_startup_import(benchmark):
+    """Cold import of the start screen in a fresh interpreter"""
+    loaded = benchmark.pedantic(_import_main_window, rounds=5)
+    assert loaded.split() == []
@@ -0,0 +1,34 @@
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from src.tombola_manager.game_stats import ArchiveStats, STATS_FILE
+
+from conftest import write_games
+
+GAMES = 500
+
+
+@pytest.mark.benchmark(group="stats")
+def test_stats_cold(benchmark, games_dir):
+    write_games(games_dir, GAMES, log_size=200)
+
+    def run():
+        (games_dir / STATS_FILE).unlink(missing_ok=True)
+        stats = ArchiveStats(str(games_dir))
+        return stats.refresh(workers=1)
+
+    assert benchmark(run) == GAMES
+
+
+@pytest.mark.benchmark(group="stats")
+def test_stats_cached(benchmark, games_dir):
+    write_games(games_dir, GAMES, log_size=200)
+    ArchiveStats(str(games_dir)).refresh(workers=1)
+
+    def run():
+        stats = ArchiveStats(str(games_dir))
+        stats.refresh(workers=1)
+        return stats.totals()
+
+    assert benchmark(run)["games"] == GAMES
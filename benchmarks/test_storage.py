@@ -0,0 +1,103 @@
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from src.tombola_manager.game_journal import GameJournal
+from src.tombola_manager.sqlite_storage import SqliteStorage
+
+from conftest import make_game, write_legacy_game
+
+LOG_SIZES = [100, 1000, 10000]
+
+
+@pytest.mark.benchmark(group="save")
+@pytest.mark.parametrize("log_size", LOG_SIZES)
+def test_save_one_call(benchmark, games_dir, log_size):
+    """Journal append for one call, against the size of the log already saved"""
+    game = make_game("bench", 44, log_size)
+    journal = GameJournal("bench", str(games_dir), compact_every=10 ** 9)
+    journal.record(game)
+    numbers = iter(range(2, 91, 2))
+
+    def call():
+        number = next(numbers)
+        game.add_number(number)
+        game.log_action('added_number', number)
+        journal.record(game)
+
+    benchmark.pedantic(call, rounds=40, iterations=1)
+
+
+@pytest.mark.benchmark(group="save")
+@pytest.mark.parametrize("log_size", LOG_SIZES)
+def test_compact(benchmark, games_dir, log_size):
+    """Full snapshot rewrite, against log size"""
+    game = make_game("bench", 45, log_size)
+    journal = GameJournal("bench", str(games_dir))
+    benchmark(journal.compact, game)
+
+
+@pytest.mark.benchmark(group="load")
+@pytest.mark.parametrize("log_size", LOG_SIZES)
+def test_load_snapshot_and_journal(benchmark, games_dir, log_size):
+    game = make_game("bench", 45, log_size)
+    journal = GameJournal("bench", str(games_dir), compact_every=10 ** 9)
+    journal.record(game)
+    for number in range(2, 60, 2):
+        game.add_number(number)
+        game.log_action('added_number', number)
+        journal.record(game)
+    benchmark(GameJournal("bench", str(games_dir)).load)
+
+
+@pytest.mark.benchmark(group="load")
+@pytest.mark.parametrize("log_size", LOG_SIZES)
+def test_load_log_tail(benchmark, games_dir, log_size):
+    """Opening a game the way the windows do: header, journal and the last log page only"""
+    GameJournal("bench", str(games_dir)).compact(make_game("bench", 45, log_size))
+    benchmark(GameJournal("bench", str(games_dir)).load, log_tail=500)
+
+
+@pytest.mark.benchmark(group="load")
+def test_upgrade_legacy_json(benchmark, games_dir):
+    """Streaming a 10000-entry single-file save into the header layout"""
+
+    def setup():
+        write_legacy_game(str(games_dir), "legacy", 10000)
+        return (), {}
+
+    benchmark.pedantic(lambda: GameJournal("legacy", str(games_dir)).upgrade(), setup=setup, rounds=5)
+
+
+@pytest.mark.benchmark(group="load")
+@pytest.mark.parametrize("log_size", LOG_SIZES)
+def test_load_legacy_json(benchmark, games_dir, log_size):
+    write_legacy_game(str(games_dir), "legacy", log_size)
+    benchmark(GameJournal("legacy", str(games_dir)).load)
+
+
+@pytest.mark.benchmark(group="save")
+@pytest.mark.parametrize("log_size", LOG_SIZES)
+def test_sqlite_save_one_call(benchmark, games_dir, log_size):
+    """One-transaction SQLite save for one call, against log size"""
+    storage = SqliteStorage(str(games_dir / "bench.db"), migrate_from=None)
+    game = make_game("bench", 44, log_size)
+    journal = storage.journal("bench")
+    journal.record(game)
+    numbers = iter(range(2, 91, 2))
+
+    def call():
+        number = next(numbers)
+        game.add_number(number)
+        game.log_action('added_number', number)
+        journal.record(game)
+
+    benchmark.pedantic(call, rounds=40, iterations=1)
+
+
+@pytest.mark.benchmark(group="load")
+@pytest.mark.parametrize("log_size", LOG_SIZES)
+def test_sqlite_load(benchmark, games_dir, log_size):
+    storage = SqliteStorage(str(games_dir / "bench.db"), migrate_from=None)
+    storage.journal("bench").record(make_game("bench", 45, log_size))
+    benchmark(storage.journal("bench").load)
@@ -1,4 +1,17 @@
-pyinstaller --onefile ^
+@echo off
+rem Usage: create_exe.bat [onefile|onedir]
+rem onefile (default): a single "Tombola Manager.exe" that unpacks itself into a
+rem temporary folder on every launch.
+rem onedir: "dist\Tombola Manager\" holding the exe next to its files; nothing is
+rem unpacked at launch, so it starts faster. Copy the whole folder.
+set MODE=%~1
+if "%MODE%"=="" set MODE=onefile
+if /I not "%MODE%"=="onefile" if /I not "%MODE%"=="onedir" (
+    echo Unknown mode "%MODE%": use onefile or onedir
+    exit /b 1
+)
+
+pyinstaller --%MODE% ^
             --noconsole ^
             --icon=src/tombola_manager/icon/icon.ico ^
             --windowed ^
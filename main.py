@@ -1,8 +1,33 @@
-from tombola_manager.main_window import MainWindow
+import argparse
+import os
+import time
 
-def main():
-    app = MainWindow()
-    app.run()
+STARTED_NS = time.perf_counter_ns()
+
+from src.tombola_manager.diagnostics import (PROFILE_ENV, PROFILE_MODES, STARTUP_TRACE_ENV, STARTUP_TRACE_MODES,
+                                             ProfileCapture, StartupTrace)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Tombola Manager")
+    parser.add_argument("--profile", choices=PROFILE_MODES, default=os.environ.get(PROFILE_ENV) or None,
+                        help="capture a cProfile (cpu) and/or tracemalloc (memory) profile into profiles/")
+    parser.add_argument("--trace-startup", choices=STARTUP_TRACE_MODES,
+                        default=os.environ.get(STARTUP_TRACE_ENV) or None,
+                        help="write import and first paint times into profiles/ (exit: then close)")
+    args = parser.parse_args(argv)
+
+    trace = StartupTrace(args.trace_startup, STARTED_NS)
+    with ProfileCapture(args.profile) as capture:
+        # The game windows are only imported when a game is opened
+        with trace.stage("import"):
+            from src.tombola_manager.main_window import MainWindow
+        with trace.stage("main_window"):
+            app = MainWindow()
+        trace.first_paint(app.window)
+        app.run()
+    trace.stop()
+    for path in capture.paths:
+        print(f"Profile written to {path}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
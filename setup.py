@@ -20,8 +20,13 @@ setup(
         'License :: OSI Approved :: MIT License',
         'Operating System :: OS Independent',
     ],
-    python_requires='>=3.7',
+    python_requires='>=3.10',
     install_requires=[
         'pyinstaller',
     ],
+    extras_require={
+        'cards': ['numpy'],
+        'bench': ['pytest', 'pytest-benchmark'],
+        'test': ['pytest'],
+    },
 )
\ No newline at end of file
@@ -0,0 +1,314 @@
+import argparse
+import asyncio
+import collections
+import json
+import random
+import socket
+import threading
+import time
+from urllib.parse import parse_qs, urlsplit
+
+from .game_events import NUMBER_ADDED, NUMBER_REMOVED, STATE_CHANGED
+from .utils import broadcast_port
+
+DEFAULT_PORT = 8090
+
+# Deltas kept for clients resuming after a short disconnect
+HISTORY_SIZE = 1000
+# Seconds between keep-alive comments on idle event streams
+HEARTBEAT = 15
+# A client with more than this many bytes not yet sent is too slow and is dropped
+MAX_CLIENT_BUFFER = 256 * 1024
+
+DELTA_TYPES = {NUMBER_ADDED: "add", NUMBER_REMOVED: "remove", STATE_CHANGED: "state"}
+
+BOARD_PAGE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><meta name="viewport" content="width=device-width, initial-scale=1">
+<title>Tombola</title>
+<style>
+body { margin: 0; background: #2e2e2e; color: #fff; font-family: sans-serif; }
+h1 { text-align: center; font-size: 5vmin; margin: 2vmin; }
+#board { display: grid; grid-template-columns: repeat(10, 1fr); gap: 0.6vmin; padding: 1vmin; }
+#board div { text-align: center; font-size: 5vmin; padding: 1vmin 0; color: #4e4e4e; }
+#board div.called { background: #4e4e4e; color: #fff; font-weight: bold; }
+#board div.last { background: green; color: #fff; font-weight: bold; }
+#offline { display: none; text-align: center; color: #f66; }
+</style></head>
+<body><h1 id="title"></h1><div id="offline">&#9679; offline</div><div id="board"></div>
+<script>
+const board = document.getElementById("board"), cells = [null];
+for (let n = 1; n <= 90; n++) {
+  const cell = document.createElement("div");
+  cell.textContent = n; board.appendChild(cell); cells.push(cell);
+}
+let called = new Set(), last = null, name = "";
+function show(state) {
+  cells.forEach((cell, n) => { if (cell) cell.className = n === last ? "last" : called.has(n) ? "called" : ""; });
+  document.getElementById("title").textContent = name + ": " + state;
+}
+const events = new EventSource("events");
+events.addEventListener("snapshot", e => {
+  const s = JSON.parse(e.data); name = s.name; called = new Set(s.numbers); last = s.last; show(s.state);
+});
+events.addEventListener("delta", e => {
+  const d = JSON.parse(e.data);
+  d.numbers.forEach(n => d.type === "add" ? called.add(n) : d.type === "remove" && called.delete(n));
+  last = d.last; show(d.state);
+});
+events.onopen = () => document.getElementById("offline").style.display = "none";
+events.onerror = () => document.getElementById("offline").style.display = "block";
+</script></body></html>
+"""
+
+
+def _sse(event, event_id, data):
+    return f"id: {event_id}\nevent: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n".encode()
+
+
+def _response(status, content_type, body):
+    return (f"HTTP/1.1 {status}\r\nContent-Type: {content_type}\r\n"
+            f"Content-Length: {len(body)}\r\nCache-Control: no-store\r\n"
+            f"Connection: close\r\n\r\n").encode() + body
+
+
+def local_address():
+    """Best guess of this machine's address on the local network"""
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as probe:
+        try:
+            # No packet is sent: connecting a UDP socket only picks the outgoing interface
+            probe.connect(("10.255.255.255", 1))
+            return probe.getsockname()[0]
+        except OSError:
+            return "127.0.0.1"
+
+
+class BroadcastServer:
+    """Serves a live board of one game to browsers on the local network.
+
+    ``GET /`` is a small self-contained page, ``GET /events`` a
+    Server-Sent Events stream: a ``snapshot`` event on connect, then a
+    ``delta`` event per call, removal or state change. Event ids are
+    ``<run>.<seq>``, seq being the game's event number and run telling apart
+    server starts. A client reconnecting with ``Last-Event-ID`` (which
+    browsers send by themselves) or ``?since=<id>`` only gets the deltas it
+    missed, as long as they are still in the history. ``GET /snapshot``
+    returns the current board as JSON.
+
+    The server runs its own asyncio loop on a background thread; game events
+    arrive on the Tk thread and are handed over with call_soon_threadsafe.
+    Each delta is encoded once and written to every client.
+    """
+
+    def __init__(self, game, host="0.0.0.0", port=DEFAULT_PORT, history_size=HISTORY_SIZE):
+        self.game = game
+        self.host = host
+        self.port = port
+        self.history = collections.deque(maxlen=history_size)  # (seq, encoded delta)
+        self.clients = set()
+        self.loop = None
+        self._server = None
+        self._thread = None
+        # Board as last broadcast; only touched on the loop thread once started
+        self._name = game.name
+        self._numbers = set(game.numbers)
+        self._last = game.last_number
+        self._state = game.state
+        self._seq = game.event_seq
+        self._history_start = self._seq  # Clients that saw this event can resume
+        self.run_id = format(time.time_ns() // 1000000, "x")
+
+    def start(self):
+        """Open the port and serve on a background thread; raises OSError if the port is taken"""
+        started = threading.Event()
+        errors = []
+
+        def run():
+            self.loop = asyncio.new_event_loop()
+            try:
+                self._server = self.loop.run_until_complete(
+                    asyncio.start_server(self._handle, self.host, self.port, backlog=512))
+            except OSError as e:
+                errors.append(e)
+                started.set()
+                self.loop.close()
+                return
+            self.port = self._server.sockets[0].getsockname()[1]
+            started.set()
+            try:
+                self.loop.run_forever()
+            finally:
+                self.loop.run_until_complete(self._shutdown())
+                self.loop.close()
+
+        self._thread = threading.Thread(target=run, name="BroadcastServer", daemon=True)
+        self._thread.start()
+        started.wait()
+        if errors:
+            raise errors[0]
+        self.game.subscribe(self.on_event)
+
+    def stop(self):
+        self.game.unsubscribe(self.on_event)
+        if self._thread is not None and self.loop is not None and self.loop.is_running():
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self._thread.join(timeout=5)
+        self._thread = None
+
+    def url(self):
+        host = local_address() if self.host in ("0.0.0.0", "") else self.host
+        return f"http://{host}:{self.port}/"
+
+    def on_event(self, event):
+        """Game subscriber: forward calls, removals and state changes to the loop"""
+        kind = DELTA_TYPES.get(event.kind)
+        if kind is None:
+            return
+        delta = {"seq": event.seq, "type": kind, "numbers": list(event.numbers),
+                 "state": self.game.state, "last": self.game.last_number}
+        self.loop.call_soon_threadsafe(self._broadcast, delta)
+
+    def _event_id(self, seq):
+        return f"{self.run_id}.{seq}"
+
+    def _parse_event_id(self, event_id):
+        """seq of an event id sent by this run of the server, else None"""
+        run_id, _, seq = str(event_id).partition(".")
+        if run_id != self.run_id:
+            return None
+        try:
+            return int(seq)
+        except ValueError:
+            return None
+
+    def _snapshot(self):
+        return {"seq": self._seq, "name": self._name, "numbers": sorted(self._numbers),
+                "last": self._last, "state": self._state}
+
+    def _broadcast(self, delta):
+        if delta["type"] == "add":
+            self._numbers.update(delta["numbers"])
+        elif delta["type"] == "remove":
+            self._numbers.difference_update(delta["numbers"])
+        self._last = delta["last"]
+        self._state = delta["state"]
+        self._seq = delta["seq"]
+
+        message = _sse("delta", self._event_id(delta["seq"]), delta)
+        if len(self.history) == self.history.maxlen:
+            self._history_start = self.history[0][0]
+        self.history.append((delta["seq"], message))
+        for writer in list(self.clients):
+            if writer.transport.get_write_buffer_size() > MAX_CLIENT_BUFFER:
+                self.clients.discard(writer)
+                writer.close()
+            else:
+                writer.write(message)
+
+    async def _handle(self, reader, writer):
+        try:
+            request = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), HEARTBEAT)
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, asyncio.LimitOverrunError,
+                ConnectionError):
+            writer.close()
+            return
+        lines = request.decode("latin-1").split("\r\n")
+        try:
+            method, target, _ = lines[0].split(" ", 2)
+        except ValueError:
+            method, target = None, "/"
+        headers = {}
+        for line in lines[1:]:
+            key, _, value = line.partition(":")
+            headers[key.strip().lower()] = value.strip()
+        url = urlsplit(target)
+
+        try:
+            if method != "GET":
+                writer.write(_response("405 Method Not Allowed", "text/plain", b"GET only\n"))
+            elif url.path == "/":
+                writer.write(_response("200 OK", "text/html; charset=utf-8", BOARD_PAGE.encode()))
+            elif url.path == "/snapshot":
+                writer.write(_response("200 OK", "application/json",
+                                       json.dumps(self._snapshot()).encode()))
+            elif url.path == "/events":
+                since = parse_qs(url.query).get("since", [headers.get("last-event-id")])[0]
+                await self._stream(reader, writer, since)
+                return
+            else:
+                writer.write(_response("404 Not Found", "text/plain", b"Not found\n"))
+            await writer.drain()
+        except ConnectionError:
+            pass
+        writer.close()
+
+    async def _stream(self, reader, writer, since):
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\n"
+                     b"Cache-Control: no-store\r\nConnection: keep-alive\r\n"
+                     b"Access-Control-Allow-Origin: *\r\n\r\n")
+        since = self._parse_event_id(since)
+        if since is not None and self._history_start <= since <= self._seq:
+            writer.write(b"".join(message for seq, message in self.history if seq > since))
+        else:
+            writer.write(_sse("snapshot", self._event_id(self._seq), self._snapshot()))
+        self.clients.add(writer)
+        try:
+            while writer in self.clients:
+                try:
+                    # Clients send nothing after the request: data or EOF means they are gone
+                    if not await asyncio.wait_for(reader.read(1024), HEARTBEAT):
+                        break
+                except asyncio.TimeoutError:
+                    writer.write(b": ping\n\n")
+                    await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self.clients.discard(writer)
+            writer.close()
+
+    async def _shutdown(self):
+        self._server.close()
+        for writer in list(self.clients):
+            writer.close()
+        self.clients.clear()
+        tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await self._server.wait_closed()
+
+
+def main(argv=None):
+    from .game_storage import get_storage
+    from .tombola_game import TombolaGame
+
+    parser = argparse.ArgumentParser(description="Serve the live board of a saved game")
+    parser.add_argument("game", help="name of the saved game")
+    parser.add_argument("--host", default="0.0.0.0")
+    port = broadcast_port()
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT if port is None else port)
+    parser.add_argument("--demo", type=float, metavar="SECONDS", default=None,
+                        help="call a random number every SECONDS (the game is not saved)")
+    args = parser.parse_args(argv)
+
+    storage = get_storage()
+    storage.refresh()
+    game = storage.journal(args.game).load(log_tail=0) if args.game in storage else TombolaGame(args.game)
+    server = BroadcastServer(game, args.host, args.port)
+    server.start()
+    print(f"Serving {game.name} on {server.url()}")
+    try:
+        while True:
+            time.sleep(args.demo or 3600)
+            if args.demo:
+                remaining = list(game.numbers.complement())
+                if remaining:
+                    game.add_number(random.choice(remaining))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
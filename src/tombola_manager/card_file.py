@@ -0,0 +1,92 @@
+import struct
+
+# Numbers per card and per row, as laid out in the file
+CARD_SIZE = 15
+ROW_SIZE = 5
+
+# Header: magic, format version, number of cards
+CARD_FILE_MAGIC = b"TMBC"
+CARD_FILE_VERSION = 1
+_HEADER = struct.Struct("<4sHI")
+
+
+class CardFileWriter:
+    """Streams cards to a ``.cards`` file.
+
+    After the header every card takes 15 bytes: its numbers row by row, each
+    row in ascending order. A card's serial is its 1-based position in the
+    file. The card count in the header is filled in by ``close``.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.count = 0
+        self._file = open(path, "wb")
+        self._file.write(_HEADER.pack(CARD_FILE_MAGIC, CARD_FILE_VERSION, 0))
+
+    def write_card(self, rows):
+        """Append one card given as 3 rows of 5 numbers"""
+        self.write_bytes(bytes(number for row in rows for number in sorted(row)))
+
+    def write_bytes(self, data):
+        """Append cards already packed as 15 bytes each (e.g. a uint8 array)"""
+        data = memoryview(data).cast("B")
+        if len(data) % CARD_SIZE:
+            raise ValueError(f"Card data must be a multiple of {CARD_SIZE} bytes")
+        self._file.write(data)
+        self.count += len(data) // CARD_SIZE
+
+    def close(self):
+        if self._file.closed:
+            return
+        self._file.seek(0)
+        self._file.write(_HEADER.pack(CARD_FILE_MAGIC, CARD_FILE_VERSION, self.count))
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def _read_header(f, path):
+    """Card count of an open ``.cards`` file; ValueError if it is not one"""
+    data = f.read(_HEADER.size)
+    if len(data) != _HEADER.size:
+        raise ValueError(f"Truncated card file: {path}")
+    magic, version, count = _HEADER.unpack(data)
+    if magic != CARD_FILE_MAGIC or version != CARD_FILE_VERSION:
+        raise ValueError(f"Not a card file: {path}")
+    return count
+
+
+def read_cards(path, chunk_cards=4096):
+    """Yield the cards of a ``.cards`` file as tuples of 3 rows"""
+    with open(path, "rb") as f:
+        remaining = _read_header(f, path)
+        while remaining:
+            chunk = min(chunk_cards, remaining)
+            data = f.read(chunk * CARD_SIZE)
+            if len(data) != chunk * CARD_SIZE:
+                raise ValueError(f"Truncated card file: {path}")
+            for start in range(0, len(data), CARD_SIZE):
+                yield tuple(
+                    tuple(data[row:row + ROW_SIZE])
+                    for row in range(start, start + CARD_SIZE, ROW_SIZE)
+                )
+            remaining -= chunk
+
+
+def read_card_bytes(path, count=None):
+    """The first ``count`` cards (all if None) of a ``.cards`` file as packed bytes, 15 per card"""
+    with open(path, "rb") as f:
+        total = _read_header(f, path)
+        if count is None:
+            count = total
+        elif count > total:
+            raise ValueError(f"{path} has only {total} cards")
+        data = f.read(count * CARD_SIZE)
+    if len(data) != count * CARD_SIZE:
+        raise ValueError(f"Truncated card file: {path}")
+    return data
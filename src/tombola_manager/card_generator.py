@@ -0,0 +1,166 @@
+"""Bulk generator of valid Italian tombola card series.
+
+A series is 6 cards that together hold every number from 1 to 90 exactly
+once. Each card has 3 rows of 5 numbers over 9 columns; column ``c`` holds
+numbers from its decade (1-9, 10-19, ..., 80-90), every column of a card has
+1 to 3 numbers, sorted top to bottom.
+
+Series are built in NumPy batches. Large runs are split into fixed-size
+chunks seeded from one ``SeedSequence``, so the output for a given seed does
+not depend on how many worker processes generate it.
+
+Usage::
+
+    python -m tombola_manager.card_generator cards.cards --series 20000 --seed 42
+"""
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .card_file import CardFileWriter
+from .card_registry import NUMBERS_PER_CARD, NUMBERS_PER_ROW, ROWS_PER_CARD
+
+CARDS_PER_SERIES = 6
+COLUMNS = 9
+# Numbers of each column: 1-9, 10-19, ..., 70-79, 80-90
+COLUMN_NUMBERS = [np.arange(max(1, 10 * c), 10 * c + 10 + (c == COLUMNS - 1), dtype=np.int16)
+                  for c in range(COLUMNS)]
+COLUMN_SIZES = np.array([len(numbers) for numbers in COLUMN_NUMBERS])
+DEFAULT_CHUNK_SERIES = 2000
+
+
+def _column_counts(rng, size):
+    """How many numbers each card of each series takes from each column.
+
+    Returns an array (size, 6, 9) with values 1-3 and card totals of 15, or
+    fewer rows if some series could not be completed (they are dropped).
+    """
+    counts = np.ones((size, CARDS_PER_SERIES, COLUMNS), dtype=np.int8)
+    need = np.full((size, CARDS_PER_SERIES), NUMBERS_PER_CARD - COLUMNS, dtype=np.int8)
+    extras = COLUMN_SIZES - CARDS_PER_SERIES
+    series = np.arange(size)
+
+    # Largest columns first; each extra number goes to a card with the most
+    # numbers still missing, ties and near-ties broken at random.
+    for column in np.argsort(-extras - rng.random(COLUMNS), kind="stable"):
+        for _ in range(extras[column]):
+            score = need + rng.random(need.shape) * 1.5
+            score[(need == 0) | (counts[:, :, column] == 3)] = -np.inf
+            card = np.argmax(score, axis=1)
+            counts[series, card, column] += 1
+            need[series, card] -= 1
+
+    complete = (need == 0).all(axis=1) & (counts <= 3).all(axis=(1, 2))
+    return counts[complete]
+
+
+def _row_layout(rng, counts):
+    """Spread each card's column counts over 3 rows of 5 numbers.
+
+    Columns are placed from the fullest down, each into the rows with the most
+    free places (Ryser's construction), which always succeeds for 3 rows of 5.
+    Returns a boolean array (cards, 3, 9).
+    """
+    cards = counts.shape[0]
+    index = np.arange(cards)
+    layout = np.zeros((cards, ROWS_PER_CARD, COLUMNS), dtype=bool)
+    free = np.full((cards, ROWS_PER_CARD), NUMBERS_PER_ROW, dtype=np.int8)
+    order = np.argsort(-(counts + rng.random(counts.shape) * 0.5), axis=1)
+    for step in range(COLUMNS):
+        column = order[:, step]
+        taken = counts[index, column]
+        key = free + rng.random(free.shape) * 0.5
+        rank = np.argsort(np.argsort(-key, axis=1), axis=1)
+        chosen = rank < taken[:, None]
+        layout[index, :, column] = chosen
+        free -= chosen
+    return layout
+
+
+def _fill_numbers(rng, layout, size):
+    """Put the numbers of each column into the chosen places of each series.
+
+    Returns an array (size, 6, 3, 9) with 0 in the empty places.
+    """
+    layout = layout.reshape(size, CARDS_PER_SERIES * ROWS_PER_CARD, COLUMNS)
+    grid = np.zeros(layout.shape, dtype=np.uint8)
+    for column in range(COLUMNS):
+        places = layout[:, :, column]
+        numbers = rng.permuted(np.tile(COLUMN_NUMBERS[column], (size, 1)), axis=1)
+        # Sort each card's share of the column top to bottom: the places are in
+        # card order, so sorting on (card, number) keeps every share in place.
+        card_of_place = np.nonzero(places)[1].reshape(size, -1) // ROWS_PER_CARD
+        numbers = np.sort(card_of_place * 100 + numbers, axis=1) % 100
+        filled = np.zeros(places.shape, dtype=np.uint8)
+        filled[places] = numbers.ravel()
+        grid[:, :, column] = filled
+    return grid.reshape(size, CARDS_PER_SERIES, ROWS_PER_CARD, COLUMNS)
+
+
+def generate_series(count, seed=None):
+    """Generate ``count`` series as a uint8 array (count * 6, 15).
+
+    Each card row holds its numbers row by row, each row ascending, which is
+    the layout of the ``.cards`` file format.
+    """
+    rng = np.random.default_rng(seed)
+    batches = []
+    missing = count
+    while missing:
+        counts = _column_counts(rng, missing)
+        if not len(counts):
+            continue
+        layout = _row_layout(rng, counts.reshape(-1, COLUMNS))
+        grid = _fill_numbers(rng, layout, len(counts))
+        batches.append(grid)
+        missing -= len(counts)
+    grid = np.concatenate(batches) if batches else np.zeros((0, CARDS_PER_SERIES, ROWS_PER_CARD, COLUMNS), np.uint8)
+    # Every row has exactly 5 numbers, already in column (= ascending) order
+    return grid[grid > 0].reshape(count * CARDS_PER_SERIES, NUMBERS_PER_CARD)
+
+
+def _generate_chunk(args):
+    count, seed_sequence = args
+    return generate_series(count, seed_sequence)
+
+
+def iter_series_chunks(count, seed=None, workers=None, chunk_series=DEFAULT_CHUNK_SERIES):
+    """Yield the cards of ``count`` series as arrays, one per chunk, in order.
+
+    Chunks are generated in a process pool when there is more than one chunk
+    and ``workers`` is not 1.
+    """
+    sizes = [min(chunk_series, count - start) for start in range(0, count, chunk_series)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    jobs = list(zip(sizes, seeds))
+    if workers == 1 or len(jobs) < 2:
+        for job in jobs:
+            yield _generate_chunk(job)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(_generate_chunk, jobs)
+
+
+def write_series(path, count, seed=None, workers=None, chunk_series=DEFAULT_CHUNK_SERIES):
+    """Generate ``count`` series straight into a ``.cards`` file; returns the card count"""
+    with CardFileWriter(path) as writer:
+        for cards in iter_series_chunks(count, seed, workers, chunk_series):
+            writer.write_bytes(np.ascontiguousarray(cards, dtype=np.uint8))
+    return writer.count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate tombola card series")
+    parser.add_argument("output", help="path of the .cards file to write")
+    parser.add_argument("--series", type=int, required=True, help="number of 6-card series")
+    parser.add_argument("--seed", type=int, default=None, help="seed for reproducible output")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="worker processes")
+    args = parser.parse_args(argv)
+    written = write_series(args.output, args.series, args.seed, args.workers)
+    print(f"Wrote {written} cards to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
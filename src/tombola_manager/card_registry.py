@@ -0,0 +1,143 @@
+from array import array
+from collections import namedtuple
+
+from .card_file import read_cards
+from .number_set import MAX_NUMBER, NumberSet, bits_of
+
+ROWS_PER_CARD = 3
+NUMBERS_PER_ROW = 5
+NUMBERS_PER_CARD = ROWS_PER_CARD * NUMBERS_PER_ROW
+
+# Hits in a single row that win each row prize
+ROW_PRIZES = {2: "ambo", 3: "terno", 4: "quaterna", 5: "cinquina"}
+TOMBOLA = "tombola"
+PRIZE_ORDER = ("ambo", "terno", "quaterna", "cinquina", "tombola")
+
+# A prize reached by a card: row is 0-2, or None for a tombola
+Win = namedtuple("Win", ["serial", "row", "prize"])
+# A claimed card checked against the called numbers: per row the hits, the row
+# prize they reach (or None) and the numbers still missing; for the card its
+# best prize and all its missing numbers. serial is None for a card typed in.
+RowCheck = namedtuple("RowCheck", ["hits", "prize", "missing"])
+CardCheck = namedtuple("CardCheck", ["serial", "rows", "prize", "missing"])
+
+
+def validate_card(rows):
+    """Check that rows describe a standard card: 3 rows of 5 distinct numbers in 1-90"""
+    rows = tuple(tuple(row) for row in rows)
+    if len(rows) != ROWS_PER_CARD or any(len(row) != NUMBERS_PER_ROW for row in rows):
+        raise ValueError(f"A card needs {ROWS_PER_CARD} rows of {NUMBERS_PER_ROW} numbers")
+    numbers = [number for row in rows for number in row]
+    if any(not 1 <= number <= MAX_NUMBER for number in numbers):
+        raise ValueError("Card numbers must be between 1 and 90")
+    if len(set(numbers)) != NUMBERS_PER_CARD:
+        raise ValueError("Card numbers must be distinct")
+    return rows
+
+
+def prize_rank(prize):
+    """Position of a prize in PRIZE_ORDER, -1 for None (no prize)"""
+    return PRIZE_ORDER.index(prize) if prize is not None else -1
+
+
+def check_card(row_bits, called_bits, serial=None):
+    """CardCheck of a card given as the NumberSet bits of its rows, against called numbers"""
+    rows = []
+    card_bits = most_hits = 0
+    for bits in row_bits:
+        hits = (bits & called_bits).bit_count()
+        most_hits = max(most_hits, hits)
+        card_bits |= bits
+        rows.append(RowCheck(hits, ROW_PRIZES.get(hits), tuple(NumberSet.from_bits(bits & ~called_bits))))
+    missing = tuple(NumberSet.from_bits(card_bits & ~called_bits))
+    # More hits in a row is a higher row prize
+    return CardCheck(serial, tuple(rows), ROW_PRIZES.get(most_hits) if missing else TOMBOLA, missing)
+
+
+class CardRegistry:
+    """Player cards (cartelle) of a game with incremental prize detection.
+
+    Every card row is indexed under each of its numbers, so marking a called
+    number only touches the rows that contain it and reports the prizes they
+    just reached, however many cards are registered.
+    """
+
+    def __init__(self):
+        self.cards = []  # rows of each card, as tuples
+        self.serials = []
+        self._by_serial = {}
+        # Global row id (card index * 3 + row) of each row containing a number
+        self._index = [array("I") for _ in range(MAX_NUMBER + 1)]
+        self._row_hits = bytearray()
+        self._card_hits = bytearray()
+
+    def __len__(self):
+        return len(self.cards)
+
+    def __contains__(self, serial):
+        return serial in self._by_serial
+
+    @classmethod
+    def load(cls, path):
+        """Build a registry from a ``.cards`` file; serials are the positions in the file"""
+        registry = cls()
+        for rows in read_cards(path):
+            registry.add_card(rows)
+        return registry
+
+    def add_card(self, rows, serial=None):
+        """Register a card given as 3 rows of 5 numbers; returns its serial"""
+        rows = validate_card(rows)
+        card_index = len(self.cards)
+        if serial is None:
+            serial = card_index + 1
+        if serial in self._by_serial:
+            raise ValueError(f"Duplicate card serial: {serial}")
+
+        self.cards.append(rows)
+        self.serials.append(serial)
+        self._by_serial[serial] = card_index
+        for row_index, row in enumerate(rows):
+            row_id = card_index * ROWS_PER_CARD + row_index
+            for number in row:
+                self._index[number].append(row_id)
+        self._row_hits.extend(bytes(ROWS_PER_CARD))
+        self._card_hits.append(0)
+        return serial
+
+    def get_card(self, serial):
+        """Get the rows of the card with the given serial"""
+        return self.cards[self._by_serial[serial]]
+
+    def row_bits(self, serial):
+        """NumberSet bits of each row of the card with the given serial"""
+        return [bits_of(row) for row in self.get_card(serial)]
+
+    def mark(self, number):
+        """Count a called number and return the Wins it produced"""
+        wins = []
+        row_hits = self._row_hits
+        card_hits = self._card_hits
+        for row_id in self._index[number]:
+            row_hits[row_id] += 1
+            card_index, row_index = divmod(row_id, ROWS_PER_CARD)
+            prize = ROW_PRIZES.get(row_hits[row_id])
+            if prize is not None:
+                wins.append(Win(self.serials[card_index], row_index, prize))
+            card_hits[card_index] += 1
+            if card_hits[card_index] == NUMBERS_PER_CARD:
+                wins.append(Win(self.serials[card_index], None, TOMBOLA))
+        return wins
+
+    def unmark(self, number):
+        """Undo mark() for a number that is no longer called"""
+        for row_id in self._index[number]:
+            self._row_hits[row_id] -= 1
+            self._card_hits[row_id // ROWS_PER_CARD] -= 1
+
+    def sync(self, numbers):
+        """Recount the hits from scratch for the given called numbers"""
+        self._row_hits = bytearray(len(self._row_hits))
+        self._card_hits = bytearray(len(self._card_hits))
+        for number in numbers:
+            self.mark(number)
@@ -0,0 +1,105 @@
+import tkinter as tk
+from tkinter import ttk, messagebox
+
+from src.tombola_manager.utils import resource_path
+from src.tombola_manager.language_manager import LanguageManager
+from src.tombola_manager.card_registry import NUMBERS_PER_CARD
+from src.tombola_manager.game_service import WARNING
+from src.tombola_manager.game_events import IdleUpdater, NUMBER_EVENTS, STATE_CHANGED, event_kinds
+
+# Result columns: (column, translation key, width)
+CLAIM_COLUMNS = (
+    ("hits", 'claims_hits', 60),
+    ("prize", 'claims_prize', 90),
+    ("missing", 'claims_missing', 220),
+    ("valid", 'claims_valid', 60),
+)
+
+
+class ClaimsWindow:
+    """Checks the cards claimed by players against the called numbers.
+
+    Several claims are typed at once (serials of the loaded cards, or whole
+    cards); each card shows its best prize, whether it is valid for the
+    prize in play and, row by row, the hits and the numbers still missing.
+    The last claims are checked again whenever the board or the state changes.
+    """
+
+    def __init__(self, service, parent=None):
+        self.window = tk.Toplevel(parent)
+        self.lang = LanguageManager()
+        self.window.title(self.lang.get_text('claims_title'))
+        self.service = service
+        self.claims = None  # Text of the last claims checked
+
+        # Set custom icon
+        self.window.iconbitmap(resource_path('src/tombola_manager/icon/icon.ico'))
+
+        main_frame = ttk.Frame(self.window)
+        main_frame.pack(padx=10, pady=10, fill="both", expand=True)
+
+        tk.Label(main_frame, text=self.lang.get_text('claims_input')).pack(anchor="w")
+        self.claims_text = tk.Text(main_frame, height=5, width=60, font=("Arial", 12))
+        self.claims_text.pack(pady=5, fill="x")
+        tk.Button(main_frame, text=self.lang.get_text('claims_check'), command=self.check,
+                  bg="green", fg="white", font=("Arial", 10)).pack(pady=5)
+        self.summary_label = tk.Label(main_frame, font=("Arial", 10, "bold"))
+        self.summary_label.pack(pady=5)
+
+        # One line per card, with one child line per row
+        self.results_table = ttk.Treeview(main_frame, columns=[c[0] for c in CLAIM_COLUMNS], height=15)
+        self.results_table.heading("#0", text=self.lang.get_text('claims_card'))
+        self.results_table.column("#0", width=110)
+        for column, key, width in CLAIM_COLUMNS:
+            self.results_table.heading(column, text=self.lang.get_text(key))
+            self.results_table.column(column, width=width, anchor="w" if column == "missing" else "center")
+        self.results_table.tag_configure("valid", background="#c8f0c8")
+        self.results_table.tag_configure("invalid", background="#f6d0d0")
+        self.results_table.pack(fill="both", expand=True)
+
+        self.updates = IdleUpdater(service.game, self.window, self.redraw)
+        self.window.protocol("WM_DELETE_WINDOW", self.on_close)
+
+    def check(self):
+        text = self.claims_text.get("1.0", "end")
+        result = self.service.check_claims(text)
+        if not result.ok:
+            rejected = ", ".join(map(str, result.rejected))
+            if result.severity == WARNING:
+                messagebox.showwarning(self.lang.get_text('warning'),
+                                       self.lang.get_text(result.message_key, rejected), parent=self.window)
+            else:
+                messagebox.showerror(self.lang.get_text('error'),
+                                     self.lang.get_text(result.message_key, rejected), parent=self.window)
+            return
+        self.claims = text
+        self.show(result)
+
+    def redraw(self, events):
+        if self.claims is None or not (event_kinds(events) & {*NUMBER_EVENTS, STATE_CHANGED}):
+            return
+        result = self.service.check_claims(self.claims, record=False)
+        if result.ok:
+            self.show(result)
+
+    def show(self, result):
+        table = self.results_table
+        table.delete(*table.get_children())
+        for index, (check, valid) in enumerate(zip(result.checks, result.valid), start=1):
+            card = str(check.serial) if check.serial is not None else self.lang.get_text('claims_typed', index)
+            item = table.insert("", "end", text=card, open=True, tags=("valid" if valid else "invalid",),
+                                values=(NUMBERS_PER_CARD - len(check.missing), self.prize_text(check.prize),
+                                        " ".join(map(str, check.missing)),
+                                        self.lang.get_text('claims_yes' if valid else 'claims_no')))
+            for row_index, row in enumerate(check.rows, start=1):
+                table.insert(item, "end", text=self.lang.get_text('claims_row', row_index),
+                             values=(row.hits, self.prize_text(row.prize), " ".join(map(str, row.missing)), ""))
+        self.summary_label.config(text=self.lang.get_text(
+            'claims_summary', len(result.checks), sum(result.valid), self.service.game.get_state_text()))
+
+    def prize_text(self, prize):
+        return self.lang.get_text(prize) if prize is not None else "-"
+
+    def on_close(self):
+        self.updates.close()
+        self.window.destroy()
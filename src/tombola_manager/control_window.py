@@ -1,19 +1,29 @@
 import tkinter as tk
-from tkinter import ttk, messagebox, scrolledtext
-import json
-import os
+from tkinter import ttk, messagebox, scrolledtext, filedialog
 
-from src.tombola_manager.utils import resource_path
+from src.tombola_manager.utils import broadcast_port, log_window, resource_path
 from src.tombola_manager.language_manager import LanguageManager
+from src.tombola_manager.number_board import CellStyle, make_board
+from src.tombola_manager.game_service import GameService, WARNING, is_batch
+from src.tombola_manager.game_events import (IdleUpdater, NUMBER_EVENTS, STATE_CHANGED,
+                                             LOG_APPENDED, event_kinds)
+from src.tombola_manager.diagnostics import Diagnostics, timed
+from src.tombola_manager.view_window import ViewWindow
 
 
 class ControlWindow:
-    def __init__(self, game, view_window):
+    # Log entries each "show older" click adds to the log widget
+    log_page = 200
+    
+    def __init__(self, game, journal=None):
         self.window = tk.Toplevel()
         self.lang = LanguageManager()
         self.window.title(self.lang.get_text('control_title', game.name))
         self.game = game
-        self.view_window = view_window
+        self.service = GameService(game, journal)
+        self.diagnostics = Diagnostics()
+        self.save_errors_seen = 0
+        self._save_status_job = None
 
         # Set custom icon
         self.window.iconbitmap(resource_path('src/tombola_manager/icon/icon.ico'))
@@ -64,6 +74,40 @@ class ControlWindow:
         tk.Button(button_frame, text=self.lang.get_text('save_game'), 
                  command=self.save_game,
                  font=("Arial", 10)).pack(side="left", padx=3)
+        # Step back and forward through the calls, removals and state changes
+        history_frame = ttk.Frame(control_frame)
+        history_frame.pack(pady=3)
+        tk.Button(history_frame, text=self.lang.get_text('step_back'),
+                 command=self.step_back, font=("Arial", 9)).pack(side="left", padx=3)
+        self.history_label = tk.Label(history_frame, font=("Arial", 9), width=14)
+        self.history_label.pack(side="left")
+        tk.Button(history_frame, text=self.lang.get_text('step_forward'),
+                 command=self.step_forward, font=("Arial", 9)).pack(side="left", padx=3)
+        self.update_history_label()
+        
+        tk.Button(control_frame, text=self.lang.get_text('load_cards'),
+                 command=self.load_cards,
+                 font=("Arial", 10)).pack(pady=3)
+        tk.Button(control_frame, text=self.lang.get_text('check_claims'),
+                 command=self.check_claims,
+                 font=("Arial", 10)).pack(pady=3)
+        tk.Button(control_frame, text=self.lang.get_text('open_view'),
+                 command=self.open_view,
+                 font=("Arial", 10)).pack(pady=3)
+        tk.Button(control_frame, text=self.lang.get_text('diagnostics'),
+                 command=self.open_diagnostics,
+                 font=("Arial", 9)).pack(pady=3)
+
+        # Save status below the buttons
+        self.save_status_label = tk.Label(control_frame, text=self.lang.get_text('save_status_never'),
+                                          font=("Arial", 9))
+        self.save_status_label.pack(pady=3)
+        
+        # Live board for browsers on the local network, if TOMBOLA_BROADCAST_PORT is set
+        self.broadcast = None
+        port = broadcast_port()
+        if port is not None:
+            self.start_broadcast(port, control_frame)
 
         # Status frame (bottom left)
         status_frame = ttk.LabelFrame(left_frame, text=self.lang.get_text('status_table'))
@@ -77,19 +121,13 @@ class ControlWindow:
         grid_frame = ttk.Frame(status_notebook)
         status_notebook.add(grid_frame, text=self.lang.get_text('grid_view'))
         
-        # Create grid of numbers
-        self.grid_labels = {}
-        grid_container = ttk.Frame(grid_frame)
-        grid_container.pack(padx=5, pady=5)
-        
-        # Grid view modifications
-        for i in range(1, 91):
-            row = (i-1) // 10
-            col = (i-1) % 10
-            label = tk.Label(grid_container, text=str(i), width=4, height=2,  # increased width and height
-                           relief="raised", borderwidth=1, font=("Arial", 10))  # added font size
-            label.grid(row=row, column=col, padx=2, pady=2)  # increased padding
-            self.grid_labels[i] = label
+        # Grid of numbers: called ones in green
+        self.board = make_board(grid_frame, {
+            "uncalled": CellStyle("white", "black", ("Arial", 10)),
+            "called": CellStyle("green", "white", ("Arial", 10)),
+            "last": CellStyle("green", "white", ("Arial", 10)),
+        }, "#f0f0f0", cell_width=42, cell_height=42, outline="#a0a0a0")
+        self.board.widget.pack(padx=5, pady=5)
         
         # List view tab
         list_frame = ttk.Frame(status_notebook)
@@ -127,42 +165,69 @@ class ControlWindow:
         log_frame = ttk.LabelFrame(main_frame, text=self.lang.get_text('action_log'))
         log_frame.pack(side="right", padx=5, pady=5, fill="both", expand=True)
         
+        # Older entries than the on-screen window are only shown on request
+        self.older_log_button = tk.Button(log_frame, command=self.show_older_log,
+                                          font=("Arial", 9))
+        self.older_log_button.pack(padx=5, pady=(5, 0), fill="x")
+        
         # Create scrolled text widget for log
         self.log_text = scrolledtext.ScrolledText(log_frame, width=48, height=24,  # increased width and height
                                                 wrap=tk.WORD, state='disabled',
                                                 font=("Arial", 10))  # added font size
         self.log_text.pack(padx=5, pady=5, fill="both", expand=True)
         
-        # Load existing log if any
+        # What the list view currently shows, so updates only touch changed rows
+        self.status_rows = []  # (item id, values) per Treeview row
+        
+        # Log entries currently in the log widget, numbered from the start of the
+        # saved log (entries before game.log_base are still on disk)
+        self.log_limit = log_window()
+        self.log_start = self.log_end = max(0, self.log_length() - self.log_limit)
+        self.older_log_hidden = None
+        
+        # Load existing log if any, and render it again when the language changes
         self.update_log()
+        self.lang.add_listener(self.rerender_log)
         self.update_status_table()
+        
+        # Views and this window redraw from the game's events, once per idle cycle
+        self.updates = IdleUpdater(game, self.window, self.redraw)
+
+        # Flush pending saves before the window goes away
+        self.window.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.update_save_status()
     
+    @timed("control.update_status_table")
     def update_status_table(self):
-        # Update grid view
-        for num in range(1, 91):
-            if num in self.game.numbers:
-                self.grid_labels[num].config(bg="green", fg="white")
-            else:
-                self.grid_labels[num].config(bg="white", fg="black")
+        # Update grid view: the board only repaints the cells whose called state changed
+        self.board.update(self.game.numbers)
         
-        # Update list view
-        for item in self.status_table.get_children():
-            self.status_table.delete(item)
-        
-        # Get called and remaining numbers
-        called_numbers = sorted(list(self.game.numbers))
-        remaining_numbers = sorted(list(set(range(1, 91)) - self.game.numbers))
+        # Get called and remaining numbers (NumberSet iterates in ascending order)
+        called_numbers = list(self.game.numbers)
+        remaining_numbers = list(self.game.numbers.complement())
         
         # Split numbers into groups of 10 for better readability
         called_groups = [called_numbers[i:i+10] for i in range(0, len(called_numbers), 10)]
         remaining_groups = [remaining_numbers[i:i+10] for i in range(0, len(remaining_numbers), 10)]
         
-        # Add rows to table
+        # Update list view in place: rewrite changed rows, add or drop the rest
         max_rows = max(len(called_groups), len(remaining_groups))
+        tk_calls = 3  # The statistics labels below
         for i in range(max_rows):
             called = ', '.join(map(str, called_groups[i])) if i < len(called_groups) else ""
             remaining = ', '.join(map(str, remaining_groups[i])) if i < len(remaining_groups) else ""
-            self.status_table.insert("", "end", values=(called, remaining))
+            values = (called, remaining)
+            if i == len(self.status_rows):
+                self.status_rows.append((self.status_table.insert("", "end", values=values), values))
+                tk_calls += 1
+            elif self.status_rows[i][1] != values:
+                self.status_table.item(self.status_rows[i][0], values=values)
+                self.status_rows[i] = (self.status_rows[i][0], values)
+                tk_calls += 1
+        while len(self.status_rows) > max_rows:
+            self.status_table.delete(self.status_rows.pop()[0])
+            tk_calls += 1
+        self.diagnostics.count("tk.calls.status_table", tk_calls)
         
         # Update statistics
         total_called = len(self.game.numbers)
@@ -173,80 +238,188 @@ class ControlWindow:
         self.stats_labels["remaining"].config(text=str(total_remaining))
         self.stats_labels["percentage"].config(text=f"{completion_percentage:.1f}%")
     
+    @timed("control.update_log")
     def update_log(self):
+        # Append only the entries added since the last update
+        new_entries = self.service.log_entries(self.log_end, self.log_length())
+        if new_entries:
+            self.log_text.config(state='normal')
+            self.log_text.insert(tk.END, "".join(entry.render() + "\n" for entry in new_entries))
+            self.log_end = self.log_length()
+            # Drop the oldest lines beyond the on-screen window
+            excess = self.log_end - self.log_start - self.log_limit
+            if excess > 0:
+                self.log_text.delete("1.0", f"{excess + 1}.0")
+                self.log_start += excess
+            self.log_text.config(state='disabled')
+            self.log_text.see(tk.END)  # Auto-scroll to the bottom
+            self.diagnostics.count("tk.calls.log", 5 if excess > 0 else 4)
+        self.update_older_log_button()
+    
+    def show_older_log(self):
+        # Prepend the previous page of entries and widen the window to keep them
+        start = max(0, self.log_start - self.log_page)
+        if start == self.log_start:
+            return
+        self.log_text.config(state='normal')
+        self.log_text.insert("1.0", "".join(entry.render() + "\n"
+                                            for entry in self.service.log_entries(start, self.log_start)))
+        self.log_text.config(state='disabled')
+        self.log_text.see("1.0")
+        self.log_limit += self.log_start - start
+        self.log_start = start
+        self.update_older_log_button()
+    
+    def rerender_log(self, language=None):
+        """Render the entries in the log widget again, in the current language"""
         self.log_text.config(state='normal')
-        self.log_text.delete(1.0, tk.END)
-        for log_entry in self.game.log:
-            self.log_text.insert(tk.END, log_entry + "\n")
+        self.log_text.delete("1.0", tk.END)
+        self.log_text.insert(tk.END, "".join(entry.render() + "\n"
+                                             for entry in self.service.log_entries(self.log_start, self.log_end)))
         self.log_text.config(state='disabled')
-        self.log_text.see(tk.END)  # Auto-scroll to the bottom
+        self.log_text.see(tk.END)
+        self.older_log_hidden = None
+        self.update_older_log_button()
+
+    def log_length(self):
+        return self.game.log_base + len(self.game.log)
+
+    def update_older_log_button(self):
+        hidden = self.log_start
+        if hidden == self.older_log_hidden:
+            return
+        self.older_log_hidden = hidden
+        self.older_log_button.config(
+            text=self.lang.get_text('show_older_log').format(hidden),
+            state='normal' if hidden else 'disabled')
     
     def add_number(self):
-        try:
-            number = int(self.number_entry.get())
-            if 1 <= number <= 90:
-                if self.game.add_number(number):
-                    self.view_window.update_display()
-                    self.game.log_action(f'{self.lang.get_text('added_number').format(number)}')
-                    self.update_log()
-                    self.update_status_table()
-                    self.save_game()
-                else:
-                    messagebox.showwarning(self.lang.get_text('warning'), 
-                                         self.lang.get_text('number_exists'))
-                    self.game.log_action(self.lang.get_text('failed_add').format(number))
-                    self.update_log()
-            else:
-                messagebox.showwarning(self.lang.get_text('warning'), 
-                                     self.lang.get_text('invalid_number'))
-                self.game.log_action(self.lang.get_text('failed_add_invalid').format(number))
-                self.update_log()
-        except ValueError:
-            messagebox.showerror(self.lang.get_text('error'), 
-                               self.lang.get_text('enter_valid'))
-            self.game.log_action(self.lang.get_text('failed_add_input'))
-            self.update_log()
+        text = self.number_entry.get()
+        if is_batch(text):
+            # Several numbers or a range: all or none, with one redraw and one save
+            result = self.service.add_numbers(text)
+            if not result.ok:
+                self.show_failure(result, ', '.join(map(str, result.rejected)))
+        else:
+            result = self.service.add_number(text)
+            if not result.ok:
+                self.show_failure(result)
         self.number_entry.delete(0, tk.END)
     
     def remove_number(self):
-        try:
-            number = int(self.number_entry.get())
-            if self.game.remove_number(number):
-                self.view_window.update_display()
-                self.game.log_action(self.lang.get_text('removed_number').format(number))
-                self.update_log()
-                self.update_status_table()
-                self.save_game()
-            else:
-                messagebox.showwarning(self.lang.get_text('warning'), 
-                                     self.lang.get_text('number_not_found'))
-                self.game.log_action(self.lang.get_text('failed_remove').format(number))
-                self.update_log()
-        except ValueError:
-            messagebox.showerror(self.lang.get_text('error'), 
-                               self.lang.get_text('enter_valid'))
-            self.game.log_action(self.lang.get_text('failed_remove_input'))
-            self.update_log()
+        result = self.service.remove_number(self.number_entry.get())
+        if not result.ok:
+            self.show_failure(result)
         self.number_entry.delete(0, tk.END)
     
+    def step_back(self):
+        self.service.step_back()
+    
+    def step_forward(self):
+        self.service.step_forward()
+    
+    def update_history_label(self):
+        history = self.game.history
+        self.history_label.config(
+            text=self.lang.get_text('history_position').format(history.position, len(history)))
+    
+    def redraw(self, events):
+        kinds = event_kinds(events)
+        self.update_history_label()
+        if not kinds.isdisjoint(NUMBER_EVENTS):
+            self.update_status_table()
+        if STATE_CHANGED in kinds and self.state_var.get() != self.game.state:
+            self.state_var.set(self.game.state)
+        if LOG_APPENDED in kinds:
+            self.update_log()
+        self.update_save_status()
+    
+    def start_broadcast(self, port, parent):
+        # Imported here: the server brings in asyncio, which most games never need
+        from src.tombola_manager.broadcast_server import BroadcastServer
+        self.broadcast = BroadcastServer(self.game, port=port)
+        try:
+            self.broadcast.start()
+            text = self.lang.get_text('broadcast_on').format(self.broadcast.url())
+        except OSError as e:
+            self.broadcast = None
+            text = self.lang.get_text('broadcast_failed').format(str(e))
+        tk.Label(parent, text=text, font=("Arial", 9)).pack(pady=3)
+    
+    def open_view(self):
+        """Open another view of the game, e.g. for a second screen"""
+        ViewWindow(self.game)
+    
+    def open_diagnostics(self):
+        from src.tombola_manager.diagnostics_window import DiagnosticsWindow
+        DiagnosticsWindow(self.window)
+    
+    def show_failure(self, result, *args):
+        if result.severity == WARNING:
+            messagebox.showwarning(self.lang.get_text('warning'),
+                                   self.lang.get_text(result.message_key, *args))
+        else:
+            messagebox.showerror(self.lang.get_text('error'),
+                                 self.lang.get_text(result.message_key, *args))
+    
+    def load_cards(self):
+        path = filedialog.askopenfilename(
+            parent=self.window,
+            filetypes=[(self.lang.get_text('card_files'), "*.cards")])
+        if not path:
+            return
+        try:
+            self.service.load_cards(path)
+        except (OSError, ValueError) as e:
+            messagebox.showerror(self.lang.get_text('error'),
+                                 self.lang.get_text('error_loading_cards').format(str(e)))
+    
+    def check_claims(self):
+        from src.tombola_manager.claims_window import ClaimsWindow
+        ClaimsWindow(self.service, self.window)
+    
     def update_state(self, event):
-        self.game.state = self.state_var.get()
-        self.view_window.update_state_display()
-        self.game.log_action(self.lang.get_text('state_changed').format(self.game.state))
-        self.update_log()
+        self.service.set_state(self.state_var.get())
     
     def save_game(self):
-        data = {
-            "name": self.game.name,
-            "numbers": list(self.game.numbers),
-            "date": self.game.date,
-            "log": self.game.log,
-            "last_number": self.game.last_number,
-            "state": self.game.state
-        }
-        
-        if not os.path.exists("games"):
-            os.makedirs("games")
-            
-        with open(f"games/{self.game.name}.json", "w") as f:
-            json.dump(data, f)
+        self.service.save()
+        self.update_save_status()
+    
+    def update_save_status(self):
+        status = self.service.save_status()
+        if status.last_error is not None:
+            self.save_status_label.config(
+                text=self.lang.get_text('save_failed').format(status.last_error), fg="red")
+        elif status.pending:
+            self.save_status_label.config(
+                text=self.lang.get_text('save_status_pending').format(status.pending), fg="black")
+        elif status.last_saved_at is not None:
+            self.save_status_label.config(
+                text=self.lang.get_text('save_status_saved').format(
+                    status.last_saved_at.strftime("%H:%M:%S")), fg="black")
+        
+        if status.error_count > self.save_errors_seen:
+            self.save_errors_seen = status.error_count
+            messagebox.showerror(self.lang.get_text('error'),
+                                 self.lang.get_text('save_failed').format(status.last_error))
+        
+        if self._save_status_job is not None:
+            self.window.after_cancel(self._save_status_job)
+        self._save_status_job = self.window.after(500, self.update_save_status)
+    
+    def on_close(self):
+        self.window.after_cancel(self._save_status_job)
+        self.service.flush(timeout=5)
+        status = self.service.save_status()
+        if status.last_error is not None and not messagebox.askyesno(
+                self.lang.get_text('error'),
+                self.lang.get_text('save_failed_close').format(status.last_error)):
+            self._save_status_job = None
+            self.update_save_status()
+            return
+        self.service.close()
+        self.lang.remove_listener(self.rerender_log)
+        self.updates.close()
+        if self.broadcast is not None:
+            self.broadcast.stop()
+        self.window.destroy()
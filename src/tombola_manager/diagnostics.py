@@ -0,0 +1,313 @@
+import builtins
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from datetime import datetime
+
+PROFILE_ENV = "TOMBOLA_PROFILE"
+PROFILE_MODES = ("cpu", "memory", "all")
+PROFILE_DIR = "profiles"
+STARTUP_TRACE_ENV = "TOMBOLA_STARTUP_TRACE"
+# "report" writes the trace after the first paint, "exit" also closes the application
+STARTUP_TRACE_MODES = ("report", "exit")
+
+# Sub-buckets per power of two: a percentile is off by at most 1/8 of its value
+SUB_BUCKETS = 8
+_SUB_BITS = SUB_BUCKETS.bit_length() - 1
+
+
+def _bucket(ns):
+    if ns < SUB_BUCKETS:
+        return ns
+    shift = ns.bit_length() - _SUB_BITS - 1
+    return shift * SUB_BUCKETS + (ns >> shift)
+
+
+def _bucket_bounds(index):
+    """Lowest and highest+1 durations in ns that fall in a bucket"""
+    if index < SUB_BUCKETS:
+        return index, index + 1
+    shift = index // SUB_BUCKETS - 1
+    mantissa = index - shift * SUB_BUCKETS
+    return mantissa << shift, (mantissa + 1) << shift
+
+
+class Histogram:
+    """Durations in nanoseconds, counted in log-scale buckets: constant memory whatever the count"""
+    __slots__ = ("count", "total", "max", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0
+        self.max = 0
+        self.buckets = {}
+
+    def add(self, ns):
+        self.count += 1
+        self.total += ns
+        if ns > self.max:
+            self.max = ns
+        index = _bucket(ns)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+
+    def percentile(self, fraction):
+        """Duration in ns below which ``fraction`` of the samples fall (middle of its bucket)"""
+        if not self.count:
+            return 0
+        rank = fraction * self.count
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                low, high = _bucket_bounds(index)
+                return min((low + high) / 2, self.max)
+        return self.max
+
+    def to_json(self):
+        return {"count": self.count,
+                "total_ms": self.total / 1e6,
+                "mean_ms": self.total / self.count / 1e6 if self.count else 0,
+                "p50_ms": self.percentile(0.5) / 1e6,
+                "p95_ms": self.percentile(0.95) / 1e6,
+                "p99_ms": self.percentile(0.99) / 1e6,
+                "max_ms": self.max / 1e6,
+                "buckets_ns": {_bucket_bounds(index)[0]: count
+                               for index, count in sorted(self.buckets.items())}}
+
+
+class _Timer:
+    __slots__ = ("diagnostics", "name", "start")
+
+    def __init__(self, diagnostics, name):
+        self.diagnostics = diagnostics
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.diagnostics.record(self.name, time.perf_counter_ns() - self.start)
+
+
+class Diagnostics:
+    """Timers and counters of the call pipeline, shared by the whole process.
+
+    ``timer(name)`` times a block into the histogram ``name`` and
+    ``record(name, ns)`` adds a duration measured elsewhere; ``count(name, n)``
+    adds to a counter. Stage names are dotted: ``call.*`` for the service
+    side of a call, ``view.*`` and ``control.*`` for redraws,
+    ``call_to_screen`` from a game change to the end of the redraw that shows
+    it, ``save.*`` for the writer thread and ``tk.*`` for Tk calls.
+
+    Recording costs a lock and a dict update, so it stays on all the time.
+    """
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._lock = threading.Lock()
+            cls._instance.reset()
+        return cls._instance
+
+    def reset(self):
+        with self._lock:
+            self.timers = {}
+            self.counters = {}
+            self.started_at = datetime.now()
+
+    def timer(self, name):
+        """Context manager adding the time spent in its block to ``name``"""
+        return _Timer(self, name)
+
+    def record(self, name, ns):
+        with self._lock:
+            histogram = self.timers.get(name)
+            if histogram is None:
+                histogram = self.timers[name] = Histogram()
+            histogram.add(ns)
+
+    def count(self, name, amount=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def snapshot(self):
+        """Everything recorded so far, as plain JSON types"""
+        with self._lock:
+            return {"started_at": self.started_at.strftime("%Y-%m-%d %H:%M:%S"),
+                    "timers": {name: histogram.to_json() for name, histogram in sorted(self.timers.items())},
+                    "counters": dict(sorted(self.counters.items()))}
+
+    def export(self, path):
+        """Write the snapshot to a JSON file"""
+        with open(path, "w") as f:
+            json.dump(self.snapshot(), f, indent=2)
+
+
+def timed(name):
+    """Decorator timing every call of a function into the Diagnostics histogram ``name``"""
+    def decorate(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter_ns()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                Diagnostics().record(name, time.perf_counter_ns() - start)
+        return wrapper
+    return decorate
+
+
+class ProfileCapture:
+    """Opt-in cProfile and/or tracemalloc capture around a block.
+
+    ``mode`` is "cpu", "memory", "all" or None (nothing captured). On exit
+    the CPU profile is written as ``<stamp>.prof`` (for pstats or snakeviz)
+    and the memory capture as ``<stamp>-memory.txt`` (top allocation sites
+    and peak), both in ``directory``.
+    """
+
+    def __init__(self, mode, directory=PROFILE_DIR):
+        if mode is not None and mode not in PROFILE_MODES:
+            raise ValueError(f"Unknown {PROFILE_ENV} mode: {mode}")
+        self.mode = mode
+        self.directory = directory
+        self.profiler = None
+        self.paths = []
+
+    @classmethod
+    def from_env(cls, directory=PROFILE_DIR):
+        return cls(os.environ.get(PROFILE_ENV) or None, directory)
+
+    def __enter__(self):
+        if self.mode in ("memory", "all"):
+            import tracemalloc
+            tracemalloc.start(10)
+        if self.mode in ("cpu", "all"):
+            import cProfile
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        if self.mode is None:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        stamp = os.path.join(self.directory, datetime.now().strftime("tombola-%Y%m%d-%H%M%S"))
+        if self.profiler is not None:
+            self.profiler.disable()
+            self.profiler.dump_stats(stamp + ".prof")
+            self.paths.append(stamp + ".prof")
+        if self.mode in ("memory", "all"):
+            import tracemalloc
+            current, peak = tracemalloc.get_traced_memory()
+            stats = tracemalloc.take_snapshot().statistics("lineno")
+            tracemalloc.stop()
+            with open(stamp + "-memory.txt", "w") as f:
+                f.write(f"current {current / 1024:.1f} KiB, peak {peak / 1024:.1f} KiB\n\n")
+                f.writelines(f"{stat}\n" for stat in stats[:50])
+            self.paths.append(stamp + "-memory.txt")
+
+
+class StartupTrace:
+    """Opt-in trace of the application start, from ``started_ns`` to the first paint.
+
+    ``stage(name)`` times a block (e.g. the import of the main window) into
+    the ``startup.<name>`` Diagnostics histogram; while the trace runs, every
+    module imported for the first time is timed, children included.
+    ``first_paint(window)`` waits for Tk to go idle after drawing the window,
+    then writes ``startup-<stamp>.txt`` with the stages and the slowest
+    imports into ``directory``. In "exit" mode the window is then closed, so
+    a whole launch can be timed from outside.
+    """
+
+    def __init__(self, mode, started_ns=None, directory=PROFILE_DIR):
+        if mode is not None and mode not in STARTUP_TRACE_MODES:
+            raise ValueError(f"Unknown {STARTUP_TRACE_ENV} mode: {mode}")
+        self.mode = mode
+        self.directory = directory
+        self.started_ns = started_ns if started_ns is not None else time.perf_counter_ns()
+        self.stages = []  # (name, ns)
+        self.imports = {}  # module -> ns
+        self.path = None
+        self._last_stage_end = self.started_ns
+        self._import = None
+        if mode is not None:
+            self._import = builtins.__import__
+            builtins.__import__ = self._timed_import
+
+    def _timed_import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        if level and globals:
+            package = globals.get("__package__") or ""
+            module = f"{package}.{name}" if name else package
+        else:
+            module = name
+        if module in sys.modules:
+            return self._import(name, globals, locals, fromlist, level)
+        start = time.perf_counter_ns()
+        try:
+            return self._import(name, globals, locals, fromlist, level)
+        finally:
+            self.imports[module] = time.perf_counter_ns() - start
+
+    def stage(self, name):
+        return _Stage(self, name)
+
+    def first_paint(self, window):
+        """Finish the trace once ``window`` has been drawn"""
+        if self.mode is None:
+            return
+        window.after_idle(lambda: self._painted(window))
+
+    def _painted(self, window):
+        self.stages.append(("first_paint", time.perf_counter_ns() - self._last_stage_end))
+        Diagnostics().record("startup.first_paint", self.stages[-1][1])
+        self.stop()
+        self.write()
+        if self.mode == "exit":
+            window.destroy()
+
+    def stop(self):
+        """Stop timing imports"""
+        if self._import is not None and builtins.__import__ == self._timed_import:
+            builtins.__import__ = self._import
+        self._import = None
+
+    def report(self):
+        total = time.perf_counter_ns() - self.started_ns
+        lines = [f"Startup trace, {datetime.now():%Y-%m-%d %H:%M:%S}", ""]
+        lines += [f"{name:<20}{ns / 1e6:>9.1f} ms" for name, ns in self.stages]
+        lines += [f"{'total':<20}{total / 1e6:>9.1f} ms", "", "Slowest imports (ms, submodules included):"]
+        slowest = sorted(self.imports.items(), key=lambda item: -item[1])[:30]
+        lines += [f"{ns / 1e6:>9.1f}  {module}" for module, ns in slowest]
+        return "\n".join(lines) + "\n"
+
+    def write(self):
+        os.makedirs(self.directory, exist_ok=True)
+        self.path = os.path.join(self.directory, datetime.now().strftime("startup-%Y%m%d-%H%M%S.txt"))
+        with open(self.path, "w") as f:
+            f.write(self.report())
+        print(f"Startup trace written to {self.path}")
+
+
+class _Stage:
+    __slots__ = ("trace", "name", "start")
+
+    def __init__(self, trace, name):
+        self.trace = trace
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        end = time.perf_counter_ns()
+        ns = end - self.start
+        self.trace.stages.append((self.name, ns))
+        self.trace._last_stage_end = end
+        Diagnostics().record(f"startup.{self.name}", ns)
@@ -0,0 +1,105 @@
+import tkinter as tk
+from tkinter import ttk, messagebox, filedialog
+
+from src.tombola_manager.utils import resource_path
+from src.tombola_manager.language_manager import LanguageManager
+from src.tombola_manager.diagnostics import Diagnostics
+
+# Timer columns: (Histogram.to_json key, translation key, width)
+TIMER_COLUMNS = (
+    ("count", 'diagnostics_count', 70),
+    ("mean_ms", 'diagnostics_mean', 70),
+    ("p50_ms", 'diagnostics_p50', 70),
+    ("p95_ms", 'diagnostics_p95', 70),
+    ("p99_ms", 'diagnostics_p99', 70),
+    ("max_ms", 'diagnostics_max', 70),
+)
+
+
+class DiagnosticsWindow:
+    """Live view of the Diagnostics timers and counters, refreshed every second"""
+    refresh_delay = 1000
+
+    def __init__(self, parent=None):
+        self.window = tk.Toplevel(parent)
+        self.lang = LanguageManager()
+        self.window.title(self.lang.get_text('diagnostics_title'))
+        self.diagnostics = Diagnostics()
+        self._refresh_job = None
+
+        # Set custom icon
+        self.window.iconbitmap(resource_path('src/tombola_manager/icon/icon.ico'))
+
+        main_frame = ttk.Frame(self.window)
+        main_frame.pack(padx=10, pady=10, fill="both", expand=True)
+
+        # Timers in milliseconds, one row per stage
+        self.timers_table = ttk.Treeview(main_frame, columns=[c[0] for c in TIMER_COLUMNS], height=12)
+        self.timers_table.heading("#0", text=self.lang.get_text('diagnostics_stage'))
+        self.timers_table.column("#0", width=200)
+        for column, key, width in TIMER_COLUMNS:
+            self.timers_table.heading(column, text=self.lang.get_text(key))
+            self.timers_table.column(column, width=width, anchor="e")
+        self.timers_table.pack(fill="both", expand=True)
+
+        # Counters: Tk calls, bytes and rows written
+        self.counters_table = ttk.Treeview(main_frame, columns=("value",), height=6)
+        self.counters_table.heading("#0", text=self.lang.get_text('diagnostics_counter'))
+        self.counters_table.heading("value", text=self.lang.get_text('diagnostics_value'))
+        self.counters_table.column("#0", width=200)
+        self.counters_table.column("value", width=120, anchor="e")
+        self.counters_table.pack(pady=(10, 0), fill="both", expand=True)
+
+        button_frame = ttk.Frame(main_frame)
+        button_frame.pack(pady=(10, 0))
+        ttk.Button(button_frame, text=self.lang.get_text('diagnostics_export'),
+                   command=self.export).pack(side="left", padx=3)
+        ttk.Button(button_frame, text=self.lang.get_text('diagnostics_reset'),
+                   command=self.reset).pack(side="left", padx=3)
+
+        self.window.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.refresh()
+
+    def refresh(self):
+        snapshot = self.diagnostics.snapshot()
+        self._fill(self.timers_table, {
+            name: tuple(f"{timer[column]:.3f}" if column != "count" else timer[column]
+                        for column, key, width in TIMER_COLUMNS)
+            for name, timer in snapshot["timers"].items()})
+        self._fill(self.counters_table, {name: (value,) for name, value in snapshot["counters"].items()})
+        self._refresh_job = self.window.after(self.refresh_delay, self.refresh)
+
+    @staticmethod
+    def _fill(table, rows):
+        # Rows are keyed by stage or counter name, so a refresh only rewrites their values
+        for name in table.get_children():
+            if name not in rows:
+                table.delete(name)
+        for name, values in rows.items():
+            if table.exists(name):
+                table.item(name, values=values)
+            else:
+                table.insert("", "end", iid=name, text=name, values=values)
+
+    def export(self):
+        path = filedialog.asksaveasfilename(
+            parent=self.window, defaultextension=".json",
+            filetypes=[(self.lang.get_text('json_files'), "*.json")])
+        if not path:
+            return
+        try:
+            self.diagnostics.export(path)
+        except OSError as e:
+            messagebox.showerror(self.lang.get_text('error'),
+                                 self.lang.get_text('diagnostics_export_failed').format(str(e)))
+
+    def reset(self):
+        self.diagnostics.reset()
+        if self._refresh_job is not None:
+            self.window.after_cancel(self._refresh_job)
+        self.refresh()
+
+    def on_close(self):
+        if self._refresh_job is not None:
+            self.window.after_cancel(self._refresh_job)
+        self.window.destroy()
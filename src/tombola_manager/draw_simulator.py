@@ -0,0 +1,184 @@
+"""Monte Carlo simulator of tombola draws for prize planning.
+
+Plays many random draws against a set of cards and counts, for every prize
+from ambo to tombola, how many calls it took until the first card reached it
+and how many cards reached it on that same call (winners who share the
+prize). The rules are those of ``CardRegistry``: a row prize needs 2 to 5
+called numbers in one row, a tombola all 15 numbers of a card.
+
+Draws are played in NumPy batches: each draw is a permutation of 1-90, so
+the call at which every number comes out is known at once and a row reaches
+``k`` hits at the ``k``-th smallest call of its numbers. Runs are split into
+fixed-size chunks seeded from one ``SeedSequence`` and spread over a process
+pool, so the results for a given seed do not depend on the number of
+workers, and the run time drops with each added core.
+
+Usage::
+
+    python -m tombola_manager.draw_simulator --cards cards.cards --sold 600 --draws 1000000 --seed 42
+    python -m tombola_manager.draw_simulator --sold 600 --draws 1000000 --seed 42
+"""
+import argparse
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .card_file import CARD_SIZE, read_card_bytes
+from .card_generator import CARDS_PER_SERIES, generate_series
+from .card_registry import NUMBERS_PER_ROW, PRIZE_ORDER, ROW_PRIZES, ROWS_PER_CARD, TOMBOLA, validate_card
+from .number_set import MAX_NUMBER
+
+DEFAULT_CHUNK_DRAWS = 20000
+# Bytes of call positions (draws x cards x 15) a batch may hold at once
+BATCH_BYTES = 32 << 20
+PERCENTILES = (0.05, 0.5, 0.95)
+
+
+def load_card_array(path, count=None):
+    """First ``count`` cards (all if None) of a ``.cards`` file as a uint8 array (cards, 15)"""
+    return np.frombuffer(read_card_bytes(path, count), dtype=np.uint8).reshape(-1, CARD_SIZE)
+
+
+def generated_cards(count, seed=None):
+    """``count`` cards taken in order from freshly generated series, as sold from the pad"""
+    series = -(-count // CARDS_PER_SERIES)
+    return generate_series(series, seed)[:count]
+
+
+class SimulationResult:
+    """Counts of a simulation run, mergeable across chunks.
+
+    ``calls[prize][n]`` is how many draws needed ``n`` calls before the first
+    card reached the prize, ``winners[prize][n]`` how many draws had ``n``
+    cards reaching it on that call.
+    """
+
+    def __init__(self, cards, draws=0, calls=None, winners=None):
+        self.cards = cards
+        self.draws = draws
+        self.calls = calls or {prize: np.zeros(MAX_NUMBER + 1, dtype=np.int64) for prize in PRIZE_ORDER}
+        self.winners = winners or {prize: np.zeros(cards + 1, dtype=np.int64) for prize in PRIZE_ORDER}
+
+    def merge(self, other):
+        self.draws += other.draws
+        for prize in PRIZE_ORDER:
+            self.calls[prize] += other.calls[prize]
+            self.winners[prize] += other.winners[prize]
+        return self
+
+    def summary(self):
+        """Statistics per prize, as plain JSON types"""
+        prizes = {}
+        for prize in PRIZE_ORDER:
+            calls = self.calls[prize]
+            winners = self.winners[prize]
+            draws = max(self.draws, 1)
+            cumulative = np.cumsum(calls)
+            prizes[prize] = {
+                "mean_calls": float(calls @ np.arange(len(calls)) / draws),
+                **{f"p{round(fraction * 100)}_calls": int(np.searchsorted(cumulative, fraction * self.draws))
+                   for fraction in PERCENTILES},
+                "min_calls": int(np.flatnonzero(calls)[0]) if self.draws else 0,
+                "max_calls": int(np.flatnonzero(calls)[-1]) if self.draws else 0,
+                "mean_winners": float(winners @ np.arange(len(winners)) / draws),
+                "shared": float(winners[2:].sum() / draws),
+                "calls": {int(n): int(count) for n, count in enumerate(calls) if count},
+                "winners": {int(n): int(count) for n, count in enumerate(winners) if count},
+            }
+        return {"cards": self.cards, "draws": self.draws, "prizes": prizes}
+
+
+def _play_batch(rng, cards, draws, result):
+    """Play ``draws`` random draws against the cards and add them to result"""
+    order = rng.permuted(np.tile(np.arange(1, MAX_NUMBER + 1, dtype=np.uint8), (draws, 1)), axis=1)
+    # call_at[d, n]: 1-based call that brings number n out in draw d
+    call_at = np.zeros((draws, MAX_NUMBER + 1), dtype=np.uint8)
+    np.put_along_axis(call_at, order.astype(np.intp),
+                      np.arange(1, MAX_NUMBER + 1, dtype=np.uint8)[None, :], axis=1)
+
+    rows = np.sort(call_at[:, cards].reshape(draws, len(cards), ROWS_PER_CARD, NUMBERS_PER_ROW), axis=3)
+    card_calls = {prize: rows[:, :, :, hits - 1].min(axis=2) for hits, prize in ROW_PRIZES.items()}
+    card_calls[TOMBOLA] = rows[:, :, :, -1].max(axis=2)
+
+    for prize, calls in card_calls.items():
+        first = calls.min(axis=1)
+        winners = np.count_nonzero(calls == first[:, None], axis=1)
+        result.calls[prize] += np.bincount(first, minlength=MAX_NUMBER + 1)
+        result.winners[prize] += np.bincount(winners, minlength=len(cards) + 1)
+    result.draws += draws
+
+
+def _simulate_chunk(args):
+    cards, draws, seed_sequence = args
+    rng = np.random.default_rng(seed_sequence)
+    result = SimulationResult(len(cards))
+    # Batch size only depends on the card count, so the random stream does too
+    batch = max(1, BATCH_BYTES // (len(cards) * CARD_SIZE))
+    for start in range(0, draws, batch):
+        _play_batch(rng, cards, min(batch, draws - start), result)
+    return result
+
+
+def simulate(cards, draws, seed=None, workers=None, chunk_draws=DEFAULT_CHUNK_DRAWS):
+    """Play ``draws`` random draws against cards, a uint8 array (cards, 15); returns a SimulationResult.
+
+    Chunks run in a process pool when there is more than one chunk and
+    ``workers`` is not 1.
+    """
+    cards = np.ascontiguousarray(cards, dtype=np.uint8)
+    if cards.ndim != 2 or cards.shape[1] != CARD_SIZE or not len(cards):
+        raise ValueError(f"Cards must be a non-empty array of {CARD_SIZE} numbers each")
+    for card in cards[:1000]:
+        validate_card(card.reshape(ROWS_PER_CARD, NUMBERS_PER_ROW).tolist())
+
+    sizes = [min(chunk_draws, draws - start) for start in range(0, draws, chunk_draws)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    jobs = [(cards, size, seed_sequence) for size, seed_sequence in zip(sizes, seeds)]
+    result = SimulationResult(len(cards))
+    if workers == 1 or len(jobs) < 2:
+        for job in jobs:
+            result.merge(_simulate_chunk(job))
+        return result
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for chunk in pool.map(_simulate_chunk, jobs):
+            result.merge(chunk)
+    return result
+
+
+def format_summary(summary):
+    """Text table of a summary: one line per prize"""
+    lines = [f"{summary['draws']} draws, {summary['cards']} cards",
+             f"{'prize':<10}{'mean':>7}{'p5':>5}{'p50':>5}{'p95':>5}{'winners':>9}{'shared':>8}"]
+    for prize, stats in summary["prizes"].items():
+        lines.append(f"{prize:<10}{stats['mean_calls']:>7.1f}{stats['p5_calls']:>5}{stats['p50_calls']:>5}"
+                     f"{stats['p95_calls']:>5}{stats['mean_winners']:>9.2f}{stats['shared']:>7.1%}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulate tombola draws to plan the prizes")
+    parser.add_argument("--cards", help="a .cards file of the cards on sale (generated cards if omitted)")
+    parser.add_argument("--sold", type=int, default=None, help="number of cards sold, the first ones of the set")
+    parser.add_argument("--draws", type=int, default=100000, help="number of simulated draws")
+    parser.add_argument("--seed", type=int, default=None, help="seed for reproducible results")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="worker processes")
+    parser.add_argument("--json", help="also write the full distributions to this JSON file")
+    args = parser.parse_args(argv)
+
+    if args.cards:
+        cards = load_card_array(args.cards, args.sold)
+    elif args.sold:
+        cards = generated_cards(args.sold, args.seed)
+    else:
+        parser.error("give --cards, --sold or both")
+    summary = simulate(cards, args.draws, args.seed, args.workers).summary()
+    print(format_summary(summary))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(summary, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
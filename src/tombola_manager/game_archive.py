@@ -0,0 +1,580 @@
+"""Compact binary archive of saved games.
+
+Many games share one append-only archive file. Each game is one record, a
+zlib-compressed packing of its save document (the JSON object of the
+single-file save format: name, date, state, numbers, last number, history
+and the whole log):
+
+- the called numbers as a 12-byte bitmap
+- the call order: the history's moves, one byte per number, timestamps as
+  varint deltas
+- the log, with codes and texts replaced by indexes into a per-game string
+  table and timestamps as varint deltas
+
+Anything the layout does not expect is kept as a tagged value, so
+``unpack_game(pack_game(document)) == document`` for any document. An index
+file next to the archive (``<archive>.idx``, one JSON line per record) gives
+the offset of every game, so one game is read without unpacking the others.
+
+Usage::
+
+    python -m tombola_manager.game_archive archive 2024.tmba games --remove
+    python -m tombola_manager.game_archive extract 2024.tmba "Christmas 2024" --directory games
+    python -m tombola_manager.game_archive list 2024.tmba
+"""
+import argparse
+import json
+import os
+import struct
+import zlib
+
+from .game_history import ADD, REMOVE, STATE
+from .game_journal import GAMES_DIR, GameJournal, game_from_header, journal_path, log_path, snapshot_path
+from .game_log import LogEntry
+from .number_set import MAX_NUMBER, NumberSet
+
+ARCHIVE_MAGIC = b"TMBA"
+ARCHIVE_VERSION = 1
+_HEADER = struct.Struct("<4sH")
+# Before each record: length of the name, of the packed game, and its CRC-32
+_RECORD = struct.Struct("<HII")
+INDEX_SUFFIX = ".idx"
+
+BITMAP_SIZE = (MAX_NUMBER + 7) // 8  # 12 bytes
+# Keys of the save document with a packed layout; others are kept as tagged values
+DOCUMENT_KEYS = ("name", "date", "state", "last_number", "numbers", "history", "log")
+
+# Tags of a generic JSON value
+_NULL, _TRUE, _FALSE, _INT, _STR, _FLOAT, _LIST, _DICT = range(8)
+# Tags of a packed move and log entry; _RAW is a generic value for anything else
+_MOVE_OPS = (ADD, REMOVE, STATE)
+_ENTRY, _TEXT, _RAW = range(3)
+
+
+def _zigzag(value):
+    return value * 2 if value >= 0 else -value * 2 - 1
+
+
+def _unzigzag(value):
+    return value >> 1 if not value & 1 else -(value >> 1) - 1
+
+
+class _Writer:
+    """Packs values into a bytearray, strings through a table written in front"""
+
+    def __init__(self):
+        self.out = bytearray()
+        self.strings = {}
+
+    def varint(self, value):
+        out = self.out
+        while value > 0x7F:
+            out.append(value & 0x7F | 0x80)
+            value >>= 7
+        out.append(value)
+
+    def signed(self, value):
+        self.varint(_zigzag(value))
+
+    def string(self, text):
+        index = self.strings.get(text)
+        if index is None:
+            index = self.strings[text] = len(self.strings)
+        self.varint(index)
+
+    def number(self, value):
+        """A number 1-90 or None in one byte"""
+        self.out.append(value or 0)
+
+    def value(self, value):
+        """Any JSON value, tagged"""
+        out = self.out
+        if value is None:
+            out.append(_NULL)
+        elif value is True:
+            out.append(_TRUE)
+        elif value is False:
+            out.append(_FALSE)
+        elif isinstance(value, int):
+            out.append(_INT)
+            self.signed(value)
+        elif isinstance(value, str):
+            out.append(_STR)
+            self.string(value)
+        elif isinstance(value, float):
+            out.append(_FLOAT)
+            out += struct.pack("<d", value)
+        elif isinstance(value, list):
+            out.append(_LIST)
+            self.varint(len(value))
+            for item in value:
+                self.value(item)
+        elif isinstance(value, dict):
+            out.append(_DICT)
+            self.varint(len(value))
+            for key, item in value.items():
+                self.string(key)
+                self.value(item)
+        else:
+            raise TypeError(f"Not a JSON value: {value!r}")
+
+    def bitmap(self, bits):
+        self.out += bits.to_bytes(BITMAP_SIZE, "little")
+
+    def getvalue(self):
+        table = _Writer()
+        table.varint(len(self.strings))
+        for text in self.strings:
+            data = text.encode("utf-8")
+            table.varint(len(data))
+            table.out += data
+        return bytes(table.out + self.out)
+
+
+class _Reader:
+    def __init__(self, data):
+        self.data = data
+        self.pos = 0
+        self.strings = [self._raw_string() for _ in range(self.varint())]
+
+    def byte(self):
+        self.pos += 1
+        return self.data[self.pos - 1]
+
+    def varint(self):
+        data = self.data
+        value = shift = 0
+        while True:
+            byte = data[self.pos]
+            self.pos += 1
+            value |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                return value
+            shift += 7
+
+    def signed(self):
+        return _unzigzag(self.varint())
+
+    def _raw_string(self):
+        size = self.varint()
+        self.pos += size
+        return self.data[self.pos - size:self.pos].decode("utf-8")
+
+    def string(self):
+        return self.strings[self.varint()]
+
+    def number(self):
+        return self.byte() or None
+
+    def value(self):
+        tag = self.byte()
+        if tag == _NULL:
+            return None
+        if tag == _TRUE:
+            return True
+        if tag == _FALSE:
+            return False
+        if tag == _INT:
+            return self.signed()
+        if tag == _STR:
+            return self.string()
+        if tag == _FLOAT:
+            self.pos += 8
+            return struct.unpack_from("<d", self.data, self.pos - 8)[0]
+        if tag == _LIST:
+            return [self.value() for _ in range(self.varint())]
+        if tag == _DICT:
+            return {self.string(): self.value() for _ in range(self.varint())}
+        raise ValueError(f"Unknown value tag {tag}")
+
+    def bitmap(self):
+        self.pos += BITMAP_SIZE
+        return int.from_bytes(self.data[self.pos - BITMAP_SIZE:self.pos], "little")
+
+
+def _is_number(value):
+    return value is None or type(value) is int and 1 <= value <= MAX_NUMBER
+
+
+def _is_board(numbers):
+    """True if numbers is what a save holds: ascending distinct numbers 1-90"""
+    return (isinstance(numbers, list) and all(type(number) is int and 1 <= number <= MAX_NUMBER
+                                              for number in numbers)
+            and all(a < b for a, b in zip(numbers, numbers[1:])))
+
+
+def _pack_board(writer, numbers):
+    if _is_board(numbers):
+        writer.out.append(1)
+        writer.bitmap(NumberSet(numbers).bits)
+    else:
+        writer.out.append(0)
+        writer.value(numbers)
+
+
+def _unpack_board(reader):
+    if reader.byte():
+        return list(NumberSet.from_bits(reader.bitmap()))
+    return reader.value()
+
+
+def _pack_moves(writer, moves):
+    """The call order: one op byte, the number and last numbers (or states), a timestamp delta"""
+    writer.varint(len(moves))
+    previous = 0
+    for move in moves:
+        if (not isinstance(move, list) or len(move) != 5 or move[0] not in _MOVE_OPS
+                or type(move[4]) is not int
+                or (move[0] != STATE and not all(_is_number(value) for value in move[1:4]))):
+            writer.out.append(len(_MOVE_OPS))
+            writer.value(move)
+            continue
+        op, value, before, after, timestamp = move
+        writer.out.append(_MOVE_OPS.index(op))
+        if op == STATE:
+            writer.value(value)
+            writer.value(before)
+            writer.value(after)
+        else:
+            writer.number(value)
+            writer.number(before)
+            writer.number(after)
+        writer.signed(timestamp - previous)
+        previous = timestamp
+
+
+def _unpack_moves(reader):
+    moves = []
+    previous = 0
+    for _ in range(reader.varint()):
+        op = reader.byte()
+        if op == len(_MOVE_OPS):
+            moves.append(reader.value())
+            continue
+        op = _MOVE_OPS[op]
+        if op == STATE:
+            values = [reader.value(), reader.value(), reader.value()]
+        else:
+            values = [reader.number(), reader.number(), reader.number()]
+        previous += reader.signed()
+        moves.append([op, *values, previous])
+    return moves
+
+
+def _pack_history(writer, history):
+    if not (isinstance(history, dict) and history.keys() == {"base", "moves", "position"}
+            and isinstance(history["base"], list) and len(history["base"]) == 3
+            and _is_board(history["base"][0]) and _is_number(history["base"][1])
+            and isinstance(history["moves"], list) and type(history["position"]) is int):
+        writer.out.append(0)
+        writer.value(history)
+        return
+    writer.out.append(1)
+    numbers, last_number, state = history["base"]
+    writer.bitmap(NumberSet(numbers).bits)
+    writer.number(last_number)
+    writer.value(state)
+    _pack_moves(writer, history["moves"])
+    writer.varint(history["position"])
+
+
+def _unpack_history(reader):
+    if not reader.byte():
+        return reader.value()
+    base = [list(NumberSet.from_bits(reader.bitmap())), reader.number(), reader.value()]
+    moves = _unpack_moves(reader)
+    return {"base": base, "moves": moves, "position": reader.varint()}
+
+
+def _pack_log(writer, log):
+    writer.varint(len(log))
+    previous = 0
+    for entry in log:
+        if isinstance(entry, str):
+            writer.out.append(_TEXT)
+            writer.string(entry)
+        elif (isinstance(entry, list) and len(entry) >= 2 and type(entry[0]) is int
+              and isinstance(entry[1], str)):
+            writer.out.append(_ENTRY)
+            writer.signed(entry[0] - previous)
+            previous = entry[0]
+            writer.string(entry[1])
+            writer.varint(len(entry) - 2)
+            for arg in entry[2:]:
+                writer.value(arg)
+        else:
+            writer.out.append(_RAW)
+            writer.value(entry)
+
+
+def _unpack_log(reader):
+    log = []
+    previous = 0
+    for _ in range(reader.varint()):
+        kind = reader.byte()
+        if kind == _TEXT:
+            log.append(reader.string())
+        elif kind == _ENTRY:
+            previous += reader.signed()
+            code = reader.string()
+            log.append([previous, code, *(reader.value() for _ in range(reader.varint()))])
+        else:
+            log.append(reader.value())
+    return log
+
+
+def pack_game(document):
+    """Bytes of a save document, before compression"""
+    writer = _Writer()
+    # Field presence, one bit per DOCUMENT_KEYS entry
+    writer.varint(sum(1 << i for i, key in enumerate(DOCUMENT_KEYS) if key in document))
+    if "name" in document:
+        writer.value(document["name"])
+    if "date" in document:
+        writer.value(document["date"])
+    if "state" in document:
+        writer.value(document["state"])
+    if "last_number" in document:
+        writer.value(document["last_number"])
+    if "numbers" in document:
+        _pack_board(writer, document["numbers"])
+    if "history" in document:
+        _pack_history(writer, document["history"])
+    if "log" in document:
+        if isinstance(document["log"], list):
+            writer.out.append(1)
+            _pack_log(writer, document["log"])
+        else:
+            writer.out.append(0)
+            writer.value(document["log"])
+    writer.value({key: value for key, value in document.items() if key not in DOCUMENT_KEYS})
+    return writer.getvalue()
+
+
+def unpack_game(data):
+    """The save document packed by pack_game"""
+    reader = _Reader(data)
+    present = reader.varint()
+    document = {}
+    for i, key in enumerate(DOCUMENT_KEYS):
+        if not present >> i & 1:
+            continue
+        if key == "numbers":
+            document[key] = _unpack_board(reader)
+        elif key == "history":
+            document[key] = _unpack_history(reader)
+        elif key == "log":
+            document[key] = _unpack_log(reader) if reader.byte() else reader.value()
+        else:
+            document[key] = reader.value()
+    document.update(reader.value())
+    return document
+
+
+def save_document(name, directory=GAMES_DIR):
+    """A saved game as one JSON object in the single-file save format, whole log included"""
+    game = GameJournal(name, directory).load()
+    return {"name": game.name,
+            "date": game.date,
+            "state": game.state,
+            "last_number": game.last_number,
+            "numbers": list(game.numbers),
+            "history": game.history.to_json(),
+            "log": [entry.to_json() for entry in game.log]}
+
+
+def write_document(document, directory=GAMES_DIR):
+    """Save a document of save_document() as a game in the header layout"""
+    game = game_from_header(document)
+    game.log = [LogEntry.from_json(entry) for entry in document.get("log", ())]
+    GameJournal(game.name, directory).compact(game)
+
+
+class GameArchive:
+    """Append-only file of packed games with an offset index.
+
+    A name appended again supersedes the earlier record, which stays in the
+    file. The index file is only a cache: if it is missing or behind the
+    archive (e.g. after a crash between the two writes), the records after
+    its last entry are scanned again.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.index_path = path + INDEX_SUFFIX
+        self._index = {}  # name -> (offset of the packed game, its length, CRC-32)
+        if not os.path.exists(path):
+            with open(path, "wb") as f:
+                f.write(_HEADER.pack(ARCHIVE_MAGIC, ARCHIVE_VERSION))
+            open(self.index_path, "w").close()
+        self._file = open(path, "rb+")
+        magic, version = _HEADER.unpack(self._file.read(_HEADER.size))
+        if magic != ARCHIVE_MAGIC or version != ARCHIVE_VERSION:
+            self._file.close()
+            raise ValueError(f"Not a game archive: {path}")
+        self._load_index()
+
+    def __contains__(self, name):
+        return name in self._index
+
+    def __len__(self):
+        return len(self._index)
+
+    def names(self):
+        return sorted(self._index)
+
+    def append(self, document):
+        """Add a save document under its name"""
+        name = document["name"]
+        name_data = name.encode("utf-8")
+        packed = zlib.compress(pack_game(document), 9)
+        crc = zlib.crc32(packed)
+        self._file.seek(0, os.SEEK_END)
+        start = self._file.tell()
+        self._file.write(_RECORD.pack(len(name_data), len(packed), crc) + name_data + packed)
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        entry = (start + _RECORD.size + len(name_data), len(packed), crc)
+        self._index[name] = entry
+        with open(self.index_path, "a") as f:
+            f.write(json.dumps([name, *entry], separators=(",", ":")) + "\n")
+
+    def read(self, name):
+        """The save document of a game; KeyError if it is not in the archive"""
+        offset, size, crc = self._index[name]
+        self._file.seek(offset)
+        packed = self._file.read(size)
+        if len(packed) != size or zlib.crc32(packed) != crc:
+            raise ValueError(f"Damaged record of {name} in {self.path}")
+        return unpack_game(zlib.decompress(packed))
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _load_index(self):
+        end = _HEADER.size
+        torn = False
+        try:
+            with open(self.index_path, "r") as f:
+                for line in f:
+                    try:
+                        if not line.endswith("\n"):
+                            raise ValueError("torn line")
+                        name, offset, size, crc = json.loads(line)
+                    except ValueError:
+                        # Torn last line: the scan below finds the record again, and the
+                        # index is rewritten so no line gets appended to the partial one
+                        torn = True
+                        break
+                    self._index[name] = (offset, size, crc)
+                    end = max(end, offset + size)
+        except FileNotFoundError:
+            pass
+        self._scan(end)
+        if torn:
+            self._write_index()
+
+    def _write_index(self):
+        entries = sorted(self._index.items(), key=lambda item: item[1][0])
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            f.writelines(json.dumps([name, *entry], separators=(",", ":")) + "\n" for name, entry in entries)
+        os.replace(tmp_path, self.index_path)
+
+    def _scan(self, start):
+        """Index the records from ``start``; a torn last record is cut off"""
+        file = self._file
+        file.seek(0, os.SEEK_END)
+        size = file.tell()
+        position = start
+        added = []
+        while position + _RECORD.size <= size:
+            file.seek(position)
+            name_size, packed_size, crc = _RECORD.unpack(file.read(_RECORD.size))
+            offset = position + _RECORD.size + name_size
+            if offset + packed_size > size:
+                break
+            name = file.read(name_size).decode("utf-8")
+            self._index[name] = (offset, packed_size, crc)
+            added.append([name, offset, packed_size, crc])
+            position = offset + packed_size
+        if position < size:
+            file.truncate(position)
+        if added:
+            with open(self.index_path, "a") as f:
+                f.writelines(json.dumps(entry, separators=(",", ":")) + "\n" for entry in added)
+
+
+def archive_games(archive_path, names=None, directory=GAMES_DIR, remove=False):
+    """Append saved games (all of the directory if names is None) to an archive; returns their names.
+
+    With ``remove``, the save files of a game are deleted once its record
+    reads back equal to the save.
+    """
+    if names is None:
+        names = sorted(os.path.splitext(file)[0] for file in os.listdir(directory)
+                       if file.endswith(".json") and not file.startswith("."))
+    with GameArchive(archive_path) as archive:
+        for name in names:
+            document = save_document(name, directory)
+            archive.append(document)
+            if remove:
+                if archive.read(name) != document:
+                    raise ValueError(f"{name} does not read back from {archive_path}: save files kept")
+                for path in (snapshot_path(name, directory), log_path(name, directory),
+                             journal_path(name, directory)):
+                    if os.path.exists(path):
+                        os.remove(path)
+    return names
+
+
+def extract_games(archive_path, names=None, directory=GAMES_DIR, overwrite=False):
+    """Write archived games (all if names is None) back as save files; returns their names"""
+    with GameArchive(archive_path) as archive:
+        if names is None:
+            names = archive.names()
+        for name in names:
+            if not overwrite and os.path.exists(snapshot_path(name, directory)):
+                raise FileExistsError(f"{snapshot_path(name, directory)} exists")
+            # A fresh GameJournal rewrites the log file and empties the journal
+            write_document(archive.read(name), directory)
+    return names
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pack saved games into an archive file and back")
+    commands = parser.add_subparsers(dest="command", required=True)
+    archive = commands.add_parser("archive", help="append saved games to an archive")
+    archive.add_argument("archive")
+    archive.add_argument("names", nargs="*", help="games to archive (all if none)")
+    archive.add_argument("--directory", default=GAMES_DIR)
+    archive.add_argument("--remove", action="store_true", help="delete the save files once archived")
+    extract = commands.add_parser("extract", help="write archived games back as save files")
+    extract.add_argument("archive")
+    extract.add_argument("names", nargs="*", help="games to extract (all if none)")
+    extract.add_argument("--directory", default=GAMES_DIR)
+    extract.add_argument("--overwrite", action="store_true", help="replace existing saves")
+    listing = commands.add_parser("list", help="list the games of an archive")
+    listing.add_argument("archive")
+    args = parser.parse_args(argv)
+
+    if args.command == "archive":
+        names = archive_games(args.archive, args.names or None, args.directory, args.remove)
+        print(f"Archived {len(names)} games into {args.archive}")
+    elif args.command == "extract":
+        names = extract_games(args.archive, args.names or None, args.directory, args.overwrite)
+        print(f"Extracted {len(names)} games into {args.directory}")
+    else:
+        with GameArchive(args.archive) as archive:
+            for name in archive.names():
+                print(name)
+
+
+if __name__ == "__main__":
+    main()
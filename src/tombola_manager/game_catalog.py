@@ -0,0 +1,136 @@
+import json
+import os
+from collections import namedtuple
+
+from .game_journal import GAMES_DIR, GameJournal
+
+CATALOG_FILE = ".catalog"
+CATALOG_VERSION = 2
+
+# What the load list shows for a save; size and mtime cover snapshot, log and journal
+GameInfo = namedtuple("GameInfo", ["name", "date", "state", "called", "size", "mtime"])
+
+SORT_KEYS = GameInfo._fields
+
+
+def _sort_value(info, key):
+    value = getattr(info, key)
+    return (1, "") if value is None else (0, value)
+
+
+def scan_saves(directory=GAMES_DIR):
+    """(snapshot size, mtime, journal size, mtime, log size, mtime) of every game in a directory"""
+    snapshots = {}
+    journals = {}
+    logs = {}
+    if not os.path.isdir(directory):
+        return {}
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.name.startswith(".") or not entry.is_file():
+                continue
+            name, extension = os.path.splitext(entry.name)
+            if extension == ".json":
+                stat = entry.stat()
+                snapshots[name] = (stat.st_size, stat.st_mtime_ns)
+            elif extension == ".journal":
+                stat = entry.stat()
+                journals[name] = (stat.st_size, stat.st_mtime_ns)
+            elif extension == ".log":
+                stat = entry.stat()
+                logs[name] = (stat.st_size, stat.st_mtime_ns)
+    return {name: snapshot + journals.get(name, (0, 0)) + logs.get(name, (0, 0))
+            for name, snapshot in snapshots.items()}
+
+
+class GameCatalog:
+    """Index of the saved games in a directory, kept in ``<directory>/.catalog``.
+
+    ``refresh`` only stats the save files and re-reads the games whose
+    snapshot or journal changed size or mtime since the catalog last saw
+    them, so opening the load list does not parse every save.
+    """
+
+    def __init__(self, directory=GAMES_DIR):
+        self.directory = directory
+        self._entries = {}  # name -> (file signature, GameInfo)
+        self._load_index()
+
+    def __contains__(self, name):
+        return name in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, name):
+        """GameInfo of a game, or None"""
+        entry = self._entries.get(name)
+        return entry[1] if entry else None
+
+    def refresh(self):
+        """Bring the catalog up to date with the files on disk"""
+        signatures = scan_saves(self.directory)
+        changed = False
+
+        for name in list(self._entries):
+            if name not in signatures:
+                del self._entries[name]
+                changed = True
+
+        for name, signature in signatures.items():
+            entry = self._entries.get(name)
+            if entry is not None and entry[0] == signature:
+                continue
+            # Unreadable saves are kept with info None: the name is still taken
+            self._entries[name] = (signature, self._read_info(name, signature))
+            changed = True
+
+        if changed:
+            self._save_index()
+
+    def games(self, sort_key="date", reverse=False, text_filter=""):
+        """GameInfo of the cataloged games, filtered on name or state and sorted"""
+        text_filter = text_filter.strip().lower()
+        games = [info for _, info in self._entries.values()
+                 if info is not None and (not text_filter or text_filter in info.name.lower()
+                                          or text_filter in str(info.state).lower())]
+        games.sort(key=lambda info: _sort_value(info, sort_key), reverse=reverse)
+        return games
+
+    def _read_info(self, name, signature):
+        try:
+            game = GameJournal(name, self.directory).load(log_tail=0)
+        except (OSError, ValueError, KeyError, TypeError):
+            # Not a readable save: leave it out of the list
+            return None
+        size = signature[0] + signature[2] + signature[4]
+        mtime = max(signature[1], signature[3], signature[5]) / 1e9
+        return GameInfo(name, game.date, game.state, len(game.numbers), size, mtime)
+
+    def _load_index(self):
+        path = os.path.join(self.directory, CATALOG_FILE)
+        try:
+            with open(path, "r") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get("version") != CATALOG_VERSION:
+            return
+        for name, (signature, info) in data["games"].items():
+            self._entries[name] = (tuple(signature), GameInfo(*info) if info else None)
+
+    def _save_index(self):
+        data = {
+            "version": CATALOG_VERSION,
+            "games": {name: [signature, list(info) if info else None]
+                      for name, (signature, info) in self._entries.items()}
+        }
+        path = os.path.join(self.directory, CATALOG_FILE)
+        tmp_path = path + ".tmp"
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump(data, f, separators=(",", ":"))
+            os.replace(tmp_path, path)
+        except OSError:
+            # The catalog is only a cache: a read-only games folder still works
+            pass
@@ -0,0 +1,270 @@
+import argparse
+import asyncio
+import json
+import os
+import threading
+
+from .diagnostics import Diagnostics
+from .game_service import GameService
+from .game_storage import get_storage
+from .save_writer import SaveWriter
+from .tombola_game import TombolaGame
+
+ENGINE_PORT_ENV = "TOMBOLA_ENGINE_PORT"
+DEFAULT_PORT = 8091
+
+
+class UnknownGame(KeyError):
+    """A command named a game that is not open in the engine"""
+
+
+def game_snapshot(game):
+    """What a client needs to draw a game, as plain JSON types"""
+    return {"name": game.name, "date": game.date, "state": game.state,
+            "numbers": list(game.numbers), "last_number": game.last_number,
+            "seq": game.event_seq}
+
+
+class GameEngine:
+    """Runs many live games from one asyncio loop, without any window.
+
+    Every open game has its own GameService and lock, so commands on one
+    game run in order while other games are unaffected; a command only
+    costs a dict lookup plus the work on its own game. All games share the
+    SaveWriter thread for persistence, and loading a save runs in a worker
+    thread so it never stalls the loop.
+
+    The API is async (``open_game``, ``add_number``, ``add_numbers``, ``remove_number``,
+    ``set_state``, ``step_back``, ``step_forward``, ``snapshot``,
+    ``close_game``). Code outside the loop, such as Tk callbacks, uses
+    ``start_thread`` and ``call``; network clients use ``serve`` (one JSON
+    command per line). Game subscribers are called on the engine's loop.
+    """
+
+    def __init__(self, storage=None, writer=None):
+        self.storage = storage or get_storage()
+        self.writer = writer or SaveWriter()
+        self._services = {}  # name -> GameService
+        self._locks = {}  # name -> asyncio.Lock
+        self.loop = None
+        self._thread = None
+
+    def __contains__(self, name):
+        return name in self._services
+
+    def games(self):
+        """Names of the open games"""
+        return sorted(self._services)
+
+    def game(self, name):
+        """The TombolaGame of an open game"""
+        return self._service(name).game
+
+    async def open_game(self, name):
+        """Load a saved game, or start a new one, and keep it live; returns its snapshot"""
+        async with self._lock(name):
+            if name not in self._services:
+                game, journal = await asyncio.to_thread(self._load_or_create, name)
+                self._services[name] = GameService(game, journal, self.writer)
+        return game_snapshot(self._services[name].game)
+
+    async def close_game(self, name):
+        """Stop serving a game once its pending saves are written"""
+        async with self._lock(name):
+            service = self._services.pop(name, None)
+            self._locks.pop(name, None)
+        if service is None:
+            raise UnknownGame(name)
+        await asyncio.to_thread(service.flush)
+        service.close()
+
+    async def add_number(self, name, number):
+        async with self._lock(name):
+            return self._service(name).add_number(number)
+
+    async def add_numbers(self, name, text):
+        async with self._lock(name):
+            return self._service(name).add_numbers(text)
+
+    async def remove_number(self, name, number):
+        async with self._lock(name):
+            return self._service(name).remove_number(number)
+
+    async def set_state(self, name, state):
+        async with self._lock(name):
+            service = self._service(name)
+            service.set_state(state)
+            return game_snapshot(service.game)
+
+    async def step_back(self, name):
+        async with self._lock(name):
+            service = self._service(name)
+            service.step_back()
+            return game_snapshot(service.game)
+
+    async def step_forward(self, name):
+        async with self._lock(name):
+            service = self._service(name)
+            service.step_forward()
+            return game_snapshot(service.game)
+
+    async def snapshot(self, name):
+        async with self._lock(name):
+            return game_snapshot(self._service(name).game)
+
+    async def shutdown(self):
+        """Close every game, waiting for their saves"""
+        for name in list(self._services):
+            await self.close_game(name)
+
+    def _service(self, name):
+        try:
+            return self._services[name]
+        except KeyError:
+            raise UnknownGame(name) from None
+
+    def _lock(self, name):
+        lock = self._locks.get(name)
+        if lock is None:
+            lock = self._locks[name] = asyncio.Lock()
+        return lock
+
+    def _load_or_create(self, name):
+        journal = self.storage.journal(name)
+        # Trying the save is cheaper than refreshing the storage's list of games (a directory scan),
+        # and leaves that list to the thread that owns it
+        try:
+            # The log stays on disk: the engine only appends to it
+            game = journal.load(log_tail=0)
+            game.log_action('game_loaded')
+        except FileNotFoundError:
+            game = TombolaGame(name)
+            game.log_action('game_created')
+        return game, journal
+
+    # Driving the engine from other threads
+
+    def start_thread(self):
+        """Run the engine's loop on a background thread"""
+        started = threading.Event()
+
+        def run():
+            self.loop = asyncio.new_event_loop()
+            self.loop.call_soon(started.set)
+            self.loop.run_forever()
+            self.loop.close()
+
+        self._thread = threading.Thread(target=run, name="GameEngine", daemon=True)
+        self._thread.start()
+        started.wait()
+
+    def call(self, coroutine, timeout=None):
+        """Run a command coroutine on the engine thread and wait for its result"""
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop).result(timeout)
+
+    def stop_thread(self, timeout=None):
+        if self._thread is None:
+            return
+        self.call(self.shutdown(), timeout)
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join(timeout)
+        self._thread = None
+
+    # Network commands
+
+    async def execute(self, command):
+        """Run one command given as a dict, e.g. {"cmd": "add", "game": "Hall 1", "number": 17}"""
+        cmd = command.get("cmd")
+        name = command.get("game")
+        if cmd == "list":
+            return {"ok": True, "games": self.games()}
+        if cmd == "diagnostics":
+            return {"ok": True, "diagnostics": Diagnostics().snapshot()}
+        if not isinstance(name, str) or not name:
+            return {"ok": False, "error": "missing game"}
+        try:
+            if cmd == "open":
+                return {"ok": True, "game": await self.open_game(name)}
+            if cmd == "close":
+                await self.close_game(name)
+                return {"ok": True}
+            if cmd in ("add", "remove"):
+                action = self.add_number if cmd == "add" else self.remove_number
+                result = await action(name, command.get("number"))
+                return {"ok": result.ok, "number": result.number, "severity": result.severity,
+                        "error": result.message_key}
+            if cmd == "add_many":
+                numbers = command.get("numbers")
+                if isinstance(numbers, list):
+                    numbers = " ".join(map(str, numbers))
+                result = await self.add_numbers(name, numbers)
+                return {"ok": result.ok, "numbers": result.numbers, "rejected": result.rejected,
+                        "severity": result.severity, "error": result.message_key}
+            if cmd == "state":
+                return {"ok": True, "game": await self.set_state(name, str(command.get("state")))}
+            if cmd == "back":
+                return {"ok": True, "game": await self.step_back(name)}
+            if cmd == "forward":
+                return {"ok": True, "game": await self.step_forward(name)}
+            if cmd == "snapshot":
+                return {"ok": True, "game": await self.snapshot(name)}
+        except UnknownGame:
+            return {"ok": False, "error": "game not open"}
+        return {"ok": False, "error": f"unknown command {cmd!r}"}
+
+    async def serve(self, host="127.0.0.1", port=DEFAULT_PORT):
+        """Accept clients sending one JSON command per line and answering one JSON line each"""
+        return await asyncio.start_server(self._handle_client, host, port)
+
+    async def _handle_client(self, reader, writer):
+        try:
+            while line := await reader.readline():
+                try:
+                    command = json.loads(line)
+                except ValueError:
+                    command = None
+                if not isinstance(command, dict):
+                    reply = {"ok": False, "error": "expected a JSON object per line"}
+                else:
+                    try:
+                        reply = await self.execute(command)
+                    except (TypeError, ValueError) as e:
+                        # e.g. a save that cannot be loaded
+                        reply = {"ok": False, "error": str(e)}
+                writer.write(json.dumps(reply).encode() + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run games headless, driven by JSON commands over TCP")
+    parser.add_argument("games", nargs="*", help="games to open at start")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=int(os.environ.get(ENGINE_PORT_ENV, DEFAULT_PORT)))
+    args = parser.parse_args(argv)
+
+    async def run():
+        engine = GameEngine()
+        for name in args.games:
+            await engine.open_game(name)
+        server = await engine.serve(args.host, args.port)
+        print(f"Game engine listening on {args.host}:{server.sockets[0].getsockname()[1]}")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            await engine.shutdown()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        SaveWriter().close()
+
+
+if __name__ == "__main__":
+    main()
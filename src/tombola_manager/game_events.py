@@ -0,0 +1,64 @@
+import time
+from collections import namedtuple
+
+from .diagnostics import Diagnostics
+
+# Event kinds published by TombolaGame
+NUMBER_ADDED = "number_added"
+NUMBER_REMOVED = "number_removed"
+STATE_CHANGED = "state_changed"
+LOG_APPENDED = "log_appended"
+CARDS_CHANGED = "cards_changed"
+
+NUMBER_EVENTS = (NUMBER_ADDED, NUMBER_REMOVED)
+
+# seq counts the events of one game; numbers are the numbers the event is about,
+# value the new state (STATE_CHANGED) or the LogEntry (LOG_APPENDED)
+GameEvent = namedtuple("GameEvent", ["seq", "kind", "numbers", "value"])
+
+
+class IdleUpdater:
+    """Subscribes to a game and hands its events to ``redraw`` at most once per Tk idle cycle.
+
+    A burst of calls (or several changes made by one call) ends up in a
+    single ``redraw(events)``, run from ``after_idle`` on ``widget``. The
+    time from the first of those events to the end of the redraw goes to the
+    ``call_to_screen`` histogram of Diagnostics.
+    """
+
+    def __init__(self, game, widget, redraw):
+        self.game = game
+        self.widget = widget
+        self.redraw = redraw
+        self.pending = []
+        self._job = None
+        self._first_event_at = None
+        self.diagnostics = Diagnostics()
+        game.subscribe(self.on_event)
+
+    def on_event(self, event):
+        if not self.pending:
+            self._first_event_at = time.perf_counter_ns()
+        self.pending.append(event)
+        if self._job is None:
+            self._job = self.widget.after_idle(self.flush)
+
+    def flush(self):
+        """Redraw now for the events received so far"""
+        self._job = None
+        events, self.pending = self.pending, []
+        if events:
+            self.redraw(events)
+            self.diagnostics.record("call_to_screen", time.perf_counter_ns() - self._first_event_at)
+
+    def close(self):
+        self.game.unsubscribe(self.on_event)
+        if self._job is not None:
+            self.widget.after_cancel(self._job)
+            self._job = None
+        self.pending = []
+
+
+def event_kinds(events):
+    """The set of kinds in a list of events"""
+    return {event.kind for event in events}
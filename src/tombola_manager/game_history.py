@@ -0,0 +1,140 @@
+import time
+from collections import namedtuple
+
+from .number_set import NumberSet
+
+ADD = "add"
+REMOVE = "remove"
+STATE = "state"
+
+# One change to a game. before/after are last_number for ADD and REMOVE, the state for STATE.
+Move = namedtuple("Move", ["op", "value", "before", "after", "timestamp"])
+
+# Board after a given number of moves: called numbers as NumberSet bits, last number, state
+Checkpoint = namedtuple("Checkpoint", ["bits", "last_number", "state"])
+
+
+class GameHistory:
+    """Ordered moves of a game with a checkpoint every ``checkpoint_every`` moves.
+
+    ``position`` is the number of moves in effect: stepping back lowers it
+    and stepping forward replays the next move, until a new move drops the
+    moves after it. ``board_at(index)`` rebuilds the board after any number
+    of moves from the nearest checkpoint below it, so it never replays more
+    than ``checkpoint_every`` moves.
+    """
+    __slots__ = ("moves", "position", "checkpoints", "checkpoint_every")
+
+    def __init__(self, base, checkpoint_every=32):
+        self.moves = []
+        self.position = 0
+        self.checkpoints = {0: base}  # Board after that many moves
+        self.checkpoint_every = checkpoint_every
+
+    @classmethod
+    def start(cls, numbers, last_number, state):
+        """A history starting from the given board"""
+        return cls(Checkpoint(numbers.bits, last_number, state))
+
+    def __len__(self):
+        return len(self.moves)
+
+    def copy(self):
+        history = GameHistory(self.checkpoints[0], self.checkpoint_every)
+        history.moves = list(self.moves)
+        history.position = self.position
+        history.checkpoints = dict(self.checkpoints)
+        return history
+
+    def record(self, op, value, before, after):
+        """Add a move at the current position, dropping the moves that were stepped back over"""
+        if self.position < len(self.moves):
+            self.truncate(self.position)
+        move = Move(op, value, before, after, int(time.time()))
+        self.extend((move,))
+        self.position += 1
+        return move
+
+    def truncate(self, length):
+        """Forget the moves after the first ``length``"""
+        del self.moves[length:]
+        self.position = min(self.position, length)
+        for index in [index for index in self.checkpoints if index > length]:
+            del self.checkpoints[index]
+
+    def extend(self, moves):
+        """Append moves after the last one (the position does not change)"""
+        for move in moves:
+            self.moves.append(move)
+            if len(self.moves) % self.checkpoint_every == 0 and len(self.moves) not in self.checkpoints:
+                self.checkpoints[len(self.moves)] = self.board_at(len(self.moves))
+
+    def step_back(self):
+        """The move to undo to go one step back, or None at the start"""
+        if self.position == 0:
+            return None
+        self.position -= 1
+        return self.moves[self.position]
+
+    def step_forward(self):
+        """The move to replay to go one step forward, or None at the end"""
+        if self.position == len(self.moves):
+            return None
+        self.position += 1
+        return self.moves[self.position - 1]
+
+    def board_at(self, index):
+        """Checkpoint of the board after the first ``index`` moves"""
+        start = index - index % self.checkpoint_every
+        while start not in self.checkpoints:
+            start -= self.checkpoint_every
+        board = self.checkpoints[start]
+        numbers = NumberSet.from_bits(board.bits)
+        last_number = board.last_number
+        state = board.state
+        for move in self.moves[start:index]:
+            if move.op == ADD:
+                numbers.add(move.value)
+                last_number = move.after
+            elif move.op == REMOVE:
+                numbers.discard(move.value)
+                last_number = move.after
+            else:
+                state = move.after
+        return Checkpoint(numbers.bits, last_number, state)
+
+    def latest_call(self, numbers):
+        """The number among ``numbers`` called most recently, or None"""
+        for move in reversed(self.moves[:self.position]):
+            if move.op == ADD and move.value in numbers:
+                return move.value
+        base = self.checkpoints[0].last_number
+        return base if base is not None and base in numbers else None
+
+    def calls(self):
+        """Number of calls (ADD moves) in effect"""
+        return sum(1 for move in self.moves[:self.position] if move.op == ADD)
+
+    def to_json(self):
+        base = self.checkpoints[0]
+        return {"base": [list(NumberSet.from_bits(base.bits)), base.last_number, base.state],
+                "moves": [list(move) for move in self.moves],
+                "position": self.position}
+
+    @classmethod
+    def from_json(cls, data):
+        numbers, last_number, state = data["base"]
+        history = cls.start(NumberSet(numbers), last_number, state)
+        history.extend(Move(*move) for move in data["moves"])
+        history.position = data["position"]
+        return history
+
+
+def common_length(old, new):
+    """Length of the common start of two move lists, comparing moves by identity"""
+    length = 0
+    for old_move, new_move in zip(old, new):
+        if old_move is not new_move:
+            break
+        length += 1
+    return length
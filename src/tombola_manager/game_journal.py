@@ -0,0 +1,506 @@
+import argparse
+import json
+import os
+import threading
+
+from .diagnostics import Diagnostics
+from .game_history import GameHistory, Move, common_length
+from .game_log import LogEntry
+from .json_stream import JsonStream
+from .tombola_game import TombolaGame
+
+GAMES_DIR = "games"
+# Bytes read at a time when reading a log backwards from a known line end
+LOG_BLOCK = 1 << 16
+
+
+def snapshot_path(name, directory=GAMES_DIR):
+    """Path of the snapshot file of a game"""
+    return os.path.join(directory, f"{name}.json")
+
+
+def journal_path(name, directory=GAMES_DIR):
+    """Path of the append-only journal of a game"""
+    return os.path.join(directory, f"{name}.journal")
+
+
+def log_path(name, directory=GAMES_DIR):
+    """Path of the append-only log of a game, one JSON entry per line"""
+    return os.path.join(directory, f"{name}.log")
+
+
+def _scan_log(path, start=0):
+    """(complete lines, bytes up to the end of the last one, file size) of a log file, from byte start on"""
+    count = 0
+    end = size = start
+    try:
+        with open(path, "rb") as f:
+            f.seek(start)
+            while chunk := f.read(1 << 20):
+                count += chunk.count(b"\n")
+                last = chunk.rfind(b"\n")
+                if last >= 0:
+                    end = size + last + 1
+                size += len(chunk)
+    except FileNotFoundError:
+        pass
+    return count, end, size
+
+
+def _lines_before(f, offset, count):
+    """The last ``count`` lines of a binary file that end at byte ``offset`` (a line end), and where they start"""
+    if count <= 0:
+        return [], offset
+    chunks = []
+    newlines = 0
+    position = offset
+    # One newline more than lines wanted marks the end of the line before them
+    while position > 0 and newlines <= count:
+        step = min(LOG_BLOCK, position)
+        position -= step
+        f.seek(position)
+        chunk = f.read(step)
+        chunks.append(chunk)
+        newlines += chunk.count(b"\n")
+    chunks.reverse()
+    lines = b"".join(chunks).split(b"\n")[:-1]
+    if len(lines) > count:
+        lines = lines[-count:]
+    return lines, offset - sum(len(line) + 1 for line in lines)
+
+
+def _parse_log(lines):
+    # One json.loads for the whole page is much faster than one per line
+    return [LogEntry.from_json(value) for value in json.loads(b"[" + b",".join(lines) + b"]")]
+
+
+def read_log(path, start=0, end=None):
+    """LogEntries number start to end (excluded) of a log file; a torn last line is left out"""
+    lines = []
+    try:
+        with open(path, "rb") as f:
+            for index, line in enumerate(f):
+                if index == end or not line.endswith(b"\n"):
+                    break
+                if index >= start:
+                    lines.append(line)
+    except FileNotFoundError:
+        pass
+    return _parse_log(lines)
+
+
+def game_from_header(data):
+    """TombolaGame of the board fields of a snapshot, with an empty log"""
+    game = TombolaGame(data["name"])
+    game.numbers = data["numbers"]
+    game.date = data["date"]
+    game.last_number = data.get("last_number", None)
+    game.state = data.get("state", "Ambo")
+    if "history" in data:
+        game.history = GameHistory.from_json(data["history"])
+    else:
+        game.reset_history()
+    return game
+
+
+def _log_line(value):
+    return json.dumps(value, separators=(",", ":")) + "\n"
+
+
+class GameJournal:
+    """Persists a game as a header snapshot, an append-only log and an append-only journal.
+
+    The snapshot ``games/<name>.json`` is small: name, date, state, numbers,
+    last number, history and the ``seq`` of the last journal record folded
+    into it. The log has its own file ``games/<name>.log``, one entry per
+    line, so a game opens from the header and the last page of the log
+    (``load(log_tail=...)``) while older entries are read on demand with
+    ``load_log``; ``game.log_base`` counts the entries left on disk. The
+    header also holds the entries and bytes the log had when it was
+    written, so opening only scans what was appended since and reads the
+    last page backwards from the end; pages are read backwards from the
+    start of the page after them. Board
+    changes made after the snapshot are appended to ``games/<name>.journal``
+    as one JSON line each, and the journal is folded back into a new
+    snapshot every ``compact_every`` records.
+
+    Snapshots of older versions held the whole log. They still load, and
+    are rewritten in the header layout on their first save, or all at once
+    with ``upgrade`` which streams the log instead of parsing it in one go.
+    """
+
+    def __init__(self, name, directory=GAMES_DIR, compact_every=200):
+        self.name = name
+        self.directory = directory
+        self.compact_every = compact_every
+        self._seq = 0
+        self._journal_records = 0
+        # What is on disk after the last record() / load(), None if unknown
+        self._persisted = None
+        # Entries in the log file, None if unknown; a stale log file is rewritten on the next save
+        self._log_written = None
+        self._log_stale = True
+        # Byte offsets of known line starts in the log file, by entry number. Saves update them on the
+        # SaveWriter thread while the window reads log pages with them: only touched under the lock.
+        self._log_offsets = {0: 0}
+        self._offsets_lock = threading.Lock()
+        # Whether the journal ends with a torn line: the next save compacts instead of appending after it
+        self._journal_torn = False
+
+    def load(self, log_tail=None):
+        """Rebuild the game from the snapshot and replay the journal tail.
+
+        With ``log_tail``, only the last ``log_tail`` log entries are read;
+        game.log_base tells how many are left on disk.
+        """
+        with open(snapshot_path(self.name, self.directory), "r") as f:
+            data = json.load(f)
+
+        game = game_from_header(data)
+        if "log" in data:
+            # Single-file layout of older versions: any log file is left from an interrupted upgrade
+            game.log = [LogEntry.from_json(entry) for entry in data["log"]]
+            self._log_written = 0
+            self._log_stale = True
+        else:
+            path = log_path(self.name, self.directory)
+            total, end, size = self._log_extent(path, data)
+            with self._offsets_lock:
+                self._log_offsets = {0: 0, total: end}
+            if log_tail is None:
+                game.log = read_log(path, 0, total)
+            else:
+                game.log_base = max(0, total - log_tail)
+                game.log = self.load_log(game.log_base, total)
+            # A torn last line is cut off by the next save before it appends
+            self._log_written = total if end == size else None
+            self._log_stale = False
+
+        self._seq = data.get("seq", 0)
+        self._journal_records = 0
+        for record in self._journal_tail():
+            self._apply(game, record)
+            self._seq = record["seq"]
+            self._journal_records += 1
+
+        if not game.history_matches_board():
+            # Saved without a history (or with a damaged one): start it from here
+            game.reset_history()
+        self._remember(game)
+        return game
+
+    def load_log(self, start, end):
+        """Saved log entries number start to end (excluded)"""
+        path = log_path(self.name, self.directory)
+        # Read backwards from the nearest known line start at or after the page
+        with self._offsets_lock:
+            offsets = self._log_offsets
+            after = min((index for index in offsets if index >= end), default=None)
+            after_offset = offsets.get(after)
+        if after is None:
+            return read_log(path, start, end)
+        try:
+            with open(path, "rb") as f:
+                lines, offset = _lines_before(f, after_offset, after - start)
+        except FileNotFoundError:
+            return []
+        if len(lines) == after - start:
+            with self._offsets_lock:
+                # Not if a save rewrote the log file meanwhile
+                if self._log_offsets is offsets:
+                    offsets[start] = offset
+        return _parse_log(lines[:end - start])
+
+    @staticmethod
+    def _log_extent(path, header):
+        """_scan_log of the log, scanning only what was appended after the header was written"""
+        count, size = header.get("log_count"), header.get("log_size")
+        try:
+            if count is None or size is None or os.path.getsize(path) < size:
+                return _scan_log(path)
+        except FileNotFoundError:
+            return 0, 0, 0
+        # The first ``count`` entries are the ``size`` bytes up to the header's sync
+        appended, end, file_size = _scan_log(path, size)
+        return count + appended, end, file_size
+
+    def upgrade(self):
+        """Rewrite a save of the single-file layout as header, log file and empty journal.
+
+        The snapshot is read with a JsonStream, so its log goes to the log
+        file one entry at a time and is never in memory as a whole. Returns
+        False (and changes nothing) if the save already has the header layout.
+        """
+        path = log_path(self.name, self.directory)
+        tmp_path = path + ".tmp"
+        header = {}
+        count = None
+        with open(snapshot_path(self.name, self.directory), "r") as f, open(tmp_path, "w") as log_file:
+            for key, value in JsonStream(f).items(stream_keys=("log",)):
+                if key != "log":
+                    header[key] = value
+                    continue
+                count = 0
+                for entry in value:
+                    log_file.write(_log_line(entry))
+                    count += 1
+            if count is None:
+                log_file.close()
+                os.remove(tmp_path)
+                return False
+            game = game_from_header(header)
+            self._seq = header.get("seq", 0)
+            for record in self._journal_tail():
+                if record["op"] == "log":
+                    log_file.write(_log_line(record["e"]))
+                    count += 1
+                else:
+                    self._apply(game, record)
+                self._seq = record["seq"]
+            log_file.flush()
+            os.fsync(log_file.fileno())
+        os.replace(tmp_path, path)
+
+        game.log_base = count
+        if not game.history_matches_board():
+            game.reset_history()
+        self._log_written = count
+        self._log_stale = False
+        self.compact(game)
+        return True
+
+    def replay(self, header):
+        """Game of a snapshot header, without its log, with the journal tail applied.
+
+        Reads neither the snapshot nor the log file; only journals of older
+        versions add entries to game.log.
+        """
+        game = game_from_header(header)
+        self._seq = header.get("seq", 0)
+        for record in self._journal_tail():
+            self._apply(game, record)
+            self._seq = record["seq"]
+        return game
+
+    def record(self, game):
+        """Persist everything that changed in the game since the last call"""
+        try:
+            self._record(game)
+        except Exception:
+            # The files may be half written: rewrite everything next time
+            self._persisted = None
+            self._log_written = None
+            raise
+
+    def _record(self, game):
+        if (self._persisted is None or self._log_stale or self._journal_torn
+                or self._journal_records >= self.compact_every):
+            self.compact(game)
+            return
+
+        # The log goes first: a crash in between leaves a logged change unsaved, never the reverse
+        self._write_log(game)
+        records = self._diff(game)
+        if not records:
+            return
+
+        lines = []
+        for record in records:
+            self._seq += 1
+            record["seq"] = self._seq
+            lines.append(json.dumps(record, separators=(",", ":")) + "\n")
+        text = "".join(lines)
+        os.makedirs(self.directory, exist_ok=True)
+        with open(journal_path(self.name, self.directory), "a") as f:
+            f.write(text)
+        # json.dumps escapes non-ASCII, so characters are bytes
+        Diagnostics().count("save.bytes_written", len(text))
+        self._journal_records += len(records)
+        self._remember(game)
+
+    def compact(self, game):
+        """Write a full snapshot of the game and empty the journal"""
+        self._write_log(game, sync=True)
+        data = {
+            "name": game.name,
+            "numbers": list(game.numbers),
+            "date": game.date,
+            "last_number": game.last_number,
+            "state": game.state,
+            "history": game.history.to_json(),
+            "log_count": self._log_written,
+            "log_size": self._log_size(),
+            "seq": self._seq
+        }
+        with self._offsets_lock:
+            self._log_offsets[data["log_count"]] = data["log_size"]
+
+        os.makedirs(self.directory, exist_ok=True)
+        path = snapshot_path(self.name, self.directory)
+        tmp_path = path + ".tmp"
+        text = json.dumps(data)
+        with open(tmp_path, "w") as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+        Diagnostics().count("save.bytes_written", len(text))
+
+        # Records up to self._seq are now in the snapshot and skipped on load,
+        # so a crash before this truncation cannot replay them twice.
+        open(journal_path(self.name, self.directory), "w").close()
+        self._journal_records = 0
+        self._journal_torn = False
+        self._remember(game)
+
+    def _write_log(self, game, sync=False):
+        """Append the entries of game.log that are not in the log file yet"""
+        path = log_path(self.name, self.directory)
+        if self._log_stale:
+            mode, written = "w", 0
+            with self._offsets_lock:
+                self._log_offsets = {0: 0}
+        else:
+            if self._log_written is None:
+                self._log_written = self._repair_log(path)
+            mode, written = "a", self._log_written
+        if written < game.log_base:
+            raise ValueError(f"{path} has {written} log entries, {game.log_base} expected")
+        entries = game.log[written - game.log_base:]
+        if not entries and mode == "a":
+            return
+
+        text = "".join(_log_line(entry.to_json()) for entry in entries)
+        os.makedirs(self.directory, exist_ok=True)
+        with open(path, mode) as f:
+            f.write(text)
+            if sync:
+                f.flush()
+                os.fsync(f.fileno())
+        Diagnostics().count("save.bytes_written", len(text))
+        self._log_written = written + len(entries)
+        self._log_stale = False
+
+    def _log_size(self):
+        try:
+            return os.path.getsize(log_path(self.name, self.directory))
+        except FileNotFoundError:
+            return 0
+
+    @staticmethod
+    def _repair_log(path):
+        """Number of complete entries in a log file, after cutting off a torn last line"""
+        count, end, size = _scan_log(path)
+        if end < size:
+            with open(path, "rb+") as f:
+                f.truncate(end)
+        return count
+
+    def _journal_tail(self):
+        """Journal records made after the snapshot, up to a torn or damaged line"""
+        self._journal_torn = False
+        path = journal_path(self.name, self.directory)
+        if not os.path.exists(path):
+            return
+        with open(path, "r") as f:
+            for line in f:
+                try:
+                    record = json.loads(line) if line.endswith("\n") else None
+                except ValueError:
+                    record = None
+                if record is None:
+                    # Torn line of an interrupted append: a record appended after it would never be read
+                    self._journal_torn = True
+                    return
+                if record["seq"] > self._seq:
+                    # Older ones are already folded into the snapshot
+                    yield record
+
+    def _remember(self, game):
+        self._persisted = {
+            "numbers": game.numbers.copy(),
+            "last_number": game.last_number,
+            "state": game.state,
+            "moves": list(game.history.moves),
+            "position": game.history.position
+        }
+
+    def _diff(self, game):
+        persisted = self._persisted
+        records = []
+
+        # Replaying removes then adds reproduces last_number in most cases;
+        # an explicit "last" record covers the rest.
+        replayed_last = persisted["last_number"]
+        for number in persisted["numbers"] - game.numbers:
+            records.append({"op": "remove", "n": number})
+            if number == replayed_last:
+                replayed_last = None
+        added = list(game.numbers - persisted["numbers"])
+        if game.last_number in added:
+            added.remove(game.last_number)
+            added.append(game.last_number)
+        for number in added:
+            records.append({"op": "add", "n": number})
+            replayed_last = number
+        if replayed_last != game.last_number:
+            records.append({"op": "last", "n": game.last_number})
+
+        if game.state != persisted["state"]:
+            records.append({"op": "state", "s": game.state})
+
+        history = game.history
+        at = common_length(persisted["moves"], history.moves)
+        if at < len(persisted["moves"]) or at < len(history.moves) or history.position != persisted["position"]:
+            records.append({"op": "history", "at": at, "m": [list(move) for move in history.moves[at:]],
+                            "pos": history.position})
+
+        return records
+
+    @staticmethod
+    def _apply(game, record):
+        # Board changes are applied directly: the history comes with its own records
+        op = record["op"]
+        if op == "add":
+            game.numbers.add(record["n"])
+            game.last_number = record["n"]
+        elif op == "remove":
+            game.numbers.discard(record["n"])
+            if game.last_number == record["n"]:
+                game.last_number = None
+        elif op == "last":
+            game.last_number = record["n"]
+        elif op == "state":
+            game.state = record["s"]
+        elif op == "log":
+            # Only in journals written before the log had its own file
+            game.log.append(LogEntry.from_json(record["e"]))
+        elif op == "history":
+            game.history.truncate(record["at"])
+            game.history.extend(Move(*move) for move in record["m"])
+            game.history.position = record["pos"]
+
+
+def upgrade_saves(directory=GAMES_DIR):
+    """Upgrade every save of a directory still in the single-file layout; returns how many"""
+    upgraded = 0
+    for file in sorted(os.listdir(directory)):
+        name, extension = os.path.splitext(file)
+        if extension != ".json" or file.startswith("."):
+            continue
+        try:
+            upgraded += GameJournal(name, directory).upgrade()
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            print(f"{name}: not upgraded ({e})")
+    return upgraded
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Move the logs of old single-file saves to their own files")
+    parser.add_argument("directory", nargs="?", default=GAMES_DIR)
+    args = parser.parse_args(argv)
+    print(f"Upgraded {upgrade_saves(args.directory)} saves")
+
+
+if __name__ == "__main__":
+    main()
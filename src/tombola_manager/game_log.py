@@ -0,0 +1,97 @@
+import time
+from collections.abc import Sequence
+from datetime import datetime
+from functools import lru_cache
+
+from .language_manager import LanguageManager
+
+# Arguments that are themselves translation keys, by log code
+TRANSLATED_ARGS = {
+    'card_win': (2,),
+    'card_tombola': (1,),
+}
+
+
+class LogEntry:
+    """One entry of the game log: a timestamp, a translation key and its arguments.
+
+    The text is only produced by ``render`` in the current language, so the
+    log can be re-rendered after a language switch and filtered on ``code``
+    without parsing strings. Entries from saves written before structured
+    logs keep their original text (``code`` is None).
+    """
+    __slots__ = ("timestamp", "code", "args")
+
+    def __init__(self, timestamp, code, args=()):
+        self.timestamp = timestamp  # seconds since the epoch, None for old text entries
+        self.code = code
+        self.args = tuple(args)
+
+    @classmethod
+    def now(cls, code, *args):
+        return cls(int(time.time()), code, args)
+
+    @classmethod
+    def from_json(cls, value):
+        """Rebuild an entry saved by to_json, or from an old preformatted string"""
+        if isinstance(value, str):
+            return cls(None, None, (value,))
+        return cls(value[0], value[1], value[2:])
+
+    def to_json(self):
+        """Compact JSON form: [timestamp, code, *args], or the text of an old entry"""
+        if self.code is None:
+            return self.args[0]
+        return [self.timestamp, self.code, *self.args]
+
+    def render(self):
+        """Text of the entry in the current language, e.g. "[21:03:11] Added number: 42" """
+        if self.code is None:
+            return self.args[0]
+        return _render(self.timestamp, self.code, self.args, LanguageManager.get_current_language())
+
+    def __eq__(self, other):
+        if not isinstance(other, LogEntry):
+            return NotImplemented
+        return (self.timestamp, self.code, self.args) == (other.timestamp, other.code, other.args)
+
+    def __repr__(self):
+        return f"LogEntry({self.timestamp!r}, {self.code!r}, {self.args!r})"
+
+
+class LogView(Sequence):
+    """Read-only view of the first ``length`` entries of a log list.
+
+    A game log only grows at its end, so the view keeps showing the same
+    entries while more are appended, without copying the list.
+    """
+    __slots__ = ("_entries", "_length")
+
+    def __init__(self, entries, length=None):
+        self._entries = entries
+        self._length = len(entries) if length is None else length
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self._entries[slice(*index.indices(self._length))]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("log index out of range")
+        return self._entries[index]
+
+
+@lru_cache(maxsize=2048)
+def _render(timestamp, code, args, language):
+    translated = TRANSLATED_ARGS.get(code, ())
+    args = [LanguageManager.get_text(arg) if i in translated else arg for i, arg in enumerate(args)]
+    clock = datetime.fromtimestamp(timestamp).strftime("%H:%M:%S")
+    return f"[{clock}] {LanguageManager.get_text(code, *args)}"
+
+
+def entries_with_code(log, *codes):
+    """Entries of a log with one of the given codes"""
+    return [entry for entry in log if entry.code in codes]
@@ -0,0 +1,260 @@
+import os
+import re
+import time
+from collections import Counter, namedtuple
+
+from .card_registry import NUMBERS_PER_CARD, NUMBERS_PER_ROW, PRIZE_ORDER, CardRegistry, prize_rank, validate_card
+from .diagnostics import Diagnostics
+from .game_storage import get_storage
+from .number_set import MAX_NUMBER
+from .save_writer import SaveWriter
+
+WARNING = "warning"
+ERROR = "error"
+
+# Outcome of a call: on failure, severity and message_key say what to tell the operator
+CallResult = namedtuple("CallResult", ["ok", "number", "severity", "message_key"])
+# Outcome of a batch of calls; rejected are the numbers the message is about
+BatchResult = namedtuple("BatchResult", ["ok", "numbers", "severity", "message_key", "rejected"])
+# Outcome of a check of claimed cards: a CardCheck per claim, and whether each one
+# reaches the prize in play; rejected are the claims the message is about
+ClaimsResult = namedtuple("ClaimsResult", ["ok", "checks", "valid", "severity", "message_key", "rejected"])
+
+_SEPARATORS = re.compile(r"[\s,;]+")
+_RANGE_DASH = re.compile(r"\s*-\s*")
+
+
+def is_batch(text):
+    """Whether the operator typed several numbers or a range rather than one number"""
+    text = str(text).strip()
+    return len(_SEPARATORS.split(text)) > 1 or "-" in text[1:]
+
+
+def parse_numbers(text):
+    """Numbers of a batch such as "5 17 23 40-44", in order; raises ValueError on bad input.
+
+    Numbers are separated by spaces, commas or semicolons; ``a-b`` (spaces
+    around the dash allowed) stands for a to b included. Range checks are left
+    to the caller, except that a range cannot be reversed or longer than the board.
+    """
+    numbers = []
+    for token in _SEPARATORS.split(_RANGE_DASH.sub("-", str(text).strip())):
+        if not token:
+            continue
+        start, dash, end = token.partition("-")
+        if not dash:
+            numbers.append(int(token))
+            continue
+        start, end = int(start), int(end)
+        if not 0 <= end - start < MAX_NUMBER:
+            raise ValueError(f"Bad range: {token}")
+        numbers.extend(range(start, end + 1))
+    if not numbers:
+        raise ValueError("No numbers")
+    return numbers
+
+
+def parse_claims(text):
+    """Claims typed by the operator, one or more per line; raises ValueError naming a bad line.
+
+    A line of 15 numbers is a card typed in row by row; any other line holds
+    card serials. Serials come back as ints, typed cards as 3 rows of 5.
+    """
+    claims = []
+    for line in str(text).splitlines():
+        tokens = [token for token in _SEPARATORS.split(line.strip()) if token]
+        if not tokens:
+            continue
+        try:
+            values = [int(token) for token in tokens]
+            if len(values) == NUMBERS_PER_CARD:
+                claims.append(validate_card(values[row:row + NUMBERS_PER_ROW]
+                                            for row in range(0, NUMBERS_PER_CARD, NUMBERS_PER_ROW)))
+            else:
+                claims.extend(values)
+        except ValueError:
+            raise ValueError(line.strip()) from None
+    if not claims:
+        raise ValueError("No claims")
+    return claims
+
+
+def _join(numbers):
+    return ", ".join(map(str, numbers))
+
+
+class GameService:
+    """Game logic shared by the windows: validation, mutation, logging and saving.
+
+    It never touches Tk, so it can be driven and measured without a display;
+    the windows only decide what to redraw and how to show a failed call.
+    """
+
+    def __init__(self, game, journal=None, writer=None):
+        self.game = game
+        self.journal = journal or get_storage().journal(game.name)
+        self.writer = writer or SaveWriter()
+        self.diagnostics = Diagnostics()
+
+    def add_number(self, text):
+        """Call the number typed by the operator"""
+        start = time.perf_counter_ns()
+        try:
+            number = int(text)
+        except (TypeError, ValueError):
+            self.game.log_action('failed_add_input')
+            return CallResult(False, None, ERROR, 'enter_valid')
+        if not 1 <= number <= 90:
+            self.game.log_action('failed_add_invalid', number)
+            return CallResult(False, number, WARNING, 'invalid_number')
+        self.diagnostics.record("call.validate", time.perf_counter_ns() - start)
+        with self.diagnostics.timer("call.game_add_number"):
+            added = self.game.add_number(number)
+        if not added:
+            self.game.log_action('failed_add', number)
+            return CallResult(False, number, WARNING, 'number_exists')
+
+        with self.diagnostics.timer("call.log"):
+            self.game.log_action('added_number', number)
+            self.log_wins()
+        self.save()
+        self.diagnostics.record("call.total", time.perf_counter_ns() - start)
+        return CallResult(True, number, None, None)
+
+    def add_numbers(self, text):
+        """Call every number of a batch typed by the operator (see parse_numbers), or none of them.
+
+        The numbers go on the board as one change with one log entry, so the
+        windows redraw once and the game is saved once.
+        """
+        with self.diagnostics.timer("call.batch"):
+            try:
+                numbers = parse_numbers(text)
+            except ValueError:
+                self.game.log_action('failed_add_batch_input')
+                return BatchResult(False, [], ERROR, 'enter_valid_batch', [])
+            invalid = [number for number in numbers if not 1 <= number <= 90]
+            if invalid:
+                self.game.log_action('failed_add_batch', _join(numbers))
+                return BatchResult(False, numbers, WARNING, 'batch_invalid', invalid)
+            counts = Counter(numbers)
+            taken = sorted(number for number in counts if counts[number] > 1 or number in self.game.numbers)
+            if taken:
+                self.game.log_action('failed_add_batch', _join(numbers))
+                return BatchResult(False, numbers, WARNING, 'batch_numbers_exist', taken)
+
+            self.game.add_numbers(numbers)
+            self.game.log_action('added_numbers', len(numbers), _join(numbers))
+            self.log_wins()
+            self.save()
+            return BatchResult(True, numbers, None, None, [])
+
+    def remove_number(self, text):
+        """Take back the number typed by the operator"""
+        try:
+            number = int(text)
+        except (TypeError, ValueError):
+            self.game.log_action('failed_remove_input')
+            return CallResult(False, None, ERROR, 'enter_valid')
+        if not self.game.remove_number(number):
+            self.game.log_action('failed_remove', number)
+            return CallResult(False, number, WARNING, 'number_not_found')
+
+        self.game.log_action('removed_number', number)
+        self.save()
+        return CallResult(True, number, None, None)
+
+    def set_state(self, state):
+        """Move the game to another prize state; returns False (nothing logged) if it is already there"""
+        if not self.game.set_state(state):
+            return False
+        self.game.log_action('state_changed', state)
+        self.save()
+        return True
+    
+    def step_back(self):
+        """Undo the last call, removal or state change; returns the move, or None at the start"""
+        move = self.game.step_back()
+        if move is not None:
+            self.game.log_action(f'undid_{move.op}', move.value)
+            self.save()
+        return move
+    
+    def step_forward(self):
+        """Redo the move stepped back over; returns it, or None if there is none"""
+        move = self.game.step_forward()
+        if move is not None:
+            self.game.log_action(f'redid_{move.op}', move.value)
+            self.save()
+        return move
+
+    def load_cards(self, path):
+        """Attach the cards of a ``.cards`` file; raises OSError or ValueError"""
+        cards = CardRegistry.load(path)
+        self.game.set_cards(cards)
+        self.game.log_action('cards_loaded', len(cards), os.path.basename(path))
+        self.save()
+        return cards
+
+    def log_entries(self, start, end):
+        """Log entries number start to end (excluded), reading the ones not loaded yet from the save"""
+        game = self.game
+        if start < game.log_base:
+            game.restore_log(self.journal.load_log(start, game.log_base))
+        return game.log[start - game.log_base:end - game.log_base]
+
+    def check_claims(self, text, record=True):
+        """Check the cards claimed by players (see parse_claims) against the called numbers.
+
+        A claim is valid when its card reaches the prize in play or a later one.
+        With ``record`` the check goes to the log; a window re-checking the
+        same claims after a change to the board passes False.
+        """
+        with self.diagnostics.timer("call.check_claims"):
+            try:
+                claims = parse_claims(text)
+            except ValueError as e:
+                return ClaimsResult(False, [], [], ERROR, 'enter_valid_claims', [str(e)])
+            unknown = [claim for claim in claims if isinstance(claim, int) and claim not in self.game.cards]
+            if unknown:
+                return ClaimsResult(False, [], [], WARNING, 'claims_unknown_serials', unknown)
+
+            checks = self.game.check_cards(claims)
+            first_prize = self._first_prize()
+            valid = [prize_rank(check.prize) >= first_prize for check in checks]
+            if record:
+                self.game.log_action('claims_checked', len(checks), sum(valid))
+                self.save()
+            return ClaimsResult(True, checks, valid, None, None, [])
+
+    def _first_prize(self):
+        """Rank in PRIZE_ORDER of the prize in play; past the end for a state that is not a prize"""
+        state = self.game.state.lower()
+        return PRIZE_ORDER.index(state) if state in PRIZE_ORDER else len(PRIZE_ORDER)
+
+    def log_wins(self):
+        """Log the wins of the last call for the prize in play and the ones after it"""
+        first_prize = self._first_prize()
+        for win in self.game.last_wins:
+            if PRIZE_ORDER.index(win.prize) < first_prize:
+                continue
+            if win.row is None:
+                self.game.log_action('card_tombola', win.serial, win.prize)
+            else:
+                self.game.log_action('card_win', win.serial, win.row + 1, win.prize)
+
+    def save(self):
+        """Queue the game for saving on the writer thread"""
+        with self.diagnostics.timer("call.save_submit"):
+            self.writer.submit(self.journal, self.game)
+
+    def save_status(self):
+        return self.writer.status(self.journal)
+
+    def flush(self, timeout=None):
+        """Wait for pending saves; returns False on timeout"""
+        return self.writer.flush(timeout)
+
+    def close(self):
+        """Let the writer forget the game once its saves are written; no more calls after this"""
+        self.writer.release(self.journal)
@@ -0,0 +1,359 @@
+"""Statistics across every saved game of a directory.
+
+Counts how often each number was called, the time between calls (from the
+timestamps of the log entries), how long games lasted and which state each
+game reached. Saves are read as streams, one game at a time, so memory does
+not grow with the length of a log; games are spread over a process pool, and
+the summary of every game is cached in ``<directory>/.stats`` under the size
+and mtime of its files, so a second run only reads new or changed games.
+
+Usage::
+
+    python -m tombola_manager.game_stats games --json stats.json --csv games.csv
+"""
+import argparse
+import csv
+import json
+import os
+import re
+from bisect import bisect_left
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+
+from .game_catalog import scan_saves
+from .game_journal import GAMES_DIR, GameJournal, log_path, snapshot_path
+from .json_stream import JsonStream
+from .number_set import MAX_NUMBER, NumberSet
+
+STATS_FILE = ".stats"
+# 2: call entries of text logs are counted
+STATS_VERSION = 2
+
+# Log codes of a call; a batch of numbers counts as one call
+CALL_CODES = ("added_number", "added_numbers")
+# Call entries of the text log of the first versions, in English or Italian, e.g.
+# "[21:03:11] Added number: 42": only a clock time, placed from the game's date on
+_TEXT_CALL = re.compile(r"\[(\d\d):(\d\d):(\d\d)\] (?:Added number|Aggiunto numero): \d+$")
+# Log file lines that are text call entries; other lines fail on their first byte
+_TEXT_LOG_CALL = re.compile(rb'"\[\d\d:\d\d:\d\d\] (?:Added number|Aggiunto numero): ').match
+# Upper bounds in seconds of the time-between-calls buckets; the last bucket holds
+# longer gaps, which are pauses (e.g. a game resumed the next day) and not playing time
+INTERVAL_BOUNDS = (5, 10, 15, 20, 30, 45, 60, 90, 120, 300, 600)
+# Upper bounds in minutes of the game duration buckets
+DURATION_BOUNDS = (15, 30, 45, 60, 90, 120, 180, 240)
+# Snapshots larger than this (single-file saves of older versions) are streamed
+STREAM_SIZE = 1 << 20
+# Call entries of a log file parsed at a time
+LOG_PAGE = 4096
+# Games handed to the pool at a time: results are merged as they come back
+BATCH_GAMES = 256
+
+# What the statistics keep of a game; numbers are NumberSet bits, duration is
+# the playing time in seconds: the sum of the gaps between calls, pauses excluded
+GameSummary = namedtuple("GameSummary", ["name", "date", "state", "called", "numbers", "calls",
+                                         "duration", "intervals", "started", "ended"])
+
+
+def _bucket_labels(bounds, unit):
+    return [f"<={bound}{unit}" for bound in bounds] + [f">{bounds[-1]}{unit}"]
+
+
+class _CallTimes:
+    """Gaps between the timestamped call entries of one log, fed in order"""
+
+    def __init__(self):
+        self.calls = 0
+        self.duration = 0
+        self.intervals = [0] * (len(INTERVAL_BOUNDS) + 1)
+        self.started = None
+        self.ended = None
+        # Day and clock time of the last text entry, starting from the game's date
+        self._day = None
+        self._clock = None
+
+    def set_date(self, date):
+        """Date the game was created, "YYYY-MM-DD HH:MM:SS"; text entries are skipped without it"""
+        try:
+            created = datetime.strptime(date, "%Y-%m-%d %H:%M:%S")
+        except (TypeError, ValueError):
+            return
+        self._day = datetime(created.year, created.month, created.day)
+        self._clock = created - self._day
+
+    def _text_timestamp(self, text):
+        """Timestamp of a text call entry, None for other text"""
+        match = _TEXT_CALL.match(text)
+        if match is None or self._day is None:
+            return None
+        hours, minutes, seconds = map(int, match.groups())
+        clock = timedelta(hours=hours, minutes=minutes, seconds=seconds)
+        if clock < self._clock:
+            # The clock went back: the game went on past midnight
+            self._day += timedelta(days=1)
+        self._clock = clock
+        return int((self._day + clock).timestamp())
+
+    def add(self, value):
+        """Count a log entry in its JSON form; entries of other codes are skipped"""
+        if isinstance(value, str):
+            timestamp = self._text_timestamp(value)
+        elif isinstance(value, list) and len(value) >= 2 and value[1] in CALL_CODES:
+            timestamp = value[0]
+        else:
+            return
+        if timestamp is None:
+            return
+        self.calls += 1
+        if self.ended is None:
+            self.started = timestamp
+        else:
+            gap = max(0, timestamp - self.ended)
+            bucket = bisect_left(INTERVAL_BOUNDS, gap)
+            self.intervals[bucket] += 1
+            if bucket < len(INTERVAL_BOUNDS):
+                self.duration += gap
+        self.ended = timestamp
+
+
+def _add_page(times, lines):
+    # One json.loads per page is much faster than one per line
+    for value in json.loads(b"[" + b",".join(lines) + b"]"):
+        times.add(value)
+
+
+def summarize_game(name, directory=GAMES_DIR):
+    """GameSummary of a saved game"""
+    times = _CallTimes()
+    path = snapshot_path(name, directory)
+    with open(path, "r") as f:
+        if os.path.getsize(path) < STREAM_SIZE:
+            header = json.load(f)
+            times.set_date(header.get("date"))
+            single_file = "log" in header
+            for value in header.pop("log", ()):
+                times.add(value)
+        else:
+            header = {}
+            single_file = False
+            for key, value in JsonStream(f).items(stream_keys=("log",)):
+                if key == "log":
+                    single_file = True
+                    for entry in value:
+                        times.add(entry)
+                else:
+                    # Older versions wrote the date before the log
+                    if key == "date":
+                        times.set_date(value)
+                    header[key] = value
+
+    if not single_file:
+        # Header layout: the log has its own file
+        page = []
+        try:
+            with open(log_path(name, directory), "rb") as f:
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break
+                    # Most entries are not calls: skip them without parsing
+                    if b'"added_number' in line or _TEXT_LOG_CALL(line):
+                        page.append(line)
+                        if len(page) == LOG_PAGE:
+                            _add_page(times, page)
+                            page = []
+        except FileNotFoundError:
+            pass
+        _add_page(times, page)
+
+    game = GameJournal(name, directory).replay(header)
+    for entry in game.log:
+        times.add(entry.to_json())
+    return GameSummary(name, game.date, game.state, len(game.numbers), game.numbers.bits, times.calls,
+                       times.duration, times.intervals, times.started, times.ended)
+
+
+def _summarize(job):
+    directory, name = job
+    try:
+        return name, summarize_game(name, directory)
+    except (OSError, ValueError, KeyError, TypeError, IndexError):
+        # Not a readable save: cached as None until its files change
+        return name, None
+
+
+class ArchiveStats:
+    """Statistics across the saved games of a directory.
+
+    ``refresh`` summarizes the games that are new or changed since the last
+    run, in a process pool, and keeps the summaries in ``<directory>/.stats``;
+    ``totals`` and the exports work from the summaries only.
+    """
+
+    def __init__(self, directory=GAMES_DIR):
+        self.directory = directory
+        self._entries = {}  # name -> (file signature, GameSummary or None)
+        self._load_cache()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def refresh(self, workers=None):
+        """Bring the summaries up to date with the files on disk; returns how many games were read"""
+        signatures = scan_saves(self.directory)
+        changed = False
+        for name in list(self._entries):
+            if name not in signatures:
+                del self._entries[name]
+                changed = True
+
+        stale = [name for name, signature in signatures.items()
+                 if name not in self._entries or self._entries[name][0] != signature]
+        jobs = [(self.directory, name) for name in stale]
+        if workers == 1 or len(jobs) < BATCH_GAMES:
+            self._store(map(_summarize, jobs), signatures)
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                for start in range(0, len(jobs), BATCH_GAMES):
+                    self._store(pool.map(_summarize, jobs[start:start + BATCH_GAMES], chunksize=16), signatures)
+
+        if changed or stale:
+            self._save_cache()
+        return len(stale)
+
+    def _store(self, results, signatures):
+        for name, summary in results:
+            self._entries[name] = (signatures[name], summary)
+
+    def games(self):
+        """Summaries of the readable games, oldest first"""
+        return sorted((summary for _, summary in self._entries.values() if summary is not None),
+                      key=lambda summary: (summary.date, summary.name))
+
+    def totals(self):
+        """Statistics across all games, as plain JSON types"""
+        frequencies = [0] * (MAX_NUMBER + 1)
+        states = {}
+        intervals = [0] * (len(INTERVAL_BOUNDS) + 1)
+        durations = [0] * (len(DURATION_BOUNDS) + 1)
+        games = calls = duration = timed = 0
+        for _, summary in self._entries.values():
+            if summary is None:
+                continue
+            games += 1
+            calls += summary.calls
+            for number in NumberSet.from_bits(summary.numbers):
+                frequencies[number] += 1
+            states[summary.state] = states.get(summary.state, 0) + 1
+            for bucket, count in enumerate(summary.intervals):
+                intervals[bucket] += count
+            if summary.calls > 1:
+                timed += 1
+                duration += summary.duration
+                durations[bisect_left(DURATION_BOUNDS, summary.duration / 60)] += 1
+
+        gaps = sum(intervals[:-1])
+        return {
+            "games": games,
+            "unreadable": len(self._entries) - games,
+            "calls": calls,
+            "numbers": {number: frequencies[number] for number in range(1, MAX_NUMBER + 1)},
+            "states": dict(sorted(states.items(), key=lambda item: -item[1])),
+            "mean_interval_s": round(duration / gaps, 1) if gaps else None,
+            "intervals": dict(zip(_bucket_labels(INTERVAL_BOUNDS, "s"), intervals)),
+            "mean_duration_min": round(duration / timed / 60, 1) if timed else None,
+            "durations": dict(zip(_bucket_labels(DURATION_BOUNDS, "min"), durations)),
+        }
+
+    def write_json(self, path):
+        with open(path, "w") as f:
+            json.dump(self.totals(), f, indent=2)
+
+    def write_csv(self, path):
+        """One row per game"""
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["name", "date", "state", "called", "calls", "duration_s", "mean_interval_s",
+                             "first_call", "last_call"])
+            for summary in self.games():
+                gaps = sum(summary.intervals[:-1])
+                writer.writerow([summary.name, summary.date, summary.state, summary.called, summary.calls,
+                                 summary.duration, round(summary.duration / gaps, 1) if gaps else "",
+                                 _clock(summary.started), _clock(summary.ended)])
+
+    def write_numbers_csv(self, path):
+        """One row per number: in how many games it was called"""
+        totals = self.totals()
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["number", "games", "share"])
+            for number, count in totals["numbers"].items():
+                writer.writerow([number, count, round(count / totals["games"], 4) if totals["games"] else ""])
+
+    def _load_cache(self):
+        path = os.path.join(self.directory, STATS_FILE)
+        try:
+            with open(path, "r") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get("version") != STATS_VERSION:
+            return
+        for name, (signature, summary) in data["games"].items():
+            self._entries[name] = (tuple(signature), GameSummary(*summary) if summary else None)
+
+    def _save_cache(self):
+        data = {
+            "version": STATS_VERSION,
+            "games": {name: [signature, list(summary) if summary else None]
+                      for name, (signature, summary) in self._entries.items()}
+        }
+        path = os.path.join(self.directory, STATS_FILE)
+        tmp_path = path + ".tmp"
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump(data, f, separators=(",", ":"))
+            os.replace(tmp_path, path)
+        except OSError:
+            # Only a cache: the next run reads everything again
+            pass
+
+
+def _clock(timestamp):
+    return datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d %H:%M:%S") if timestamp is not None else ""
+
+
+def format_totals(totals):
+    """Short text report of totals()"""
+    numbers = sorted(totals["numbers"].items(), key=lambda item: (-item[1], item[0]))
+    lines = [f"{totals['games']} games ({totals['unreadable']} unreadable), {totals['calls']} calls",
+             f"Mean time between calls: {totals['mean_interval_s']} s",
+             f"Mean game duration: {totals['mean_duration_min']} min",
+             "States reached: " + ", ".join(f"{state} {count}" for state, count in totals["states"].items()),
+             "Most called: " + ", ".join(f"{number} ({count})" for number, count in numbers[:5]),
+             "Least called: " + ", ".join(f"{number} ({count})" for number, count in numbers[-5:])]
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Statistics across all saved games")
+    parser.add_argument("directory", nargs="?", default=GAMES_DIR)
+    parser.add_argument("--json", help="write the totals to this JSON file")
+    parser.add_argument("--csv", help="write one row per game to this CSV file")
+    parser.add_argument("--numbers-csv", help="write the frequency of each number to this CSV file")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="worker processes")
+    args = parser.parse_args(argv)
+
+    stats = ArchiveStats(args.directory)
+    read = stats.refresh(args.workers)
+    print(f"Read {read} new or changed games")
+    print(format_totals(stats.totals()))
+    if args.json:
+        stats.write_json(args.json)
+    if args.csv:
+        stats.write_csv(args.csv)
+    if args.numbers_csv:
+        stats.write_numbers_csv(args.numbers_csv)
+
+
+if __name__ == "__main__":
+    main()
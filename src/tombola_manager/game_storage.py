@@ -0,0 +1,77 @@
+import os
+
+from .game_catalog import GameCatalog
+from .game_journal import GAMES_DIR, GameJournal
+
+STORAGE_ENV = "TOMBOLA_STORAGE"
+
+
+class GameStorage:
+    """Where games are kept.
+
+    ``journal(name)`` returns the object that loads and saves one game: it
+    has ``load(log_tail=None)`` returning a TombolaGame (with only the last
+    ``log_tail`` log entries, if given) or raising FileNotFoundError if
+    there is no such game, ``load_log(start, end)`` returning saved log
+    entries, and ``record(game)`` persisting whatever changed since the
+    last call (the SaveWriter calls it from its thread). The rest answers
+    the load list.
+    """
+
+    def journal(self, name):
+        raise NotImplementedError
+
+    def refresh(self):
+        """Pick up games changed outside this process"""
+
+    def games(self, sort_key="date", reverse=False, text_filter=""):
+        """GameInfo of the saved games, filtered on name or state and sorted"""
+        raise NotImplementedError
+
+    def get(self, name):
+        """GameInfo of a game, or None"""
+        raise NotImplementedError
+
+    def __contains__(self, name):
+        raise NotImplementedError
+
+
+class JsonStorage(GameStorage):
+    """Games as JSON snapshots plus journals in a directory, listed through a GameCatalog"""
+
+    def __init__(self, directory=GAMES_DIR):
+        self.directory = directory
+        self.catalog = GameCatalog(directory)
+
+    def journal(self, name):
+        return GameJournal(name, self.directory)
+
+    def refresh(self):
+        self.catalog.refresh()
+
+    def games(self, sort_key="date", reverse=False, text_filter=""):
+        return self.catalog.games(sort_key, reverse, text_filter)
+
+    def get(self, name):
+        return self.catalog.get(name)
+
+    def __contains__(self, name):
+        return name in self.catalog
+
+
+_storage = None
+
+
+def get_storage():
+    """The storage selected by TOMBOLA_STORAGE: "json" (default) or "sqlite" """
+    global _storage
+    if _storage is None:
+        backend = os.environ.get(STORAGE_ENV, "json").lower()
+        if backend == "sqlite":
+            from .sqlite_storage import SqliteStorage
+            _storage = SqliteStorage()
+        elif backend == "json":
+            _storage = JsonStorage()
+        else:
+            raise ValueError(f"Unknown {STORAGE_ENV} backend: {backend}")
+    return _storage
@@ -0,0 +1,102 @@
+import json
+
+_BLANKS = " \t\r\n"
+_DELIMITERS = _BLANKS + ",]}"
+
+
+class JsonStream:
+    """Reads a JSON object from a text file one member at a time.
+
+    ``items(stream_keys)`` yields the (key, value) pairs of the top-level
+    object; the values of ``stream_keys`` that are arrays come as iterators
+    over their elements instead of lists. Only one element (plus one read
+    chunk) is in memory at a time, so a large array of small values costs
+    constant memory.
+    """
+
+    def __init__(self, file, chunk_size=1 << 16):
+        self.file = file
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.pos = 0
+        self.decoder = json.JSONDecoder()
+
+    def items(self, stream_keys=()):
+        self._expect("{")
+        if self._peek() == "}":
+            self.pos += 1
+            return
+        while True:
+            key = self._value()
+            self._expect(":")
+            if key in stream_keys and self._peek() == "[":
+                elements = self._array()
+                yield key, elements
+                # Skip whatever the caller did not read
+                for _ in elements:
+                    pass
+            else:
+                yield key, self._value()
+            if self._next_delimiter("}"):
+                return
+
+    def _array(self):
+        self._expect("[")
+        if self._peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            yield self._value()
+            if self._next_delimiter("]"):
+                return
+
+    def _fill(self):
+        """Read the next chunk after what is left of the buffer; False at the end of the file"""
+        data = self.file.read(self.chunk_size)
+        if not data:
+            return False
+        self.buffer = self.buffer[self.pos:] + data
+        self.pos = 0
+        return True
+
+    def _peek(self):
+        """Next character that is not blank, "" at the end of the file"""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in _BLANKS:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                return ""
+
+    def _expect(self, char):
+        found = self._peek()
+        if found != char:
+            raise ValueError(f"Expected {char!r} but found {found or 'the end of the file'!r}")
+        self.pos += 1
+
+    def _next_delimiter(self, closing):
+        """Step over the "," between two members or the closing bracket; True at the closing one"""
+        found = self._peek()
+        if found not in (",", closing):
+            raise ValueError(f"Expected ',' or {closing!r} but found {found or 'the end of the file'!r}")
+        self.pos += 1
+        return found == closing
+
+    def _value(self):
+        self._peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                # The value goes on in the next chunk (or the file is broken)
+                if not self._fill():
+                    raise
+                continue
+            # A number cut by the end of the buffer parses as a shorter one: it
+            # is only complete once a delimiter follows it
+            if (isinstance(value, (int, float)) and (end == len(self.buffer) or self.buffer[end] not in _DELIMITERS)
+                    and self._fill()):
+                continue
+            self.pos = end
+            return value
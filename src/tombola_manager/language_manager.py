@@ -1,8 +1,9 @@
-from .translations import TRANSLATIONS
+from .translations import LANGUAGES, texts
 
 class LanguageManager:
     _instance = None
     _current_language = 'en'  # Default language
+    _listeners = []  # Called with the new language code after a change
 
     def __new__(cls):
         if cls._instance is None:
@@ -13,7 +14,7 @@ class LanguageManager:
     def get_text(cls, key, *args):
         """Get translated text for the given key"""
         try:
-            text = TRANSLATIONS[cls._current_language][key]
+            text = texts(cls._current_language)[key]
             if args:
                 return text.format(*args)
             return text
@@ -23,11 +24,23 @@ class LanguageManager:
     @classmethod
     def set_language(cls, language):
         """Set the current language (en/it)"""
-        if language in TRANSLATIONS:
+        if language in LANGUAGES:
             cls._current_language = language
+            for listener in list(cls._listeners):
+                listener(language)
             return True
         return False
 
+    @classmethod
+    def add_listener(cls, listener):
+        """Call listener(language) whenever the language changes"""
+        cls._listeners.append(listener)
+
+    @classmethod
+    def remove_listener(cls, listener):
+        if listener in cls._listeners:
+            cls._listeners.remove(listener)
+
     @classmethod
     def get_current_language(cls):
         """Get the current language code"""
@@ -1,13 +1,22 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
-import json
-import os
 
 from src.tombola_manager.tombola_game import TombolaGame
-from src.tombola_manager.view_window import ViewWindow
-from src.tombola_manager.control_window import ControlWindow
-from src.tombola_manager.utils import resource_path
+from src.tombola_manager.game_storage import get_storage
+from src.tombola_manager.save_writer import SaveWriter
+from src.tombola_manager.utils import log_window, resource_path
 from src.tombola_manager.language_manager import LanguageManager
+from src.tombola_manager.translations import LANGUAGES
+from src.tombola_manager.diagnostics import Diagnostics
+
+# Load list columns: (GameInfo field, translation key, width)
+GAME_COLUMNS = (
+    ("name", 'column_name', 130),
+    ("date", 'column_date', 120),
+    ("state", 'column_state', 80),
+    ("called", 'column_called', 60),
+    ("size", 'column_size', 70),
+)
 
 
 class MainWindow:
@@ -15,7 +24,7 @@ class MainWindow:
         self.window = tk.Tk()
         self.lang = LanguageManager()
         self.window.title(self.lang.get_text('app_title'))
-        self.window.geometry("500x500")
+        self.window.geometry("560x560")
         
         # Set custom icon
         self.window.iconbitmap(resource_path('src/tombola_manager/icon/icon.ico'))
@@ -26,7 +35,7 @@ class MainWindow:
         
         ttk.Label(lang_frame, text="Language/Lingua:").pack(side="left", padx=5)
         self.lang_var = tk.StringVar(value=self.lang.get_current_language())
-        lang_combo = ttk.Combobox(lang_frame, textvariable=self.lang_var, values=["en", "it"], state="readonly", width=5)
+        lang_combo = ttk.Combobox(lang_frame, textvariable=self.lang_var, values=LANGUAGES, state="readonly", width=5)
         lang_combo.pack(side="left")
         lang_combo.bind("<<ComboboxSelected>>", self.change_language)
         
@@ -44,8 +53,27 @@ class MainWindow:
         load_game_frame = ttk.LabelFrame(self.window, text=self.lang.get_text('load_game'))
         load_game_frame.pack(padx=10, pady=10, fill="x", expand=True)
         
-        self.games_listbox = tk.Listbox(load_game_frame)
-        self.games_listbox.pack(padx=10, pady=5, fill="both", expand=True)
+        # Filter on name or state
+        filter_frame = ttk.Frame(load_game_frame)
+        filter_frame.pack(padx=10, pady=5, fill="x")
+        self.filter_label = ttk.Label(filter_frame, text=self.lang.get_text('filter_games'))
+        self.filter_label.pack(side="left")
+        self.filter_var = tk.StringVar()
+        self.filter_var.trace_add("write", lambda *args: self.show_games())
+        ttk.Entry(filter_frame, textvariable=self.filter_var).pack(side="left", padx=5, fill="x", expand=True)
+        
+        # Saved games with their metadata, sortable by clicking a heading
+        self.storage = get_storage()
+        self.sort_column = "date"
+        self.sort_reverse = True
+        self.games_table = ttk.Treeview(load_game_frame, columns=[c[0] for c in GAME_COLUMNS],
+                                        show="headings", height=8, selectmode="browse")
+        for column, key, width in GAME_COLUMNS:
+            self.games_table.heading(column, text=self.lang.get_text(key),
+                                     command=lambda c=column: self.sort_games(c))
+            self.games_table.column(column, width=width)
+        self.games_table.pack(padx=10, pady=5, fill="both", expand=True)
+        self.games_table.bind("<Double-1>", lambda event: self.load_game())
         ttk.Button(load_game_frame, text=self.lang.get_text('load_selected_game'), 
                  command=self.load_game).pack(pady=5)
         
@@ -69,48 +97,60 @@ class MainWindow:
                             child.configure(text=self.lang.get_text('load_selected_game'))
                     elif isinstance(child, ttk.Label) and 'game_name' in str(child):
                         child.configure(text=self.lang.get_text('game_name'))
+        self.filter_label.configure(text=self.lang.get_text('filter_games'))
+        for column, key, width in GAME_COLUMNS:
+            self.games_table.heading(column, text=self.lang.get_text(key))
         
     def update_games_list(self):
-        self.games_listbox.delete(0, tk.END)
-        if os.path.exists("games"):
-            for file in os.listdir("games"):
-                if file.endswith(".json"):
-                    self.games_listbox.insert(tk.END, file[:-5])
+        self.storage.refresh()
+        self.show_games()
+    
+    def show_games(self):
+        self.games_table.delete(*self.games_table.get_children())
+        for info in self.storage.games(self.sort_column, self.sort_reverse, self.filter_var.get()):
+            self.games_table.insert("", "end", iid=info.name, values=(
+                info.name,
+                info.date,
+                info.state,
+                info.called,
+                f"{info.size / 1024:.1f} KB"
+            ))
+    
+    def sort_games(self, column):
+        if column == self.sort_column:
+            self.sort_reverse = not self.sort_reverse
+        else:
+            self.sort_column = column
+            self.sort_reverse = False
+        self.show_games()
     
     def start_new_game(self):
         name = self.name_entry.get().strip()
         if name:
-            if os.path.exists(f"games/{name}.json"):
+            self.storage.refresh()
+            if name in self.storage:
                 messagebox.showerror(self.lang.get_text('error'), 
                                    self.lang.get_text('game_exists'))
                 return
             
             game = TombolaGame(name)
-            game.log_action(self.lang.get_text('game_created'))
-            view_window = ViewWindow(game)
-            ControlWindow(game, view_window)
+            game.log_action('game_created')
+            self.open_game(game)
         else:
             messagebox.showerror(self.lang.get_text('error'), 
                                self.lang.get_text('enter_game_name'))
     
     def load_game(self):
-        selection = self.games_listbox.curselection()
+        selection = self.games_table.selection()
         if selection:
-            game_name = self.games_listbox.get(selection[0])
+            game_name = selection[0]
             try:
-                with open(f"games/{game_name}.json", "r") as f:
-                    data = json.load(f)
+                journal = self.storage.journal(game_name)
+                # Only the log page the control window shows is read now, older entries on demand
+                game = journal.load(log_tail=log_window())
+                game.log_action('game_loaded')
                 
-                game = TombolaGame(data["name"])
-                game.numbers = set(data["numbers"])
-                game.date = data["date"]
-                game.log = data.get("log", [])
-                game.last_number = data.get("last_number", None)
-                game.state = data.get("state", "Ambo")
-                game.log_action(self.lang.get_text('game_loaded'))
-                
-                view_window = ViewWindow(game)
-                ControlWindow(game, view_window)
+                self.open_game(game, journal)
             except Exception as e:
                 messagebox.showerror(
                     self.lang.get_text('error'),
@@ -122,5 +162,24 @@ class MainWindow:
                 self.lang.get_text('select_game')
             )
     
+    @staticmethod
+    def game_windows():
+        """The ViewWindow and ControlWindow classes, imported when the first game opens.
+
+        They bring in the boards, the game service and the live board server,
+        none of which the start screen needs.
+        """
+        from src.tombola_manager.view_window import ViewWindow
+        from src.tombola_manager.control_window import ControlWindow
+        return ViewWindow, ControlWindow
+    
+    def open_game(self, game, journal=None):
+        with Diagnostics().timer("main.open_game"):
+            view_window, control_window = self.game_windows()
+            view_window(game)
+            control_window(game, journal)
+    
     def run(self):
-        self.window.mainloop()
\ No newline at end of file
+        self.window.mainloop()
+        # Write whatever is still queued before the process exits
+        SaveWriter().close()
\ No newline at end of file
@@ -0,0 +1,130 @@
+import os
+import tkinter as tk
+from collections import namedtuple
+
+from src.tombola_manager.diagnostics import Diagnostics
+from src.tombola_manager.number_set import MAX_NUMBER, NumberSet
+
+BOARD_ENV = "TOMBOLA_BOARD"
+COLUMNS = 10
+ROWS = MAX_NUMBER // COLUMNS
+
+# Look of a cell: background, text colour and font (a tuple or a tkinter Font)
+CellStyle = namedtuple("CellStyle", ["bg", "fg", "font"])
+
+
+def _cell_position(number):
+    return (number - 1) // COLUMNS, (number - 1) % COLUMNS
+
+
+class NumberBoard:
+    """The 1-90 board of a window, recoloured cell by cell.
+
+    ``styles`` maps "uncalled", "called" and "last" to a CellStyle. The
+    board remembers what it shows, so ``update`` only repaints the cells
+    whose called/last state changed. ``widget`` is what the window lays out.
+    """
+    # Tk configure calls made by one paint, for the tk.calls.board counter
+    tk_calls_per_paint = 1
+
+    def __init__(self, parent, styles, background, cell_width, cell_height, outline=None):
+        self.styles = styles
+        self.rendered_numbers = NumberSet()
+        self.rendered_last = None
+        self.diagnostics = Diagnostics()
+
+    def update(self, numbers, last_number=None):
+        """Show numbers as called and last_number (if any) as the last call"""
+        changed = self.rendered_numbers ^ numbers
+        changed.update(n for n in (self.rendered_last, last_number) if n is not None)
+        for number in changed:
+            if number == last_number:
+                self.paint(number, self.styles["last"])
+            elif number in numbers:
+                self.paint(number, self.styles["called"])
+            else:
+                self.paint(number, self.styles["uncalled"])
+        if changed:
+            self.diagnostics.count("tk.calls.board", len(changed) * self.tk_calls_per_paint)
+        self.rendered_numbers = numbers.copy()
+        self.rendered_last = last_number
+
+    def paint(self, number, style):
+        raise NotImplementedError
+
+
+class CanvasBoard(NumberBoard):
+    """All 90 cells drawn on one Canvas: a rectangle and a text item per cell.
+
+    The items are created once and recoloured with itemconfigure; a resize
+    scales every cell with a single ``scale`` call. Fonts are not scaled, so
+    pass tkinter Font objects to have the text follow the window.
+    """
+    tk_calls_per_paint = 2
+
+    def __init__(self, parent, styles, background, cell_width, cell_height, outline=None):
+        super().__init__(parent, styles, background, cell_width, cell_height, outline)
+        self.size = (cell_width * COLUMNS, cell_height * ROWS)
+        self.widget = tk.Canvas(parent, width=self.size[0], height=self.size[1], bg=background,
+                                highlightthickness=0, borderwidth=0)
+        uncalled = styles["uncalled"]
+        self.cells = [None]
+        self.texts = [None]
+        for number in range(1, MAX_NUMBER + 1):
+            row, col = _cell_position(number)
+            x, y = col * cell_width, row * cell_height
+            self.cells.append(self.widget.create_rectangle(
+                x + 2, y + 2, x + cell_width - 2, y + cell_height - 2,
+                fill=uncalled.bg, outline=outline or "", tags=("cell",)))
+            self.texts.append(self.widget.create_text(
+                x + cell_width / 2, y + cell_height / 2, text=str(number),
+                fill=uncalled.fg, font=uncalled.font, tags=("cell",)))
+        self.widget.bind('<Configure>', self.scale_to_size)
+
+    def paint(self, number, style):
+        self.widget.itemconfigure(self.cells[number], fill=style.bg)
+        self.widget.itemconfigure(self.texts[number], fill=style.fg, font=style.font)
+
+    def scale_to_size(self, event):
+        if (event.width, event.height) == self.size or event.width < 2 or event.height < 2:
+            return
+        self.widget.scale("cell", 0, 0, event.width / self.size[0], event.height / self.size[1])
+        self.size = (event.width, event.height)
+
+
+class LabelBoard(NumberBoard):
+    """One Label per cell in a grid of fixed-size frames, for Tk builds where the canvas misbehaves"""
+
+    def __init__(self, parent, styles, background, cell_width, cell_height, outline=None):
+        super().__init__(parent, styles, background, cell_width, cell_height, outline)
+        self.widget = tk.Frame(parent, bg=background)
+        uncalled = styles["uncalled"]
+        self.labels = [None]
+        for number in range(1, MAX_NUMBER + 1):
+            row, col = _cell_position(number)
+            # A frame per cell keeps every cell the same size whatever its font
+            frame = tk.Frame(self.widget, width=cell_width - 4, height=cell_height - 4, bg=background)
+            frame.grid(row=row, column=col, padx=2, pady=2, sticky="nsew")
+            frame.grid_propagate(False)
+            label = tk.Label(frame, text=str(number), bg=uncalled.bg, fg=uncalled.fg, font=uncalled.font,
+                             relief="raised" if outline else "flat", borderwidth=1 if outline else 0)
+            label.place(relx=0, rely=0, relwidth=1, relheight=1)
+            self.labels.append(label)
+        for i in range(ROWS):
+            self.widget.grid_rowconfigure(i, weight=1, uniform="cell")
+        for i in range(COLUMNS):
+            self.widget.grid_columnconfigure(i, weight=1, uniform="cell")
+
+    def paint(self, number, style):
+        self.labels[number].config(bg=style.bg, fg=style.fg, font=style.font)
+
+
+BOARDS = {"canvas": CanvasBoard, "labels": LabelBoard}
+
+
+def make_board(parent, styles, background, cell_width, cell_height, outline=None):
+    """The board selected by TOMBOLA_BOARD: "canvas" (default) or "labels" """
+    kind = os.environ.get(BOARD_ENV, "canvas").lower()
+    if kind not in BOARDS:
+        raise ValueError(f"Unknown {BOARD_ENV} board: {kind}")
+    return BOARDS[kind](parent, styles, background, cell_width, cell_height, outline)
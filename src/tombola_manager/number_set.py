@@ -0,0 +1,108 @@
+MAX_NUMBER = 90
+ALL_BITS = (1 << MAX_NUMBER) - 1
+
+
+def number_bit(number):
+    """Bit of a tombola number (1-90) in a NumberSet"""
+    return 1 << (number - 1)
+
+
+def bits_of(numbers):
+    """Bits of an iterable of tombola numbers"""
+    if isinstance(numbers, NumberSet):
+        return numbers.bits
+    bits = 0
+    for number in numbers:
+        if not 1 <= number <= MAX_NUMBER:
+            raise ValueError(f"Number out of range: {number}")
+        bits |= 1 << (number - 1)
+    return bits
+
+
+class NumberSet:
+    """Set of tombola numbers (1-90) kept as the bits of a single integer.
+
+    Number ``n`` is bit ``n - 1``. Membership is a bit test, ``len`` is a
+    popcount, iteration yields the numbers in ascending order, and copies or
+    comparisons cost one integer operation, which keeps snapshots of the game
+    state cheap.
+    """
+    __slots__ = ("bits",)
+
+    def __init__(self, numbers=()):
+        self.bits = bits_of(numbers)
+
+    @classmethod
+    def from_bits(cls, bits):
+        """Build a set directly from its bits"""
+        number_set = cls.__new__(cls)
+        number_set.bits = bits & ALL_BITS
+        return number_set
+
+    def add(self, number):
+        if not 1 <= number <= MAX_NUMBER:
+            raise ValueError(f"Number out of range: {number}")
+        self.bits |= 1 << (number - 1)
+
+    def remove(self, number):
+        if number not in self:
+            raise KeyError(number)
+        self.bits &= ~(1 << (number - 1))
+
+    def discard(self, number):
+        if number in self:
+            self.bits &= ~(1 << (number - 1))
+
+    def update(self, numbers):
+        self.bits |= bits_of(numbers)
+
+    def clear(self):
+        self.bits = 0
+
+    def copy(self):
+        return NumberSet.from_bits(self.bits)
+
+    def complement(self):
+        """Numbers from 1 to 90 that are not in the set"""
+        return NumberSet.from_bits(~self.bits)
+
+    def __contains__(self, number):
+        return isinstance(number, int) and 1 <= number <= MAX_NUMBER \
+            and (self.bits >> (number - 1)) & 1 == 1
+
+    def __len__(self):
+        return self.bits.bit_count()
+
+    def __bool__(self):
+        return self.bits != 0
+
+    def __iter__(self):
+        bits = self.bits
+        while bits:
+            lowest = bits & -bits
+            yield lowest.bit_length()
+            bits ^= lowest
+
+    def __eq__(self, other):
+        if isinstance(other, NumberSet):
+            return self.bits == other.bits
+        if isinstance(other, (set, frozenset)):
+            return len(other) == len(self) and all(number in self for number in other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __or__(self, other):
+        return NumberSet.from_bits(self.bits | bits_of(other))
+
+    def __and__(self, other):
+        return NumberSet.from_bits(self.bits & bits_of(other))
+
+    def __sub__(self, other):
+        return NumberSet.from_bits(self.bits & ~bits_of(other))
+
+    def __xor__(self, other):
+        return NumberSet.from_bits(self.bits ^ bits_of(other))
+
+    def __repr__(self):
+        return f"NumberSet({list(self)})"
@@ -0,0 +1,147 @@
+import copy
+import threading
+import time
+from datetime import datetime
+
+from .diagnostics import Diagnostics
+
+
+class SaveStatus:
+    """Save progress of one game as seen by the writer thread"""
+
+    def __init__(self):
+        self.pending = 0
+        self.last_saved_at = None
+        self.last_error = None
+        self.error_count = 0
+
+
+class SaveWriter:
+    """Writes game saves on a background thread so the Tk loop never waits on disk.
+
+    ``submit`` only takes a snapshot of the game and queues it. The writer
+    keeps the latest snapshot per journal, so a burst of changes made while a
+    write is in progress (or within ``coalesce_delay``) ends up as one write.
+    """
+    _instance = None
+    coalesce_delay = 0.05
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._start()
+        return cls._instance
+
+    def _start(self):
+        self._cond = threading.Condition()
+        self._queued = {}
+        self._failed = {}
+        self._statuses = {}
+        self._released = set()  # Closed games whose status goes once their saves are written
+        self._batch = {}
+        self._writing = False
+        self._closing = False
+        self.diagnostics = Diagnostics()
+        self._thread = threading.Thread(target=self._run, name="SaveWriter", daemon=True)
+        self._thread.start()
+
+    def submit(self, journal, game):
+        """Queue the current state of the game for saving"""
+        snapshot = game.snapshot()
+        with self._cond:
+            self._failed.pop(journal, None)
+            self._released.discard(journal)
+            self._queued[journal] = snapshot
+            self._status(journal).pending += 1
+            self._cond.notify_all()
+
+    def status(self, journal):
+        """Get a copy of the SaveStatus of the game saved through the given journal"""
+        with self._cond:
+            return copy.copy(self._statuses.get(journal) or SaveStatus())
+
+    def release(self, journal):
+        """Forget the status of a closed game, now or once its queued or failed save is written"""
+        with self._cond:
+            self._released.add(journal)
+            self._prune(journal)
+
+    def flush(self, timeout=None):
+        """Retry failed saves and wait until every queued snapshot has been written"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            self._queued.update(self._failed)
+            self._failed = {}
+            self._cond.notify_all()
+            while self._queued or self._writing:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def close(self, timeout=None):
+        """Flush the queue and stop the writer thread"""
+        self.flush(timeout)
+        with self._cond:
+            self._closing = True
+            self._cond.notify_all()
+        self._thread.join(timeout)
+        if SaveWriter._instance is self:
+            SaveWriter._instance = None
+
+    def _status(self, journal):
+        if journal not in self._statuses:
+            self._statuses[journal] = SaveStatus()
+        return self._statuses[journal]
+
+    def _prune(self, journal):
+        if (journal in self._released and journal not in self._queued and journal not in self._failed
+                and not (self._writing and journal in self._batch)):
+            self._statuses.pop(journal, None)
+            self._released.discard(journal)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._queued and not self._closing:
+                    self._cond.wait()
+                if not self._queued:
+                    return
+            if not self._closing:
+                # Let the rest of a burst of changes pile up
+                time.sleep(self.coalesce_delay)
+
+            with self._cond:
+                batch = self._batch = self._queued
+                self._queued = {}
+                self._writing = True
+                pending = {journal: self._status(journal).pending for journal in batch}
+
+            results = {}
+            for journal, snapshot in batch.items():
+                try:
+                    with self.diagnostics.timer("save.write"):
+                        journal.record(snapshot)
+                    results[journal] = None
+                except Exception as e:
+                    results[journal] = e
+
+            with self._cond:
+                for journal, error in results.items():
+                    status = self._status(journal)
+                    if error is None:
+                        status.pending -= pending[journal]
+                        status.last_saved_at = datetime.now()
+                        status.last_error = None
+                    else:
+                        status.last_error = error
+                        status.error_count += 1
+                        if journal not in self._queued:
+                            # Kept until the next submit or flush retries it
+                            self._failed[journal] = batch[journal]
+                self._writing = False
+                self._batch = {}
+                for journal in batch:
+                    self._prune(journal)
+                self._cond.notify_all()
@@ -0,0 +1,382 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from .diagnostics import Diagnostics
+from .game_catalog import GameInfo
+from .game_history import GameHistory, common_length
+from .game_journal import GAMES_DIR, GameJournal
+from .game_log import LogEntry
+from .game_storage import GameStorage
+from .tombola_game import TombolaGame
+
+DATABASE_FILE = "tombola.db"
+SCHEMA_VERSION = 4
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    date TEXT NOT NULL,
+    state TEXT NOT NULL,
+    last_number INTEGER,
+    called INTEGER NOT NULL DEFAULT 0,
+    log_count INTEGER NOT NULL DEFAULT 0,
+    size INTEGER NOT NULL DEFAULT 0,  -- bytes of the game's rows, see GAME_SIZE
+    updated_at REAL NOT NULL,
+    history_base TEXT,
+    history_position INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS games_date ON games (date);
+CREATE INDEX IF NOT EXISTS games_updated_at ON games (updated_at);
+
+CREATE TABLE IF NOT EXISTS called_numbers (
+    game_id INTEGER NOT NULL REFERENCES games (id) ON DELETE CASCADE,
+    number INTEGER NOT NULL,
+    called_at REAL,
+    PRIMARY KEY (game_id, number)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS called_numbers_number ON called_numbers (number);
+
+-- args is a JSON array; for entries of old text logs code is NULL and args holds the text
+CREATE TABLE IF NOT EXISTS log_entries (
+    game_id INTEGER NOT NULL REFERENCES games (id) ON DELETE CASCADE,
+    seq INTEGER NOT NULL,
+    timestamp INTEGER,
+    code TEXT,
+    args TEXT NOT NULL,
+    PRIMARY KEY (game_id, seq)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS log_entries_code ON log_entries (code);
+
+-- move is a JSON array [op, value, before, after, timestamp]
+CREATE TABLE IF NOT EXISTS history_moves (
+    game_id INTEGER NOT NULL REFERENCES games (id) ON DELETE CASCADE,
+    idx INTEGER NOT NULL,
+    move TEXT NOT NULL,
+    PRIMARY KEY (game_id, idx)
+) WITHOUT ROWID;
+"""
+
+# Bytes counted for each integer or real value of a row in the size of a game
+VALUE_BYTES = 8
+
+# Size of a game in bytes: its log entries, history moves and called numbers as stored.
+# Text columns hold json.dumps output and translation keys, which are ASCII.
+GAME_SIZE = f"""
+(SELECT COALESCE(SUM({VALUE_BYTES} + LENGTH(CAST(COALESCE(code, '') AS BLOB)) + LENGTH(CAST(args AS BLOB))), 0)
+ FROM log_entries WHERE game_id = games.id)
++ (SELECT COALESCE(SUM(LENGTH(CAST(move AS BLOB))), 0) FROM history_moves WHERE game_id = games.id)
++ {2 * VALUE_BYTES} * called
+"""
+
+# Columns the load list may sort on
+SORT_COLUMNS = {"name": "name", "date": "date", "state": "state", "called": "called",
+                "size": "size", "mtime": "updated_at"}
+
+
+def _log_rows(entries):
+    """(timestamp, code, args as JSON) of log entries"""
+    return [(entry.timestamp, entry.code, json.dumps(entry.args, separators=(",", ":")))
+            for entry in entries]
+
+
+def _log_size(rows):
+    """Bytes that _log_rows rows add to the size of a game"""
+    return sum(VALUE_BYTES + len(code or "") + len(args) for _, code, args in rows)
+
+
+def _move_text(move):
+    return json.dumps(list(move))
+
+
+def _like_pattern(text):
+    """LIKE pattern matching text anywhere, with its wildcards taken literally (ESCAPE '\\')"""
+    text = text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{text}%"
+
+
+class SqliteStorage(GameStorage):
+    """Games in one SQLite database in WAL mode.
+
+    A single connection is shared by the Tk thread (load list, loading) and
+    the save writer thread, behind a lock. Every save is one transaction.
+    JSON saves found in ``migrate_from`` that are not in the database yet are
+    imported when the storage is opened; the JSON files are left in place.
+    """
+
+    def __init__(self, path=None, migrate_from=GAMES_DIR):
+        if path is None:
+            path = os.path.join(GAMES_DIR, DATABASE_FILE)
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.lock = threading.RLock()
+        self.connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute("PRAGMA foreign_keys=ON")
+        self._upgrade_log_entries()
+        self._upgrade_games()
+        self.connection.executescript(SCHEMA)
+        self._upgrade_sizes()
+        self.connection.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+        if migrate_from is not None:
+            self.migrate(migrate_from)
+
+    def journal(self, name):
+        return SqliteJournal(self, name)
+
+    def _upgrade_log_entries(self):
+        """Convert the text log_entries table of schema version 1 to structured entries"""
+        columns = [row[1] for row in self.connection.execute("PRAGMA table_info(log_entries)")]
+        if "entry" not in columns:
+            return
+        with self.transaction() as connection:
+            connection.execute("ALTER TABLE log_entries RENAME TO log_entries_v1")
+            connection.execute(SCHEMA[SCHEMA.index("CREATE TABLE IF NOT EXISTS log_entries"):
+                                      SCHEMA.index("CREATE INDEX IF NOT EXISTS log_entries_code")])
+            connection.executemany(
+                "INSERT INTO log_entries (game_id, seq, timestamp, code, args) VALUES (?, ?, NULL, NULL, ?)",
+                ((game_id, seq, json.dumps([entry])) for game_id, seq, entry in
+                 connection.execute("SELECT game_id, seq, entry FROM log_entries_v1").fetchall()))
+            connection.execute("DROP TABLE log_entries_v1")
+
+    def _upgrade_games(self):
+        """Add the history columns missing from games tables of schema version 2 and older"""
+        columns = [row[1] for row in self.connection.execute("PRAGMA table_info(games)")]
+        if not columns or "history_base" in columns:
+            return
+        with self.transaction() as connection:
+            connection.execute("ALTER TABLE games ADD COLUMN history_base TEXT")
+            connection.execute("ALTER TABLE games ADD COLUMN history_position INTEGER NOT NULL DEFAULT 0")
+
+    def _upgrade_sizes(self):
+        """Recount the size of every game, which schema version 3 and older counted in log characters"""
+        if self.connection.execute("PRAGMA user_version").fetchone()[0] >= 4:
+            return
+        with self.transaction() as connection:
+            connection.execute(f"UPDATE games SET size = {GAME_SIZE}")
+
+    def games(self, sort_key="date", reverse=False, text_filter=""):
+        order = SORT_COLUMNS.get(sort_key, "date")
+        direction = "DESC" if reverse else "ASC"
+        pattern = _like_pattern(text_filter.strip())
+        with self.lock:
+            rows = self.connection.execute(
+                f"SELECT name, date, state, called, size, updated_at FROM games "
+                f"WHERE name LIKE ? ESCAPE '\\' OR state LIKE ? ESCAPE '\\' ORDER BY {order} {direction}, name",
+                (pattern, pattern)).fetchall()
+        return [GameInfo(*row) for row in rows]
+
+    def get(self, name):
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT name, date, state, called, size, updated_at FROM games WHERE name = ?",
+                (name,)).fetchone()
+        return GameInfo(*row) if row else None
+
+    def __contains__(self, name):
+        with self.lock:
+            return self.connection.execute(
+                "SELECT 1 FROM games WHERE name = ?", (name,)).fetchone() is not None
+
+    def migrate(self, directory):
+        """Import the JSON saves of a directory that are not in the database yet"""
+        if not os.path.isdir(directory):
+            return 0
+        imported = 0
+        for file in sorted(os.listdir(directory)):
+            name, extension = os.path.splitext(file)
+            if extension != ".json" or file.startswith(".") or name in self:
+                continue
+            try:
+                game = GameJournal(name, directory).load()
+            except (OSError, ValueError, KeyError, TypeError):
+                continue
+            self.journal(name).record(game, called_at=None)
+            imported += 1
+        return imported
+
+    def transaction(self):
+        return _Transaction(self)
+
+
+class _Transaction:
+    """BEGIN IMMEDIATE ... COMMIT under the storage lock, ROLLBACK on error"""
+
+    def __init__(self, storage):
+        self.storage = storage
+
+    def __enter__(self):
+        self.storage.lock.acquire()
+        self.storage.connection.execute("BEGIN IMMEDIATE")
+        return self.storage.connection
+
+    def __exit__(self, exc_type, exc, traceback):
+        try:
+            if exc_type is None:
+                self.storage.connection.execute("COMMIT")
+            else:
+                self.storage.connection.execute("ROLLBACK")
+        finally:
+            self.storage.lock.release()
+
+
+class SqliteJournal:
+    """Loads and saves one game in a SqliteStorage (the SQLite counterpart of GameJournal)"""
+
+    def __init__(self, storage, name):
+        self.storage = storage
+        self.name = name
+        # What is in the database after the last record() / load(), None if unknown
+        self._persisted = None
+
+    def load(self, log_tail=None):
+        connection = self.storage.connection
+        with self.storage.lock:
+            row = connection.execute(
+                "SELECT id, date, state, last_number, history_base, history_position, log_count FROM games "
+                "WHERE name = ?", (self.name,)).fetchone()
+            if row is None:
+                raise FileNotFoundError(f"No saved game named {self.name}")
+            game_id, date, state, last_number, history_base, history_position, log_count = row
+            numbers = [number for (number,) in connection.execute(
+                "SELECT number FROM called_numbers WHERE game_id = ?", (game_id,))]
+            log_base = 0 if log_tail is None else max(0, log_count - log_tail)
+            log = self._log_entries(connection, game_id, log_base, log_count)
+            moves = [move for (move,) in connection.execute(
+                "SELECT move FROM history_moves WHERE game_id = ? ORDER BY idx", (game_id,))]
+
+        game = TombolaGame(self.name)
+        game.numbers = numbers
+        game.date = date
+        game.log = log
+        game.log_base = log_base
+        game.last_number = last_number
+        game.state = state
+        if history_base is not None:
+            game.history = GameHistory.from_json({"base": json.loads(history_base),
+                                                  "moves": [json.loads(move) for move in moves],
+                                                  "position": history_position})
+        history_reset = history_base is None or not game.history_matches_board()
+        if history_reset:
+            game.reset_history()
+        self._remember(game, history_reset)
+        return game
+
+    def load_log(self, start, end):
+        """Saved log entries number start to end (excluded)"""
+        with self.storage.lock:
+            return self._log_entries(self.storage.connection, self._game_id(self.storage.connection), start, end)
+
+    @staticmethod
+    def _log_entries(connection, game_id, start, end):
+        return [LogEntry(timestamp, code, json.loads(args)) for timestamp, code, args in connection.execute(
+            "SELECT timestamp, code, args FROM log_entries WHERE game_id = ? AND seq >= ? AND seq < ? "
+            "ORDER BY seq", (game_id, start, end))]
+
+    def record(self, game, called_at=0):
+        """Persist what changed since the last call in one transaction.
+
+        ``called_at`` is the call time stored for new numbers: 0 means now,
+        None leaves it unknown (used for migrated games).
+        """
+        if called_at == 0:
+            called_at = time.time()
+        try:
+            with self.storage.transaction() as connection:
+                changes = connection.total_changes
+                if self._persisted is None:
+                    self._rewrite(connection, game, called_at)
+                else:
+                    self._update(connection, game, called_at)
+                Diagnostics().count("save.rows_written", connection.total_changes - changes)
+        except Exception:
+            self._persisted = None
+            raise
+        self._remember(game)
+
+    def _rewrite(self, connection, game, called_at):
+        # Log entries that were not loaded (before game.log_base) are kept as they are
+        rows = _log_rows(game.log)
+        history = game.history.to_json()
+        connection.execute(
+            "INSERT INTO games (name, date, state, last_number, called, log_count, size, updated_at, "
+            "history_base, history_position) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (name) DO UPDATE SET date = excluded.date, state = excluded.state, "
+            "last_number = excluded.last_number, called = excluded.called, "
+            "log_count = excluded.log_count, size = excluded.size, updated_at = excluded.updated_at, "
+            "history_base = excluded.history_base, history_position = excluded.history_position",
+            (game.name, game.date, game.state, game.last_number, len(game.numbers),
+             game.log_base + len(game.log), 0, time.time(), json.dumps(history["base"]), history["position"]))
+        game_id = self._game_id(connection)
+        connection.execute("DELETE FROM called_numbers WHERE game_id = ?", (game_id,))
+        connection.execute("DELETE FROM log_entries WHERE game_id = ? AND seq >= ?", (game_id, game.log_base))
+        connection.execute("DELETE FROM history_moves WHERE game_id = ?", (game_id,))
+        connection.executemany(
+            "INSERT INTO called_numbers (game_id, number, called_at) VALUES (?, ?, ?)",
+            [(game_id, number, called_at) for number in game.numbers])
+        connection.executemany(
+            "INSERT INTO log_entries (game_id, seq, timestamp, code, args) VALUES (?, ?, ?, ?, ?)",
+            [(game_id, seq, *row) for seq, row in enumerate(rows, game.log_base)])
+        connection.executemany(
+            "INSERT INTO history_moves (game_id, idx, move) VALUES (?, ?, ?)",
+            [(game_id, idx, _move_text(move)) for idx, move in enumerate(history["moves"])])
+        connection.execute(f"UPDATE games SET size = {GAME_SIZE} WHERE id = ?", (game_id,))
+
+    def _update(self, connection, game, called_at):
+        persisted = self._persisted
+        game_id = self._game_id(connection)
+        removed = persisted["numbers"] - game.numbers
+        added = game.numbers - persisted["numbers"]
+        connection.executemany(
+            "DELETE FROM called_numbers WHERE game_id = ? AND number = ?",
+            [(game_id, number) for number in removed])
+        connection.executemany(
+            "INSERT INTO called_numbers (game_id, number, called_at) VALUES (?, ?, ?)",
+            [(game_id, number, called_at) for number in added])
+        rows = _log_rows(game.log[persisted["log_length"] - game.log_base:])
+        connection.executemany(
+            "INSERT INTO log_entries (game_id, seq, timestamp, code, args) VALUES (?, ?, ?, ?, ?)",
+            [(game_id, seq, *row) for seq, row in enumerate(rows, persisted["log_length"])])
+        history = game.history
+        if persisted["history_reset"]:
+            # The saved history did not match the board and was started again on load: replace it
+            connection.execute("DELETE FROM history_moves WHERE game_id = ?", (game_id,))
+            connection.execute("UPDATE games SET history_base = ? WHERE id = ?",
+                               (json.dumps(history.to_json()["base"]), game_id))
+        at = common_length(persisted["moves"], history.moves)
+        if at < len(persisted["moves"]):
+            connection.execute("DELETE FROM history_moves WHERE game_id = ? AND idx >= ?", (game_id, at))
+        moves = [_move_text(move) for move in history.moves[at:]]
+        connection.executemany(
+            "INSERT INTO history_moves (game_id, idx, move) VALUES (?, ?, ?)",
+            [(game_id, idx, move) for idx, move in enumerate(moves, at)])
+        # The size follows the rows written and deleted, like GAME_SIZE counts them
+        size = (_log_size(rows) + sum(map(len, moves))
+                - sum(len(_move_text(move)) for move in persisted["moves"][at:])
+                + 2 * VALUE_BYTES * (len(added) - len(removed)))
+        connection.execute(
+            "UPDATE games SET state = ?, last_number = ?, called = ?, log_count = ?, "
+            "size = size + ?, updated_at = ?, history_position = ? WHERE id = ?",
+            (game.state, game.last_number, len(game.numbers), game.log_base + len(game.log),
+             size, time.time(), history.position, game_id))
+        if persisted["history_reset"]:
+            # The moves deleted above are not in the size counted so far
+            connection.execute(f"UPDATE games SET size = {GAME_SIZE} WHERE id = ?", (game_id,))
+
+    def _game_id(self, connection):
+        return connection.execute("SELECT id FROM games WHERE name = ?", (self.name,)).fetchone()[0]
+
+    def _remember(self, game, history_reset=False):
+        self._persisted = {
+            "numbers": game.numbers.copy(),
+            "log_length": game.log_base + len(game.log),
+            "moves": list(game.history.moves),
+            # Whether the history in the database is not the one in memory
+            "history_reset": history_reset
+        }
@@ -1,39 +1,204 @@
+import copy
 from datetime import datetime
 from .language_manager import LanguageManager
+from .number_set import NumberSet, bits_of
+from .card_registry import CardRegistry, check_card, validate_card
+from .game_log import LogEntry, LogView
+from .game_events import (GameEvent, NUMBER_ADDED, NUMBER_REMOVED, STATE_CHANGED,
+                          LOG_APPENDED, CARDS_CHANGED)
+from .game_history import ADD, REMOVE, STATE, GameHistory
 
 
 class TombolaGame:
+    __slots__ = ("name", "_numbers", "date", "log", "last_number", "_state", "lang",
+                 "cards", "last_wins", "_listeners", "event_seq", "history", "log_base")
+
     def __init__(self, name):
+        self._listeners = []
+        self.event_seq = 0  # Number of events published so far
         self.name = name
-        self.numbers = set()
+        self.numbers = NumberSet()
         self.date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         self.log = []
+        self.log_base = 0  # Saved log entries before log[0] that were not loaded
         self.last_number = None
         self.state = "Ambo"
         self.lang = LanguageManager()
+        self.cards = CardRegistry()
+        self.last_wins = []  # Wins produced by the last add_number
+        self.history = GameHistory.start(self.numbers, None, self.state)
+    
+    @property
+    def numbers(self):
+        """Called numbers as a NumberSet"""
+        return self._numbers
+    
+    @numbers.setter
+    def numbers(self, numbers):
+        self._numbers = numbers.copy() if isinstance(numbers, NumberSet) else NumberSet(numbers)
+    
+    @property
+    def state(self):
+        return self._state
+    
+    @state.setter
+    def state(self, state):
+        self._state = state
+        self.publish(STATE_CHANGED, value=state)
+    
+    def subscribe(self, listener):
+        """Call listener(GameEvent) after every change to the game"""
+        self._listeners.append(listener)
+    
+    def unsubscribe(self, listener):
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+    
+    def publish(self, kind, numbers=(), value=None):
+        self.event_seq += 1
+        if self._listeners:
+            event = GameEvent(self.event_seq, kind, numbers, value)
+            for listener in list(self._listeners):
+                listener(event)
     
     def add_number(self, number):
         """Add a number to the game"""
         if 1 <= number <= 90 and number not in self.numbers:
+            self.history.record(ADD, number, self.last_number, number)
             self.numbers.add(number)
             self.last_number = number
+            self.last_wins = self.cards.mark(number)
+            self.publish(NUMBER_ADDED, (number,))
             return True
         return False
     
+    def add_numbers(self, numbers):
+        """Add several numbers in order as one change: all of them, or none if any is invalid or called"""
+        numbers = list(numbers)
+        if (not numbers or len(set(numbers)) != len(numbers)
+                or not all(1 <= number <= 90 and number not in self.numbers for number in numbers)):
+            return False
+        wins = []
+        for number in numbers:
+            self.history.record(ADD, number, self.last_number, number)
+            self.numbers.add(number)
+            self.last_number = number
+            wins.extend(self.cards.mark(number))
+        self.last_wins = wins
+        self.publish(NUMBER_ADDED, tuple(numbers))
+        return True
+    
     def remove_number(self, number):
         """Remove a number from the game"""
         if number in self.numbers:
+            before = self.last_number
             self.numbers.remove(number)
+            self.cards.unmark(number)
+            self.last_wins = []
             if number == self.last_number:
-                self.last_number = None
+                # The last number becomes the one called before it, as it was then
+                self.last_number = self.history.latest_call(self.numbers)
+            self.history.record(REMOVE, number, before, self.last_number)
+            self.publish(NUMBER_REMOVED, (number,))
             return True
         return False
     
-    def log_action(self, message):
-        """Add an action to the log with timestamp"""
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        self.log.append(f"[{timestamp}] {message}")
+    def set_state(self, state):
+        """Move the game to another prize state; False if it is already there"""
+        if state == self.state:
+            return False
+        self.history.record(STATE, state, self.state, state)
+        self.state = state
+        return True
+    
+    def step_back(self):
+        """Undo the last move in effect (call, removal or state change); returns it, or None"""
+        move = self.history.step_back()
+        if move is not None:
+            self._replay(move, move.op == REMOVE, move.before)
+        return move
+    
+    def step_forward(self):
+        """Redo the move after the last one in effect; returns it, or None"""
+        move = self.history.step_forward()
+        if move is not None:
+            self._replay(move, move.op == ADD, move.after)
+        return move
+    
+    def _replay(self, move, adding, result):
+        """Bring a move's number on or off the board, leaving result as last number or state"""
+        self.last_wins = []
+        if move.op == STATE:
+            self.state = result
+        elif adding:
+            self.numbers.add(move.value)
+            self.cards.mark(move.value)
+            self.last_number = result
+            self.publish(NUMBER_ADDED, (move.value,))
+        else:
+            self.numbers.remove(move.value)
+            self.cards.unmark(move.value)
+            self.last_number = result
+            self.publish(NUMBER_REMOVED, (move.value,))
+    
+    def reset_history(self):
+        """Start the history from the current board"""
+        self.history = GameHistory.start(self.numbers, self.last_number, self.state)
+    
+    def history_matches_board(self):
+        """Whether replaying the history up to its position gives the current board"""
+        board = self.history.board_at(self.history.position)
+        return (board.bits == self.numbers.bits and board.last_number == self.last_number
+                and board.state == self.state)
+    
+    def set_cards(self, cards):
+        """Attach a CardRegistry and count the numbers already called"""
+        cards.sync(self.numbers)
+        self.cards = cards
+        self.last_wins = []
+        self.publish(CARDS_CHANGED)
+    
+    def check_cards(self, claims):
+        """Check claimed cards against the called numbers; returns a CardCheck per claim, in order.
+
+        A claim is the serial of a loaded card or a card typed in as 3 rows of
+        5 numbers. Raises ValueError for an unknown serial or a bad card.
+        """
+        called = self.numbers.bits
+        checks = []
+        for claim in claims:
+            if isinstance(claim, int):
+                try:
+                    row_bits = self.cards.row_bits(claim)
+                except KeyError:
+                    raise ValueError(f"Unknown card serial: {claim}") from None
+                checks.append(check_card(row_bits, called, claim))
+            else:
+                checks.append(check_card([bits_of(row) for row in validate_card(claim)], called))
+        return checks
+    
+    def snapshot(self):
+        """Get a copy of the game that later changes to this one do not affect"""
+        snapshot = copy.copy(self)
+        snapshot._listeners = []
+        snapshot.numbers = self.numbers.copy()
+        # The log only grows at its end: a view of its current length is enough
+        snapshot.log = LogView(self.log)
+        snapshot.history = self.history.copy()
+        return snapshot
+    
+    def log_action(self, code, *args):
+        """Add an action to the log with timestamp; code is its translation key"""
+        entry = LogEntry.now(code, *args)
+        self.log.append(entry)
+        self.publish(LOG_APPENDED, value=entry)
         
+    def restore_log(self, entries):
+        """Put back saved log entries that come right before the ones in log"""
+        # A new list, so the views held by queued snapshots keep their entries
+        self.log = list(entries) + self.log
+        self.log_base -= len(entries)
+    
     def get_state_text(self):
         """Get the current state text"""
         return self.lang.get_text(self.state.lower())
\ No newline at end of file
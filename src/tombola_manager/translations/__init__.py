@@ -0,0 +1,17 @@
+"""Texts of the user interface, one module per language, imported on first use"""
+from functools import lru_cache
+
+LANGUAGES = ("en", "it")
+
+
+@lru_cache(maxsize=None)
+def texts(language):
+    """Translation table of a language; KeyError for an unknown one"""
+    # Plain imports rather than importlib, so PyInstaller still finds and bundles every language
+    if language == "en":
+        from .en import TEXTS
+    elif language == "it":
+        from .it import TEXTS
+    else:
+        raise KeyError(language)
+    return TEXTS
@@ -0,0 +1,129 @@
+TEXTS = {
+    # Main Window
+    'app_title': 'Tombola Manager',
+    'new_game': 'New Game',
+    'game_name': 'Game Name:',
+    'start_new_game': 'Start New Game',
+    'load_game': 'Load Game',
+    'load_selected_game': 'Load Selected Game',
+    'error': 'Error',
+    'warning': 'Warning',
+    'enter_game_name': 'Please enter a game name!',
+    'game_exists': 'A game with this name already exists!',
+    'select_game': 'Please select a game to load!',
+    'error_loading': 'Error loading game: {}',
+    'filter_games': 'Filter:',
+    'column_name': 'Name',
+    'column_date': 'Date',
+    'column_state': 'State',
+    'column_called': 'Called',
+    'column_size': 'Size',
+
+    # View Window
+    'view_title': 'Tombola View - {}',
+
+    # Control Window
+    'control_title': 'Tombola Control - {}',
+    'controls': 'Controls',
+    'select_state': 'Select State:',
+    'enter_number': 'Enter number (or several, e.g. 5 17 40-44):',
+    'add_number': 'Add Number',
+    'remove_number': 'Remove Number',
+    'save_game': 'Save Game',
+    'status_table': 'Status Table',
+    'grid_view': 'Grid View',
+    'list_view': 'List View',
+    'called_numbers': 'Called Numbers',
+    'remaining_numbers': 'Remaining Numbers',
+    'statistics': 'Statistics',
+    'total_numbers': 'Total Numbers Called:',
+    'numbers_remaining': 'Numbers Remaining:',
+    'completion': 'Completion Percentage:',
+    'action_log': 'Action Log',
+    'show_older_log': 'Show older entries ({} hidden)',
+    'number_exists': 'Number already exists!',
+    'enter_valid_batch': 'Please enter numbers separated by spaces, e.g. 5 17 40-44!',
+    'batch_invalid': 'Numbers must be between 1 and 90, none added: {}',
+    'batch_numbers_exist': 'Already called or repeated, none added: {}',
+    'invalid_number': 'Number must be between 1 and 90!',
+    'enter_valid': 'Please enter a valid number!',
+    'number_not_found': 'Number not found!',
+    'load_cards': 'Load Cards...',
+    'check_claims': 'Check Claims...',
+    'claims_title': 'Check Claims',
+    'claims_input': 'Card serials, or a card typed as 15 numbers per line:',
+    'claims_check': 'Check',
+    'claims_card': 'Card',
+    'claims_typed': 'Typed {}',
+    'claims_row': 'Row {}',
+    'claims_hits': 'Hits',
+    'claims_prize': 'Prize',
+    'claims_missing': 'Missing',
+    'claims_valid': 'Valid',
+    'claims_yes': 'Yes',
+    'claims_no': 'No',
+    'claims_summary': '{} claims, {} valid for {}',
+    'enter_valid_claims': 'Invalid claim: {}',
+    'claims_unknown_serials': 'No loaded card has these serials: {}',
+    'claims_checked': 'Checked {} claims: {} valid',
+    'open_view': 'Open another view',
+    'broadcast_on': 'Live board: {}',
+    'broadcast_failed': 'Live board not started: {}',
+    'diagnostics': 'Diagnostics',
+    'diagnostics_title': 'Tombola Diagnostics',
+    'diagnostics_stage': 'Stage',
+    'diagnostics_count': 'Count',
+    'diagnostics_mean': 'Mean ms',
+    'diagnostics_p50': 'p50 ms',
+    'diagnostics_p95': 'p95 ms',
+    'diagnostics_p99': 'p99 ms',
+    'diagnostics_max': 'Max ms',
+    'diagnostics_counter': 'Counter',
+    'diagnostics_value': 'Value',
+    'diagnostics_export': 'Export JSON...',
+    'diagnostics_reset': 'Reset',
+    'diagnostics_export_failed': 'Export failed: {}',
+    'json_files': 'JSON files',
+    'card_files': 'Card files',
+    'error_loading_cards': 'Error loading cards: {}',
+    'save_status_never': 'Not saved yet',
+    'save_status_pending': 'Saving... ({} pending)',
+    'save_status_saved': 'Saved at {}',
+    'save_failed': 'Save failed: {}',
+    'save_failed_close': 'Save failed: {}\nClose anyway and lose the unsaved changes?',
+
+    # Game States
+    'ambo': 'Ambo',
+    'terno': 'Terno',
+    'quaterna': 'Quaterna',
+    'cinquina': 'Cinquina',
+    'tombola': 'Tombola',
+    'superbingo': 'SUPERBINGO',
+
+    # Log messages
+    'game_created': 'Game created',
+    'game_loaded': 'Game loaded',
+    'failed_add': 'Failed to add number {} (already exists)',
+    'failed_add_invalid': 'Failed to add invalid number {} (out of range)',
+    'failed_add_input': 'Failed to add invalid input',
+    'failed_add_batch': 'Failed to add numbers {} (none added)',
+    'failed_add_batch_input': 'Failed to add invalid list of numbers',
+    'added_numbers': 'Added {} numbers: {}',
+    'failed_remove': 'Failed to remove number {} (not found)',
+    'failed_remove_input': 'Failed to remove invalid input',
+    'state_changed': 'State changed to {}',
+    'added_number': 'Added number: {}',
+    'removed_number': 'Removed number: {}',
+    'undid_add': 'Stepped back: call of {} undone',
+    'undid_remove': 'Stepped back: {} is on the board again',
+    'undid_state': 'Stepped back: state {} undone',
+    'redid_add': 'Stepped forward: {} called again',
+    'redid_remove': 'Stepped forward: {} removed again',
+    'redid_state': 'Stepped forward: state changed to {}',
+    'step_back': '< Step back',
+    'step_forward': 'Step forward >',
+    'history_position': 'Move {} of {}',
+    'card_win': 'Card {} row {}: {}!',
+    'card_tombola': 'Card {}: {}!',
+    'cards_loaded': 'Loaded {} cards from {}',
+}
@@ -0,0 +1,129 @@
+TEXTS = {
+    # Main Window
+    'app_title': 'Gestore Tombola',
+    'new_game': 'Nuova Partita',
+    'game_name': 'Nome Partita:',
+    'start_new_game': 'Inizia Nuova Partita',
+    'load_game': 'Carica Partita',
+    'load_selected_game': 'Carica Partita Selezionata',
+    'error': 'Errore',
+    'warning': 'Attenzione',
+    'enter_game_name': 'Inserire il nome della partita!',
+    'game_exists': 'Esiste già una partita con questo nome!',
+    'select_game': 'Selezionare una partita da caricare!',
+    'error_loading': 'Errore nel caricamento della partita: {}',
+    'filter_games': 'Filtro:',
+    'column_name': 'Nome',
+    'column_date': 'Data',
+    'column_state': 'Stato',
+    'column_called': 'Chiamati',
+    'column_size': 'Dimensione',
+
+    # View Window
+    'view_title': 'Visualizzazione Tombola - {}',
+
+    # Control Window
+    'control_title': 'Controllo Tombola - {}',
+    'controls': 'Controlli',
+    'select_state': 'Seleziona Stato:',
+    'enter_number': 'Inserisci numero (o più, es. 5 17 40-44):',
+    'add_number': 'Aggiungi Numero',
+    'remove_number': 'Rimuovi Numero',
+    'save_game': 'Salva Partita',
+    'status_table': 'Tabella Stato',
+    'grid_view': 'Vista Griglia',
+    'list_view': 'Vista Lista',
+    'called_numbers': 'Numeri Chiamati',
+    'remaining_numbers': 'Numeri Rimanenti',
+    'statistics': 'Statistiche',
+    'total_numbers': 'Numeri Chiamati Totali:',
+    'numbers_remaining': 'Numeri Rimanenti:',
+    'completion': 'Percentuale Completamento:',
+    'action_log': 'Registro Azioni',
+    'show_older_log': 'Mostra voci precedenti ({} nascoste)',
+    'number_exists': 'Il numero esiste già!',
+    'enter_valid_batch': 'Inserisci numeri separati da spazi, es. 5 17 40-44!',
+    'batch_invalid': 'I numeri devono essere tra 1 e 90, nessuno aggiunto: {}',
+    'batch_numbers_exist': 'Già estratti o ripetuti, nessuno aggiunto: {}',
+    'invalid_number': 'Il numero deve essere tra 1 e 90!',
+    'enter_valid': 'Inserire un numero valido!',
+    'number_not_found': 'Numero non trovato!',
+    'load_cards': 'Carica Cartelle...',
+    'check_claims': 'Verifica Vincite...',
+    'claims_title': 'Verifica Vincite',
+    'claims_input': 'Numeri di serie, o una cartella di 15 numeri per riga:',
+    'claims_check': 'Verifica',
+    'claims_card': 'Cartella',
+    'claims_typed': 'Inserita {}',
+    'claims_row': 'Riga {}',
+    'claims_hits': 'Usciti',
+    'claims_prize': 'Premio',
+    'claims_missing': 'Mancanti',
+    'claims_valid': 'Valida',
+    'claims_yes': 'Sì',
+    'claims_no': 'No',
+    'claims_summary': '{} richieste, {} valide per {}',
+    'enter_valid_claims': 'Richiesta non valida: {}',
+    'claims_unknown_serials': 'Nessuna cartella caricata ha questi numeri di serie: {}',
+    'claims_checked': 'Verificate {} richieste: {} valide',
+    'open_view': 'Apri un altro schermo',
+    'broadcast_on': 'Tabellone online: {}',
+    'broadcast_failed': 'Tabellone online non avviato: {}',
+    'diagnostics': 'Diagnostica',
+    'diagnostics_title': 'Diagnostica Tombola',
+    'diagnostics_stage': 'Fase',
+    'diagnostics_count': 'Conteggio',
+    'diagnostics_mean': 'Media ms',
+    'diagnostics_p50': 'p50 ms',
+    'diagnostics_p95': 'p95 ms',
+    'diagnostics_p99': 'p99 ms',
+    'diagnostics_max': 'Max ms',
+    'diagnostics_counter': 'Contatore',
+    'diagnostics_value': 'Valore',
+    'diagnostics_export': 'Esporta JSON...',
+    'diagnostics_reset': 'Azzera',
+    'diagnostics_export_failed': 'Esportazione non riuscita: {}',
+    'json_files': 'File JSON',
+    'card_files': 'File di cartelle',
+    'error_loading_cards': 'Errore nel caricamento delle cartelle: {}',
+    'save_status_never': 'Non ancora salvata',
+    'save_status_pending': 'Salvataggio in corso... ({} in attesa)',
+    'save_status_saved': 'Salvata alle {}',
+    'save_failed': 'Salvataggio non riuscito: {}',
+    'save_failed_close': 'Salvataggio non riuscito: {}\nChiudere comunque e perdere le modifiche non salvate?',
+
+    # Game States
+    'ambo': 'Ambo',
+    'terno': 'Terno',
+    'quaterna': 'Quaterna',
+    'cinquina': 'Cinquina',
+    'tombola': 'Tombola',
+    'superbingo': 'SUPERBINGO',
+
+    # Log messages
+    'game_created': 'Partita creata',
+    'game_loaded': 'Partita caricata',
+    'failed_add': 'Impossibile aggiungere il numero {} (già esistente)',
+    'failed_add_invalid': 'Impossibile aggiungere il numero {} non valido (fuori intervallo)',
+    'failed_add_input': 'Impossibile aggiungere input non valido',
+    'failed_add_batch': 'Impossibile aggiungere i numeri {} (nessuno aggiunto)',
+    'failed_add_batch_input': 'Impossibile aggiungere un elenco di numeri non valido',
+    'added_numbers': 'Aggiunti {} numeri: {}',
+    'failed_remove': 'Impossibile rimuovere il numero {} (non trovato)',
+    'failed_remove_input': 'Impossibile rimuovere input non valido',
+    'state_changed': 'Stato cambiato in {}',
+    'added_number': 'Aggiunto numero: {}',
+    'removed_number': 'Rimosso numero: {}',
+    'undid_add': 'Passo indietro: chiamata del {} annullata',
+    'undid_remove': 'Passo indietro: il {} è di nuovo sul tabellone',
+    'undid_state': 'Passo indietro: stato {} annullato',
+    'redid_add': 'Passo avanti: {} chiamato di nuovo',
+    'redid_remove': 'Passo avanti: {} rimosso di nuovo',
+    'redid_state': 'Passo avanti: stato cambiato in {}',
+    'step_back': '< Indietro',
+    'step_forward': 'Avanti >',
+    'history_position': 'Mossa {} di {}',
+    'card_win': 'Cartella {} riga {}: {}!',
+    'card_tombola': 'Cartella {}: {}!',
+    'cards_loaded': 'Caricate {} cartelle da {}',
+}
@@ -1,6 +1,37 @@
+import logging
 import os
 import sys
 
+# Port of the live board server of each control window; not served if unset
+BROADCAST_PORT_ENV = "TOMBOLA_BROADCAST_PORT"
+# Log entries kept in the log widget of a control window
+LOG_WINDOW_ENV = "TOMBOLA_LOG_WINDOW"
+DEFAULT_LOG_WINDOW = 500
+
+
+def log_window():
+    """TOMBOLA_LOG_WINDOW as a number of log entries, at least 1; the default if unset or not a number"""
+    try:
+        return max(1, int(os.environ.get(LOG_WINDOW_ENV, DEFAULT_LOG_WINDOW)))
+    except ValueError:
+        return DEFAULT_LOG_WINDOW
+
+
+def broadcast_port():
+    """TOMBOLA_BROADCAST_PORT as a port number; None if unset, or not a port (with a warning)"""
+    value = os.environ.get(BROADCAST_PORT_ENV)
+    if not value:
+        return None
+    try:
+        port = int(value)
+    except ValueError:
+        port = -1
+    if not 0 <= port <= 65535:
+        logging.getLogger(__name__).warning("Ignoring %s=%r: not a port number", BROADCAST_PORT_ENV, value)
+        return None
+    return port
+
+
 def resource_path(relative_path):
     """ Get absolute path to resource, works for dev and for PyInstaller """
     try:
@@ -1,11 +1,17 @@
 import tkinter as tk
-from tkinter import ttk
+from tkinter import ttk, font as tkfont
 
 from src.tombola_manager.utils import resource_path
 from src.tombola_manager.language_manager import LanguageManager
+from src.tombola_manager.diagnostics import timed
+from src.tombola_manager.number_board import CellStyle, make_board
+from src.tombola_manager.game_events import IdleUpdater, NUMBER_EVENTS, STATE_CHANGED, event_kinds
 
 
 class ViewWindow:
+    # Milliseconds without <Configure> events before the fonts follow the window size
+    resize_delay = 100
+
     def __init__(self, game):
         # Configure styles for dark mode
         style = ttk.Style()
@@ -25,8 +31,13 @@ class ViewWindow:
         self.bg_color = "#2e2e2e"
         self.fg_color = "#ffffff"
         self.highlight_color = "#4e4e4e"
-        self.called_font = 20
-        self.uncalled_font = 18
+        
+        # Shared fonts: resizing the board reconfigures these four, not every label
+        self.font_size = None
+        self.called_font = tkfont.Font(self.window, family='TkDefaultFont', size=20, weight='bold')
+        self.last_font = tkfont.Font(self.window, family='TkDefaultFont', size=20, weight='bold')
+        self.uncalled_font = tkfont.Font(self.window, family='TkDefaultFont', size=18)
+        self.state_font = tkfont.Font(self.window, family='TkDefaultFont', size=14)
         
         self.window.configure(bg=self.bg_color)
         
@@ -38,93 +49,67 @@ class ViewWindow:
         # Configure grid to expand with window
         self.window.grid_rowconfigure(0, weight=1)
         self.window.grid_columnconfigure(0, weight=1)
-        main_frame.grid_rowconfigure(0, weight=1)
         main_frame.grid_columnconfigure(0, weight=1)
         
         # Add state display
-        self.state_display = tk.Text(main_frame, height=1, width=30, state='disabled', bg=self.bg_color, fg=self.fg_color, font=('TkDefaultFont', 14))
-        self.state_display.grid(row=0, column=0, columnspan=10, pady=5, sticky="ew")
+        self.state_display = tk.Text(main_frame, height=1, width=30, state='disabled', bg=self.bg_color, fg=self.fg_color, font=self.state_font)
+        self.state_display.grid(row=0, column=0, pady=5, sticky="ew")
         self.state_display.tag_configure("center", justify='center')
         self.update_state_display()
         
-        # Create grid of numbers with consistent spacing
-        self.number_labels = {}
-        for i in range(1, 91):
-            row = (i-1) // 10 + 1  # Adjust row index to account for state display
-            col = (i-1) % 10
-            
-            # Create a frame for each number to ensure consistent sizing
-            frame = ttk.Frame(main_frame, width=50, height=50)
-            frame.grid(row=row, column=col, padx=2, pady=2, sticky="nsew")
-            frame.grid_propagate(False)  # Force the frame to stay at specified size
-            frame.configure(style="Dark.TFrame")
-            
-            label = tk.Label(frame, text=str(i), width=2,
-                           font=('TkDefaultFont', 10), bg=self.bg_color, fg=self.fg_color)
-            label.place(relx=0.5, rely=0.5, anchor="center")  # Center in frame
-            self.number_labels[i] = label
-        
-        # Configure grid to expand with window
-        for i in range(1, 10):
-            main_frame.grid_rowconfigure(i, weight=1)
-            main_frame.grid_columnconfigure(i, weight=1)
-        
+        # Board of the 90 numbers, scaled with the window
+        self.board = make_board(main_frame, {
+            "uncalled": CellStyle(self.bg_color, "#4e4e4e", self.uncalled_font),
+            "called": CellStyle(self.highlight_color, "#ffffff", self.called_font),
+            "last": CellStyle("green", "white", self.last_font),
+        }, self.bg_color, cell_width=54, cell_height=54)
+        self.board.widget.grid(row=1, column=0, sticky="nsew")
+        main_frame.grid_rowconfigure(1, weight=1)
         self.update_display()
         
-        # Bind the configure event to adjust font size only once
-        self.window.bind('<Configure>', self.adjust_font_size_once)
-        self.font_adjusted = False
+        # Follow every size change (e.g. the view moved to a projector), once it settles
+        self._resize_job = None
+        self.window.bind('<Configure>', self.schedule_font_resize)
+        
+        # Redraw from the game's events, once per idle cycle however many there were
+        self.updates = IdleUpdater(game, self.window, self.redraw)
+        self.window.bind('<Destroy>', self.on_destroy)
     
-    def adjust_font_size_once(self, event):
-        if not self.font_adjusted:
-            self.adjust_font_size(event)
-            self.font_adjusted = True
+    def redraw(self, events):
+        kinds = event_kinds(events)
+        if not kinds.isdisjoint(NUMBER_EVENTS):
+            self.update_display()
+        if STATE_CHANGED in kinds:
+            self.update_state_display()
     
-    def adjust_font_size(self, event):
+    def on_destroy(self, event):
+        if event.widget is self.window:
+            self.updates.close()
+    
+    def schedule_font_resize(self, event):
+        # The binding also sees the events of every child widget
+        if event.widget is not self.window:
+            return
+        if self._resize_job is not None:
+            self.window.after_cancel(self._resize_job)
+        self._resize_job = self.window.after(self.resize_delay, self.adjust_font_size)
+    
+    def adjust_font_size(self):
+        self._resize_job = None
         # Calculate font size based on window size
-        new_font_size = max(10, int(event.width / 40))
-        self.called_font = new_font_size
-        self.uncalled_font = new_font_size - 2
-        
-        for num in range(1, 91):
-            label = self.number_labels[num]
-            if num == self.game.last_number:
-                label.config(font=('TkDefaultFont', self.called_font, 'bold'))
-            elif num in self.game.numbers:
-                label.config(font=('TkDefaultFont', self.called_font, 'bold'))
-            else:
-                label.config(font=('TkDefaultFont', self.uncalled_font))
-        
-        self.state_display.config(font=('TkDefaultFont', new_font_size))
+        new_font_size = max(10, int(self.window.winfo_width() / 40))
+        if new_font_size == self.font_size:
+            return
+        self.font_size = new_font_size
+        self.called_font.configure(size=new_font_size)
+        self.last_font.configure(size=new_font_size)
+        self.uncalled_font.configure(size=new_font_size - 2)
+        self.state_font.configure(size=new_font_size)
     
+    @timed("view.update_display")
     def update_display(self):
-        called_font = ('TkDefaultFont', self.called_font, 'bold')  # Bold font for called numbers
-        uncalled_font = ('TkDefaultFont', self.uncalled_font)  # Normal font for uncalled numbers
-        
-        for num in range(1, 91):
-            label = self.number_labels[num]
-            
-            if num == self.game.last_number:
-                # Last called number - green background, bold
-                label.config(
-                    bg="green",
-                    fg="white",
-                    font=called_font
-                )
-            elif num in self.game.numbers:
-                # Called numbers - bold, black on white
-                label.config(
-                    bg=self.highlight_color,
-                    fg="#ffffff",
-                    font=called_font
-                )
-            else:
-                # Uncalled numbers - light gray, normal font
-                label.config(
-                    bg=self.bg_color,
-                    fg="#4e4e4e",
-                    font=uncalled_font
-                )
+        # The board only repaints the cells whose called/last state changed
+        self.board.update(self.game.numbers, self.game.last_number)
     
     def update_state_display(self):
         self.state_display.config(state='normal')
@@ -0,0 +1,48 @@
+import pytest
+
+from src.tombola_manager.save_writer import SaveWriter
+
+
+@pytest.fixture
+def games_dir(tmp_path):
+    """An empty games directory under tmp_path, as a string like the app passes around"""
+    return str(tmp_path / "games")
+
+
+@pytest.fixture(scope="session", autouse=True)
+def stop_save_writer():
+    yield
+    SaveWriter().close()
+
+
+def call(game, journal, number):
+    """Call a number, log it and save"""
+    game.add_number(number)
+    game.log_action('added_number', number)
+    journal.record(game)
+
+
+def assert_same_game(loaded, game):
+    """Board, state, history and log of a reloaded game are those of the game saved"""
+    assert list(loaded.numbers) == list(game.numbers)
+    assert loaded.last_number == game.last_number
+    assert loaded.state == game.state
+    assert [list(move) for move in loaded.history.moves] == [list(move) for move in game.history.moves]
+    assert loaded.history.position == game.history.position
+    assert loaded.log == game.log
+
+
+def play_game(game, journal):
+    """Calls, a removal of the last number, a state change and a step back, saved move by move"""
+    for number in (12, 40, 3, 77):
+        call(game, journal, number)
+    game.remove_number(77)
+    game.log_action('removed_number', 77)
+    journal.record(game)
+    game.set_state("Terno")
+    journal.record(game)
+    call(game, journal, 61)
+    game.remove_number(40)
+    journal.record(game)
+    game.step_back()
+    journal.record(game)
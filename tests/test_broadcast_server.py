@@ -0,0 +1,84 @@
+import json
+import socket
+import time
+
+import pytest
+
+from src.tombola_manager.broadcast_server import BroadcastServer
+from src.tombola_manager.tombola_game import TombolaGame
+
+
+@pytest.fixture
+def server():
+    game = TombolaGame("test")
+    server = BroadcastServer(game, "127.0.0.1", 0, history_size=3)
+    server.start()
+    yield server
+    server.stop()
+
+
+def _call(server, *numbers):
+    for number in numbers:
+        server.game.add_number(number)
+    deadline = time.monotonic() + 5
+    while server._seq != server.game.event_seq:
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+def _events(server, last_event_id=None):
+    """(event, data) pairs sent right after connecting to /events"""
+    request = "GET /events HTTP/1.1\r\nHost: test\r\n"
+    if last_event_id is not None:
+        request += f"Last-Event-ID: {last_event_id}\r\n"
+    with socket.create_connection(("127.0.0.1", server.port), timeout=5) as client:
+        client.sendall((request + "\r\n").encode())
+        client.settimeout(0.3)
+        received = b""
+        try:
+            while chunk := client.recv(65536):
+                received += chunk
+        except socket.timeout:
+            pass
+    _, _, body = received.decode().partition("\r\n\r\n")
+    events = []
+    for block in filter(None, body.split("\n\n")):
+        fields = dict(line.split(": ", 1) for line in block.split("\n"))
+        events.append((fields["event"], json.loads(fields["data"])))
+    return events
+
+
+def test_new_client_gets_a_snapshot(server):
+    _call(server, 5, 10)
+    [(event, data)] = _events(server)
+    assert event == "snapshot"
+    assert data["numbers"] == [5, 10]
+
+
+def test_reconnecting_client_gets_only_missed_deltas(server):
+    _call(server, 5)
+    seen = server.game.event_seq
+    _call(server, 10, 20)
+    events = _events(server, server._event_id(seen))
+    assert [(event, data["numbers"]) for event, data in events] == [("delta", [10]), ("delta", [20])]
+    assert events[-1][1]["last"] == 20
+
+
+def test_reconnecting_client_is_up_to_date(server):
+    _call(server, 5)
+    assert _events(server, server._event_id(server.game.event_seq)) == []
+
+
+@pytest.mark.parametrize("last_event_id", ["older-run.1", "garbage"])
+def test_client_of_another_run_gets_a_snapshot(server, last_event_id):
+    _call(server, 5)
+    assert [event for event, _ in _events(server, last_event_id)] == ["snapshot"]
+
+
+def test_client_behind_the_history_gets_a_snapshot(server):
+    _call(server, 5)
+    seen = server.game.event_seq
+    _call(server, 10, 20, 30, 40)
+    [(event, data)] = _events(server, server._event_id(seen))
+    assert event == "snapshot"
+    assert data["numbers"] == [5, 10, 20, 30, 40]
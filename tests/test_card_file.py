@@ -0,0 +1,38 @@
+import pytest
+
+from src.tombola_manager.card_file import CardFileWriter, read_card_bytes, read_cards
+from src.tombola_manager.card_registry import CardRegistry
+
+CARD = [[1, 12, 23, 34, 45], [2, 13, 24, 35, 46], [3, 14, 25, 36, 47]]
+
+
+def _write(path, cards):
+    with CardFileWriter(str(path)) as writer:
+        for rows in cards:
+            writer.write_card(rows)
+
+
+def test_round_trip(tmp_path):
+    path = tmp_path / "set.cards"
+    _write(path, [CARD, CARD[::-1]])
+    assert [list(map(list, rows)) for rows in read_cards(str(path))] == [CARD, CARD[::-1]]
+    assert len(read_card_bytes(str(path))) == 30
+
+
+@pytest.mark.parametrize("keep", [0, 5, 10 + 7])
+def test_empty_or_cut_off_file_is_a_value_error(tmp_path, keep):
+    path = tmp_path / "set.cards"
+    _write(path, [CARD, CARD])
+    with open(path, "rb+") as f:
+        f.truncate(keep)
+    with pytest.raises(ValueError):
+        CardRegistry.load(str(path))
+    with pytest.raises(ValueError):
+        read_card_bytes(str(path))
+
+
+def test_not_a_card_file(tmp_path):
+    path = tmp_path / "set.cards"
+    path.write_bytes(b"hello, world")
+    with pytest.raises(ValueError):
+        list(read_cards(str(path)))
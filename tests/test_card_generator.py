@@ -0,0 +1,40 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.tombola_manager.card_generator import CARDS_PER_SERIES, generate_series, iter_series_chunks
+from src.tombola_manager.card_registry import validate_card
+
+
+def _column(number):
+    return min(number // 10, 8)
+
+
+def test_series_are_valid():
+    cards = generate_series(200, seed=7)
+    assert cards.shape == (200 * CARDS_PER_SERIES, 15)
+    for series in cards.reshape(200, CARDS_PER_SERIES, 15):
+        # Every number 1-90 exactly once per series
+        assert sorted(series.ravel().tolist()) == list(range(1, 91))
+        for card in series:
+            rows = card.reshape(3, 5).tolist()
+            validate_card(rows)
+            columns = {}
+            for row in rows:
+                assert row == sorted(row)
+                assert len({_column(number) for number in row}) == 5
+                for number in row:
+                    columns.setdefault(_column(number), []).append(number)
+            # Every column of a card has 1-3 numbers, sorted top to bottom
+            assert len(columns) == 9
+            for numbers in columns.values():
+                assert 1 <= len(numbers) <= 3
+                assert numbers == sorted(numbers)
+
+
+def test_same_seed_same_series_for_any_worker_count():
+    single = np.concatenate(list(iter_series_chunks(50, seed=42, workers=1, chunk_series=10)))
+    pooled = np.concatenate(list(iter_series_chunks(50, seed=42, workers=3, chunk_series=10)))
+    assert np.array_equal(single, pooled)
+    other = np.concatenate(list(iter_series_chunks(50, seed=43, workers=1, chunk_series=10)))
+    assert not np.array_equal(single, other)
@@ -0,0 +1,73 @@
+from src.tombola_manager.card_registry import CardRegistry, Win, check_card
+from src.tombola_manager.number_set import bits_of
+from src.tombola_manager.tombola_game import TombolaGame
+
+CARD_A = [[1, 12, 23, 34, 45], [2, 13, 24, 35, 46], [3, 14, 25, 36, 47]]
+CARD_B = [[1, 12, 50, 61, 72], [4, 15, 51, 62, 73], [5, 16, 52, 63, 74]]
+
+
+def _registry():
+    registry = CardRegistry()
+    registry.add_card(CARD_A)
+    registry.add_card(CARD_B, serial=7)
+    return registry
+
+
+def test_each_prize_on_the_call_that_completes_it():
+    registry = _registry()
+    assert registry.mark(1) == []
+    assert registry.mark(12) == [Win(1, 0, "ambo"), Win(7, 0, "ambo")]
+    assert registry.mark(23) == [Win(1, 0, "terno")]
+    assert registry.mark(2) == []
+    assert registry.mark(34) == [Win(1, 0, "quaterna")]
+    assert registry.mark(45) == [Win(1, 0, "cinquina")]
+
+    wins = []
+    for number in (13, 24, 35, 46, 3, 14, 25, 36):
+        wins.append(registry.mark(number))
+    assert wins[-1] == [Win(1, 2, "quaterna")]
+    assert registry.mark(47) == [Win(1, 2, "cinquina"), Win(1, None, "tombola")]
+
+
+def test_unmark_takes_the_win_back():
+    registry = _registry()
+    registry.mark(1)
+    registry.mark(12)
+    registry.unmark(12)
+    # Back to one hit per row: another number of the row is an ambo again, not a terno
+    assert registry.mark(23) == [Win(1, 0, "ambo")]
+    registry.unmark(23)
+    assert registry.mark(12) == [Win(1, 0, "ambo"), Win(7, 0, "ambo")]
+
+
+def test_sync_matches_marking_call_by_call():
+    called = [1, 12, 4, 15, 51, 23, 90]
+    marked = _registry()
+    for number in called:
+        marked.mark(number)
+    synced = _registry()
+    synced.sync(called)
+
+    for number in (62, 34, 73):
+        assert synced.mark(number) == marked.mark(number)
+
+
+def test_cards_loaded_mid_game_count_the_calls_so_far():
+    game = TombolaGame("test")
+    game.add_numbers([1, 12, 50])
+    game.set_cards(_registry())
+    game.add_number(61)
+    assert game.last_wins == [Win(7, 0, "quaterna")]
+
+
+def test_check_card_reports_the_best_prize_and_missing_numbers():
+    called = bits_of([1, 12, 23, 2, 13])
+    check = check_card([bits_of(row) for row in CARD_A], called, serial=1)
+    assert check.prize == "terno"
+    assert [row.hits for row in check.rows] == [3, 2, 0]
+    assert [row.prize for row in check.rows] == ["terno", "ambo", None]
+    assert check.rows[0].missing == (34, 45)
+    assert len(check.missing) == 10
+
+    full = check_card([bits_of(row) for row in CARD_A], bits_of(sum(CARD_A, [])))
+    assert full.prize == "tombola" and full.missing == ()
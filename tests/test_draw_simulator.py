@@ -0,0 +1,35 @@
+import pytest
+
+pytest.importorskip("numpy")
+
+from src.tombola_manager.draw_simulator import generated_cards, simulate
+
+
+@pytest.fixture(scope="module")
+def cards():
+    return generated_cards(30, seed=1)
+
+
+def test_same_seed_same_result_with_any_number_of_workers(cards):
+    alone = simulate(cards, 1000, seed=7, workers=1, chunk_draws=300)
+    pooled = simulate(cards, 1000, seed=7, workers=2, chunk_draws=300)
+    assert alone.draws == pooled.draws == 1000
+    assert alone.summary() == pooled.summary()
+
+
+def test_other_seed_other_result(cards):
+    first = simulate(cards, 1000, seed=7, workers=1, chunk_draws=300)
+    other = simulate(cards, 1000, seed=8, workers=1, chunk_draws=300)
+    assert first.summary() != other.summary()
+
+
+def test_every_draw_ends_with_one_tombola(cards):
+    result = simulate(cards, 500, seed=3, workers=1)
+    assert result.calls["tombola"].sum() == 500
+    assert result.winners["tombola"][0] == 0
+    assert result.calls["tombola"][:15].sum() == 0
+
+
+def test_rejects_bad_cards():
+    with pytest.raises(ValueError):
+        simulate([[1, 2, 3]], 10)
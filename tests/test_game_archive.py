@@ -0,0 +1,99 @@
+import json
+import os
+
+import pytest
+
+from src.tombola_manager.game_archive import GameArchive, pack_game, unpack_game
+
+BOARD_GAME = {
+    "name": "sagra", "date": "2024-08-15 21:00:00", "state": "Terno", "last_number": 12,
+    "numbers": [3, 12, 90],
+    "history": {"base": [[], None, "Ambo"], "position": 4, "moves": [
+        ["add", 3, None, 3, 1723748400], ["add", 90, 3, 90, 1723748410], ["add", 12, 90, 12, 1723748405],
+        ["state", "Terno", "Ambo", "Terno", 1723748420]]},
+    "log": [[1723748400, "game_created"], [1723748401, "added_number", 3], [1723748399, "card_win", 7, 2, "ambo"]],
+}
+
+
+def _with(**changes):
+    document = dict(BOARD_GAME)
+    document.update(changes)
+    return document
+
+
+@pytest.mark.parametrize("document", [
+    BOARD_GAME,
+    # Text entries of old saves, mixed with structured ones and entries of no known shape
+    _with(log=["[20:00:00] Added number: 5", [1723748400, "added_number", 5], [None, "x"], 7, {"odd": True}, []]),
+    # Numbers that are not a board: out of range, repeated, unordered, not a list
+    _with(numbers=[0, 91, 5, 5]),
+    _with(numbers=[12, 3]),
+    _with(numbers="3,12"),
+    # Histories the packed layout does not expect
+    _with(history={"base": [[1, 2], None], "moves": [], "position": 0}),
+    _with(history={"base": [[], None, "Ambo"], "moves": [["add", 95, None, 95, 1], ["jump", 1, 2, 3, 4],
+                                                           ["add", 3, None, 3, 1.5], "bad"], "position": 2}),
+    _with(history=None),
+    # Keys the layout does not know, and missing ones
+    _with(seq=41, log_count=3, log_size=120, custom={"nested": [1, None, "é"]}),
+    {"name": "bare"},
+    # Floats, negative and large ints, booleans, non-ASCII text
+    _with(last_number=-3, state=2.5, date=None,
+          log=[[-5, "note", -1, 0.1, 1e300, 2 ** 70, True, False, None, "città"], [3, "x"]]),
+    _with(last_number=0.0, log="not a list"),
+])
+def test_pack_round_trip(document):
+    assert unpack_game(pack_game(document)) == document
+
+
+def _archive_two(path):
+    with GameArchive(path) as archive:
+        archive.append(_with(name="first"))
+        archive.append(_with(name="second", state="Cinquina"))
+
+
+def test_torn_last_record_is_cut_off(tmp_path):
+    path = str(tmp_path / "games.tmba")
+    with GameArchive(path) as archive:
+        archive.append(_with(name="first"))
+    size = os.path.getsize(path)
+    # Crash halfway through the second record, before its index line
+    with GameArchive(path) as archive:
+        archive.append(_with(name="second"))
+    with open(path, "rb+") as f:
+        f.truncate(size + 20)
+    with open(path + ".idx", "r+") as f:
+        first_line = f.readline()
+        f.truncate(len(first_line))
+
+    with GameArchive(path) as archive:
+        assert archive.names() == ["first"]
+        assert os.path.getsize(path) == size
+        archive.append(_with(name="third"))
+    with GameArchive(path) as archive:
+        assert archive.names() == ["first", "third"]
+        assert archive.read("third") == _with(name="third")
+
+
+@pytest.mark.parametrize("cut", [1, 5])
+def test_torn_index_line_is_rebuilt(tmp_path, cut):
+    path = str(tmp_path / "games.tmba")
+    _archive_two(path)
+    with open(path + ".idx", "rb+") as f:
+        f.truncate(os.path.getsize(path + ".idx") - cut)
+
+    with GameArchive(path) as archive:
+        assert archive.names() == ["first", "second"]
+        assert archive.read("second")["state"] == "Cinquina"
+    with open(path + ".idx") as f:
+        assert [json.loads(line)[0] for line in f] == ["first", "second"]
+
+
+def test_missing_index_is_rebuilt(tmp_path):
+    path = str(tmp_path / "games.tmba")
+    _archive_two(path)
+    os.remove(path + ".idx")
+
+    with GameArchive(path) as archive:
+        assert archive.names() == ["first", "second"]
+        assert archive.read("first") == _with(name="first")
@@ -0,0 +1,73 @@
+import os
+
+from src.tombola_manager.game_catalog import CATALOG_FILE, GameCatalog
+from src.tombola_manager.game_journal import GameJournal, snapshot_path
+from src.tombola_manager.tombola_game import TombolaGame
+
+from conftest import call
+
+
+def _save(directory, name, numbers=()):
+    game = TombolaGame(name)
+    journal = GameJournal(name, directory)
+    journal.record(game)
+    for number in numbers:
+        call(game, journal, number)
+    return game, journal
+
+
+def _reads(catalog, monkeypatch):
+    """Names of the games the catalog reads from disk"""
+    read = []
+    original = catalog._read_info
+    monkeypatch.setattr(catalog, "_read_info",
+                        lambda name, signature: read.append(name) or original(name, signature))
+    return read
+
+
+def test_new_changed_and_deleted_saves(games_dir, monkeypatch):
+    _save(games_dir, "a", [1])
+    game, journal = _save(games_dir, "b", [2, 3])
+    catalog = GameCatalog(games_dir)
+    catalog.refresh()
+    assert [info.name for info in catalog.games("name")] == ["a", "b"]
+
+    # Nothing changed: nothing read again, even by a new catalog using the index
+    catalog = GameCatalog(games_dir)
+    read = _reads(catalog, monkeypatch)
+    catalog.refresh()
+    assert read == []
+
+    call(game, journal, 4)
+    _save(games_dir, "c")
+    for suffix in (".json", ".log", ".journal"):
+        path = os.path.join(games_dir, "a" + suffix)
+        if os.path.exists(path):
+            os.remove(path)
+    catalog.refresh()
+    assert sorted(read) == ["b", "c"]
+    assert [info.name for info in catalog.games("name")] == ["b", "c"]
+    assert catalog.get("b").called == 3
+    assert "a" not in catalog
+
+
+def test_corrupt_catalog_file_is_rebuilt(games_dir):
+    _save(games_dir, "a", [1, 2])
+    GameCatalog(games_dir).refresh()
+    with open(os.path.join(games_dir, CATALOG_FILE), "w") as f:
+        f.write('{"version": 2, "games": {"a": [[1, 2')
+
+    catalog = GameCatalog(games_dir)
+    catalog.refresh()
+    assert catalog.get("a").called == 2
+    assert GameCatalog(games_dir).get("a").called == 2
+
+
+def test_unreadable_save_is_kept_out_of_the_list(games_dir):
+    _save(games_dir, "a", [1])
+    with open(snapshot_path("broken", games_dir), "w") as f:
+        f.write("{not json")
+    catalog = GameCatalog(games_dir)
+    catalog.refresh()
+    assert [info.name for info in catalog.games()] == ["a"]
+    assert "broken" in catalog
@@ -0,0 +1,45 @@
+import asyncio
+import json
+import os
+
+from src.tombola_manager.game_engine import GameEngine
+from src.tombola_manager.game_storage import JsonStorage
+
+
+def test_reopening_a_game_created_by_the_engine(games_dir):
+    async def run():
+        engine = GameEngine(JsonStorage(games_dir))
+        await asyncio.gather(*(engine.open_game(f"game{i}") for i in range(4)))
+        await engine.add_number("game1", 17)
+        await engine.close_game("game1")
+        return await engine.open_game("game1")
+
+    snapshot = asyncio.run(run())
+    assert snapshot["numbers"] == [17]
+    assert snapshot["last_number"] == 17
+
+
+def test_client_errors(games_dir):
+    os.makedirs(games_dir, exist_ok=True)
+    with open(os.path.join(games_dir, "broken.json"), "w") as f:
+        f.write("{not a save")
+
+    async def run():
+        engine = GameEngine(JsonStorage(games_dir))
+        server = await engine.serve("127.0.0.1", 0)
+        reader, writer = await asyncio.open_connection("127.0.0.1", server.sockets[0].getsockname()[1])
+        replies = []
+        for line in (b"not json", b"[1, 2]", b'{"cmd": "open", "game": "broken"}',
+                     b'{"cmd": "open", "game": "fine"}'):
+            writer.write(line + b"\n")
+            replies.append(json.loads(await reader.readline()))
+        writer.close()
+        server.close()
+        await server.wait_closed()
+        await engine.shutdown()
+        return replies
+
+    bad_json, not_object, broken, fine = asyncio.run(run())
+    assert bad_json == not_object == {"ok": False, "error": "expected a JSON object per line"}
+    assert broken["ok"] is False and broken["error"].startswith("Expecting")
+    assert fine["ok"] is True
@@ -0,0 +1,109 @@
+from src.tombola_manager.card_registry import CardRegistry, Win
+from src.tombola_manager.game_history import ADD, REMOVE, STATE
+from src.tombola_manager.game_journal import GameJournal
+from src.tombola_manager.tombola_game import TombolaGame
+
+from conftest import assert_same_game
+
+CARD = [[1, 12, 23, 34, 45], [2, 13, 24, 35, 46], [3, 14, 25, 36, 47]]
+
+
+def _board(game):
+    return list(game.numbers), game.last_number, game.state
+
+
+def _game():
+    game = TombolaGame("test")
+    cards = CardRegistry()
+    cards.add_card(CARD)
+    game.set_cards(cards)
+    return game
+
+
+def test_step_back_and_forward_over_every_kind_of_move():
+    game = _game()
+    game.add_number(1)
+    boards = [_board(game)]
+    game.add_number(12)
+    assert game.last_wins == [Win(1, 0, "ambo")]
+    boards.append(_board(game))
+    game.set_state("Terno")
+    boards.append(_board(game))
+    game.remove_number(12)
+    boards.append(_board(game))
+    assert boards[-1] == ([1], 1, "Terno")
+
+    for op, board in zip((REMOVE, STATE, ADD), reversed(boards[:-1])):
+        assert game.step_back().op == op
+        assert _board(game) == board
+    assert game.step_back().op == ADD
+    assert _board(game) == ([], None, "Ambo")
+    assert game.step_back() is None
+
+    for board in boards:
+        game.step_forward()
+        assert _board(game) == board
+        if board == boards[1]:
+            # The hit came back with the number: another one of the row is a terno
+            assert game.cards.mark(23) == [Win(1, 0, "terno")]
+            game.cards.unmark(23)
+    assert game.step_forward() is None
+
+
+def test_stepping_back_takes_the_card_hits_back():
+    game = _game()
+    game.add_numbers([1, 12])
+    game.step_back()
+    game.step_back()
+    game.add_number(23)
+    assert game.last_wins == []
+    game.add_number(34)
+    assert game.last_wins == [Win(1, 0, "ambo")]
+
+
+def test_a_new_move_drops_the_redo_branch():
+    game = _game()
+    for number in (5, 6, 7):
+        game.add_number(number)
+    game.step_back()
+    game.step_back()
+    game.add_number(8)
+
+    assert [move.value for move in game.history.moves] == [5, 8]
+    assert game.step_forward() is None
+    assert _board(game) == ([5, 8], 8, "Ambo")
+
+
+def test_setting_the_same_state_is_not_a_move():
+    game = _game()
+    game.add_number(5)
+    assert not game.set_state("Ambo")
+    assert len(game.history) == 1
+    assert game.set_state("Terno")
+    assert game.step_back().op == STATE
+    assert game.step_back().value == 5
+
+
+def test_history_survives_a_journal_reload(games_dir):
+    game = TombolaGame("test")
+    journal = GameJournal("test", games_dir, compact_every=10 ** 9)
+    journal.record(game)
+    for number in (5, 6, 7):
+        game.add_number(number)
+        journal.record(game)
+    game.step_back()
+    journal.record(game)
+    game.step_back()
+    game.set_state("Terno")
+    journal.record(game)
+
+    loaded = GameJournal("test", games_dir).load()
+    assert_same_game(loaded, game)
+    assert loaded.step_back().op == STATE
+    assert _board(loaded) == ([5], 5, "Ambo")
+    assert loaded.step_back().value == 5
+    assert _board(loaded) == ([], None, "Ambo")
+    loaded.step_forward()
+    loaded.step_forward()
+    assert _board(loaded) == ([5], 5, "Terno")
+    assert loaded.step_forward() is None
@@ -0,0 +1,192 @@
+import json
+import os
+import sys
+import threading
+
+from src.tombola_manager import game_journal
+from src.tombola_manager.game_journal import GameJournal, journal_path, log_path, snapshot_path
+from src.tombola_manager.tombola_game import TombolaGame
+
+from conftest import assert_same_game, call, play_game
+
+
+def _saved_game(games_dir, numbers):
+    """A game saved once and then call by call, so the calls after the first are in the journal"""
+    game = TombolaGame("test")
+    journal = GameJournal("test", games_dir)
+    journal.record(game)
+    for number in numbers:
+        call(game, journal, number)
+    return game
+
+
+def test_torn_journal_tail_does_not_swallow_later_saves(games_dir):
+    _saved_game(games_dir, [5, 7])
+    path = journal_path("test", games_dir)
+    with open(path, "rb+") as f:
+        # Crash halfway through the record of the call of 7
+        f.truncate(f.read().index(b'"n":7') + 3)
+
+    journal = GameJournal("test", games_dir)
+    game = journal.load()
+    assert list(game.numbers) == [5]
+    call(game, journal, 9)
+    call(game, journal, 10)
+
+    game = GameJournal("test", games_dir).load()
+    assert list(game.numbers) == [5, 9, 10]
+    assert game.last_number == 10
+
+
+def test_journal_replay_rebuilds_the_game(games_dir):
+    game = TombolaGame("test")
+    journal = GameJournal("test", games_dir, compact_every=10 ** 9)
+    journal.record(game)
+    play_game(game, journal)
+    assert list(game.numbers) == [3, 12, 40, 61]
+    assert game.last_number == 61
+
+    assert_same_game(GameJournal("test", games_dir).load(), game)
+
+
+def test_compaction_keeps_the_game(games_dir):
+    game = TombolaGame("test")
+    journal = GameJournal("test", games_dir, compact_every=3)
+    journal.record(game)
+    play_game(game, journal)
+
+    assert_same_game(GameJournal("test", games_dir).load(), game)
+    journal.compact(game)
+    assert os.path.getsize(journal_path("test", games_dir)) == 0
+    assert_same_game(GameJournal("test", games_dir).load(), game)
+
+
+def test_last_number_after_removals(games_dir):
+    game = _saved_game(games_dir, [10, 20, 30])
+    journal = GameJournal("test", games_dir)
+    game = journal.load()
+    game.remove_number(30)
+    journal.record(game)
+    assert GameJournal("test", games_dir).load().last_number == 20
+
+    game.remove_number(10)
+    game.add_numbers([50, 45])
+    journal.record(game)
+    loaded = GameJournal("test", games_dir).load()
+    assert list(loaded.numbers) == [20, 45, 50]
+    assert loaded.last_number == 45
+
+    game.remove_number(45)
+    game.remove_number(50)
+    journal.record(game)
+    assert GameJournal("test", games_dir).load().last_number == 20
+
+
+def test_saves_continue_after_a_reload(games_dir):
+    _saved_game(games_dir, [1, 2])
+    journal = GameJournal("test", games_dir)
+    loaded = journal.load()
+    call(loaded, journal, 3)
+    assert_same_game(GameJournal("test", games_dir).load(), loaded)
+    assert [entry.args for entry in loaded.log] == [(1,), (2,), (3,)]
+
+
+def test_torn_log_line_is_cut_off(games_dir):
+    _saved_game(games_dir, [5, 7, 9])
+    path = log_path("test", games_dir)
+    with open(path, "rb+") as f:
+        f.truncate(os.path.getsize(path) - 4)
+
+    journal = GameJournal("test", games_dir)
+    game = journal.load()
+    assert [entry.args for entry in game.log] == [(5,), (7,)]
+    call(game, journal, 11)
+    game = GameJournal("test", games_dir).load()
+    assert list(game.numbers) == [5, 7, 9, 11]
+    assert [entry.args for entry in game.log] == [(5,), (7,), (11,)]
+
+
+def test_log_tail_and_older_pages(games_dir):
+    game = _saved_game(games_dir, range(1, 21))
+    journal = GameJournal("test", games_dir)
+    loaded = journal.load(log_tail=5)
+    assert loaded.log_base == 15
+    assert loaded.log == game.log[15:]
+    assert journal.load_log(0, 15) == game.log[:15]
+    assert journal.load_log(10, 12) == game.log[10:12]
+
+
+def test_opening_scans_only_the_log_appended_since_the_header(games_dir, monkeypatch):
+    game = TombolaGame("test")
+    journal = GameJournal("test", games_dir)
+    for number in range(1, 31):
+        game.log_action('added_number', number)
+    journal.compact(game)
+    for number in range(31, 36):
+        call(game, journal, number)
+
+    starts = []
+    scan_log = game_journal._scan_log
+    monkeypatch.setattr(game_journal, "_scan_log",
+                        lambda path, start=0: starts.append(start) or scan_log(path, start))
+    loaded = GameJournal("test", games_dir).load(log_tail=8)
+    with open(snapshot_path("test", games_dir)) as f:
+        header = json.load(f)
+    assert header["log_count"] == 30
+    assert starts == [header["log_size"]]
+    assert loaded.log_base == 27
+    assert loaded.log == game.log[27:]
+
+
+def test_older_pages_read_backwards_match_the_log(games_dir):
+    game = _saved_game(games_dir, range(1, 50))
+    journal = GameJournal("test", games_dir)
+    loaded = journal.load(log_tail=10)
+    pages = []
+    end = loaded.log_base
+    while end > 0:
+        start = max(0, end - 7)
+        pages[:0] = journal.load_log(start, end)
+        end = start
+    assert pages + loaded.log == game.log
+
+
+def test_older_pages_while_saving_on_another_thread(games_dir):
+    game = _saved_game(games_dir, range(1, 61))
+    journal = GameJournal("test", games_dir)
+    loaded = journal.load(log_tail=5)
+    expected = list(game.log)
+    # Switch threads as often as possible, so the saves interleave with the reads
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    errors = []
+
+    def save():
+        # Each compaction records the offset of a new log end
+        try:
+            for i in range(300):
+                loaded.log_action('added_number', i)
+                journal.compact(loaded)
+        except Exception as e:
+            errors.append(e)
+
+    saver = threading.Thread(target=save)
+    saver.start()
+    try:
+        while saver.is_alive():
+            for start in range(0, loaded.log_base, 9):
+                end = min(start + 9, 55)
+                assert journal.load_log(start, end) == expected[start:end]
+    finally:
+        saver.join()
+        sys.setswitchinterval(interval)
+    assert not errors
+
+
+def test_log_replaced_behind_the_header_is_scanned_again(games_dir):
+    game = _saved_game(games_dir, range(1, 20))
+    with open(log_path("test", games_dir), "w") as f:
+        f.write('[1,"added_number",1]\n')
+    loaded = GameJournal("test", games_dir).load(log_tail=5)
+    assert loaded.log_base == 0
+    assert [entry.args for entry in loaded.log] == [(1,)]
@@ -0,0 +1,165 @@
+import pytest
+
+from src.tombola_manager.card_registry import CardRegistry
+from src.tombola_manager.game_journal import GameJournal
+from src.tombola_manager.game_service import ERROR, WARNING, GameService, parse_claims, parse_numbers
+from src.tombola_manager.tombola_game import TombolaGame
+
+CARD_A = [[1, 12, 23, 34, 45], [2, 13, 24, 35, 46], [3, 14, 25, 36, 47]]
+CARD_B = [[1, 12, 50, 61, 72], [4, 15, 51, 62, 73], [5, 16, 52, 63, 74]]
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("17", [17]),
+    ("5 17 23", [5, 17, 23]),
+    ("5,17;23", [5, 17, 23]),
+    (" 5 ,  17 ; ", [5, 17]),
+    ("40-44", [40, 41, 42, 43, 44]),
+    ("40 - 44", [40, 41, 42, 43, 44]),
+    ("3, 40 -44 90", [3, 40, 41, 42, 43, 44, 90]),
+    ("7-7", [7]),
+    ("1-90", list(range(1, 91))),
+    ("8 5 8", [8, 5, 8]),
+    ("0 95", [0, 95]),
+])
+def test_parse_numbers(text, expected):
+    assert parse_numbers(text) == expected
+
+
+@pytest.mark.parametrize("text", ["", "  ", ",;", "five", "5 x", "44-40", "0-90", "1-", "-", "4-5-6", None])
+def test_parse_numbers_rejects(text):
+    with pytest.raises(ValueError):
+        parse_numbers(text)
+
+
+@pytest.fixture
+def service(games_dir):
+    service = GameService(TombolaGame("test"), GameJournal("test", games_dir))
+    service.add_number("17")
+    yield service
+    service.close()
+
+
+def test_add_numbers_calls_the_whole_batch(service):
+    result = service.add_numbers("40 - 42, 5")
+    assert result.ok
+    assert result.numbers == [40, 41, 42, 5]
+    assert list(service.game.numbers) == [5, 17, 40, 41, 42]
+    assert service.game.last_number == 5
+
+    assert service.flush(timeout=5)
+    assert list(GameJournal("test", service.journal.directory).load().numbers) == [5, 17, 40, 41, 42]
+
+
+@pytest.mark.parametrize("text, message_key, rejected", [
+    ("10 17 20", 'batch_numbers_exist', [17]),
+    ("10 20 10", 'batch_numbers_exist', [10]),
+    ("10 20 95", 'batch_invalid', [95]),
+    ("85-91", 'batch_invalid', [91]),
+])
+def test_add_numbers_calls_nothing_if_a_number_is_rejected(service, text, message_key, rejected):
+    moves = list(service.game.history.moves)
+    result = service.add_numbers(text)
+    assert not result.ok
+    assert (result.severity, result.message_key, result.rejected) == (WARNING, message_key, rejected)
+    assert list(service.game.numbers) == [17]
+    assert service.game.last_number == 17
+    assert list(service.game.history.moves) == moves
+
+    assert service.flush(timeout=5)
+    assert list(GameJournal("test", service.journal.directory).load().numbers) == [17]
+
+
+def test_add_numbers_bad_input(service):
+    result = service.add_numbers("10 twenty")
+    assert not result.ok and result.message_key == 'enter_valid_batch'
+    assert list(service.game.numbers) == [17]
+
+
+def _line(card):
+    return " ".join(str(number) for row in card for number in row)
+
+
+def test_parse_claims():
+    assert parse_claims("7 9\n\n12, 30") == [7, 9, 12, 30]
+    assert parse_claims(f"7\n{_line(CARD_A)}") == [7, tuple(tuple(row) for row in CARD_A)]
+
+
+@pytest.mark.parametrize("text, bad_line", [
+    ("7\n 9 x ", "9 x"),
+    ("7\n#12", "#12"),
+    ("1 12 23 34 45 2 13 24 35 46 3 14 25 36 95", "1 12 23 34 45 2 13 24 35 46 3 14 25 36 95"),
+    ("1 12 23 34 45 2 13 24 35 46 3 14 25 36 1", "1 12 23 34 45 2 13 24 35 46 3 14 25 36 1"),
+    ("", "No claims"),
+    (" \n ", "No claims"),
+])
+def test_parse_claims_names_the_bad_line(text, bad_line):
+    with pytest.raises(ValueError) as error:
+        parse_claims(text)
+    assert str(error.value) == bad_line
+
+
+@pytest.fixture
+def card_service(games_dir):
+    game = TombolaGame("test")
+    cards = CardRegistry()
+    cards.add_card(CARD_A, serial=1)
+    cards.add_card(CARD_B, serial=7)
+    game.set_cards(cards)
+    service = GameService(game, GameJournal("test", games_dir))
+    yield service
+    service.close()
+
+
+def _call(service, *numbers):
+    for number in numbers:
+        assert service.add_number(str(number)).ok
+
+
+def test_check_claims_ambo(card_service):
+    _call(card_service, 1, 12, 2)
+    result = card_service.check_claims(f"1 7\n{_line(CARD_B)}")
+    assert result.ok
+    assert [check.serial for check in result.checks] == [1, 7, None]
+    assert [check.prize for check in result.checks] == ["ambo", "ambo", "ambo"]
+    assert result.valid == [True, True, True]
+    assert result.checks[0].rows[0].hits == 2
+    assert result.checks[0].rows[1].hits == 1
+    assert card_service.game.log[-1].code == 'claims_checked'
+    assert card_service.game.log[-1].args == (3, 3)
+
+
+def test_check_claims_cinquina(card_service):
+    _call(card_service, 1, 12, 23, 34, 45, 50)
+    card_service.set_state("Cinquina")
+    result = card_service.check_claims("1 7")
+    assert [check.prize for check in result.checks] == ["cinquina", "terno"]
+    assert result.valid == [True, False]
+    assert list(result.checks[1].rows[0].missing) == [61, 72]
+
+
+def test_check_claims_tombola(card_service):
+    _call(card_service, *(number for row in CARD_A for number in row))
+    card_service.set_state("Tombola")
+    result = card_service.check_claims(f"1\n{_line(CARD_B)}")
+    assert [check.prize for check in result.checks] == ["tombola", "ambo"]
+    assert result.valid == [True, False]
+    assert result.checks[0].missing == ()
+    assert len(result.checks[1].missing) == 13
+
+
+def test_check_claims_without_record(card_service):
+    _call(card_service, 1)
+    entries = len(card_service.game.log)
+    assert card_service.check_claims("1", record=False).ok
+    assert len(card_service.game.log) == entries
+
+
+def test_check_claims_rejected(card_service):
+    result = card_service.check_claims("1\n7 seven")
+    assert (result.ok, result.severity, result.message_key, result.rejected) == \
+        (False, ERROR, 'enter_valid_claims', ["7 seven"])
+    result = card_service.check_claims("1 99 7 100")
+    assert (result.ok, result.severity, result.message_key, result.rejected) == \
+        (False, WARNING, 'claims_unknown_serials', [99, 100])
+    assert result.checks == []
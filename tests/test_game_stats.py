@@ -0,0 +1,89 @@
+import json
+import os
+from datetime import datetime
+
+import pytest
+
+from src.tombola_manager import game_stats
+from src.tombola_manager.game_journal import GameJournal
+from src.tombola_manager.game_stats import ArchiveStats, summarize_game
+
+
+def _write_game(directory, name, calls, numbers, state="Terno", extra_log=()):
+    """A save in the header layout whose log has a call entry per (timestamp, number)"""
+    os.makedirs(directory, exist_ok=True)
+    with open(os.path.join(directory, f"{name}.json"), "w") as f:
+        json.dump({"name": name, "numbers": numbers, "date": f"2024-01-0{len(numbers) % 9 + 1} 20:00:00",
+                   "last_number": numbers[-1] if numbers else None, "state": state}, f)
+    with open(os.path.join(directory, f"{name}.log"), "w") as f:
+        f.write(json.dumps([0, "game_created"]) + "\n")
+        for timestamp, number in calls:
+            f.write(json.dumps([timestamp, "added_number", number]) + "\n")
+        for entry in extra_log:
+            f.write(json.dumps(entry) + "\n")
+
+
+def test_frequencies_intervals_and_cache(games_dir):
+    # Gaps of 4 s, 12 s and 700 s: the last one is a pause, left out of the playing time
+    _write_game(games_dir, "a", [(1000, 7), (1004, 8), (1016, 90), (1716, 1)], [1, 7, 8, 90])
+    _write_game(games_dir, "b", [(50, 7), (80, 9)], [7, 9], state="Ambo")
+    stats = ArchiveStats(games_dir)
+    assert stats.refresh(workers=1) == 2
+
+    totals = stats.totals()
+    assert totals["games"] == 2 and totals["calls"] == 6
+    called = {number: count for number, count in totals["numbers"].items() if count}
+    assert called == {1: 1, 7: 2, 8: 1, 9: 1, 90: 1}
+    assert totals["states"] == {"Terno": 1, "Ambo": 1}
+    assert totals["intervals"]["<=5s"] == 1
+    assert totals["intervals"]["<=15s"] == 1
+    assert totals["intervals"]["<=30s"] == 1
+    assert totals["intervals"][">600s"] == 1
+    assert totals["mean_interval_s"] == round((4 + 12 + 30) / 3, 1)
+    assert summarize_game("a", games_dir).duration == 16
+
+    cached = ArchiveStats(games_dir)
+    assert cached.refresh(workers=1) == 0
+    assert cached.totals() == totals
+
+
+def test_odd_log_entries_do_not_stop_the_run(games_dir):
+    _write_game(games_dir, "odd", [(10, 3)], [3], extra_log=[["added_number"], "old text entry", []])
+    _write_game(games_dir, "fine", [(10, 4), (15, 5)], [4, 5])
+    stats = ArchiveStats(games_dir)
+    stats.refresh(workers=1)
+    assert stats.totals()["games"] == 2
+    assert summarize_game("odd", games_dir).calls == 1
+
+
+def _write_baseline_game(directory, name):
+    """A single-file save as the first versions wrote it, with a text log in English and Italian"""
+    os.makedirs(directory, exist_ok=True)
+    with open(os.path.join(directory, f"{name}.json"), "w") as f:
+        json.dump({"name": name, "numbers": [40, 17, 5], "date": "2024-12-24 23:50:00",
+                   "log": ["[23:55:00] Added number: 5", "[23:55:08] Aggiunto numero: 17",
+                           "[23:56:00] Number 17 already exists", "[00:01:08] Added number: 40"],
+                   "last_number": 40, "state": "Ambo"}, f)
+
+
+@pytest.mark.parametrize("stream", [False, True])
+def test_text_log_of_baseline_saves(games_dir, monkeypatch, stream):
+    if stream:
+        monkeypatch.setattr(game_stats, "STREAM_SIZE", 0)
+    _write_baseline_game(games_dir, "old")
+    summary = summarize_game("old", games_dir)
+    assert summary.calls == 3
+    # The last call is past midnight
+    assert summary.started == int(datetime(2024, 12, 24, 23, 55).timestamp())
+    assert summary.ended == int(datetime(2024, 12, 25, 0, 1, 8).timestamp())
+    assert summary.duration == 8 + 360
+    assert summary.intervals[:4] == [0, 1, 0, 0]
+    assert summary.intervals[-2] == 1
+
+
+def test_text_log_of_upgraded_saves(games_dir):
+    _write_baseline_game(games_dir, "old")
+    expected = summarize_game("old", games_dir)
+    GameJournal("old", games_dir).upgrade()
+    assert os.path.exists(os.path.join(games_dir, "old.log"))
+    assert summarize_game("old", games_dir) == expected
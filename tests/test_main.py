@@ -0,0 +1,29 @@
+import sys
+
+import main
+from src.tombola_manager import main_window
+from src.tombola_manager.diagnostics import PROFILE_ENV, STARTUP_TRACE_ENV, Diagnostics
+
+
+class _StartScreen:
+    """Stands in for the start screen: no window, and run returns at once"""
+
+    def __init__(self):
+        self.window = None
+
+    def run(self):
+        pass
+
+
+def test_startup_timings_reach_the_diagnostics(monkeypatch):
+    monkeypatch.delenv(PROFILE_ENV, raising=False)
+    monkeypatch.delenv(STARTUP_TRACE_ENV, raising=False)
+    monkeypatch.setattr(main_window, "MainWindow", _StartScreen)
+    counts = {name: histogram["count"] for name, histogram in Diagnostics().snapshot()["timers"].items()}
+
+    main.main([])
+    timers = Diagnostics().snapshot()["timers"]
+    for stage in ("startup.import", "startup.main_window"):
+        assert timers[stage]["count"] == counts.get(stage, 0) + 1
+    # One copy of the package, the one the windows import
+    assert not any(name == "tombola_manager" or name.startswith("tombola_manager.") for name in sys.modules)
@@ -0,0 +1,56 @@
+import json
+
+import pytest
+
+from src.tombola_manager.number_set import NumberSet, bits_of
+
+
+def test_add_remove_contains():
+    numbers = NumberSet()
+    numbers.add(42)
+    numbers.add(7)
+    assert 42 in numbers and 7 in numbers and 8 not in numbers
+    assert len(numbers) == 2
+    numbers.remove(42)
+    assert 42 not in numbers
+    with pytest.raises(KeyError):
+        numbers.remove(42)
+    numbers.discard(42)
+    assert numbers == {7}
+
+
+def test_bounds():
+    numbers = NumberSet([1, 90])
+    assert 1 in numbers and 90 in numbers
+    assert list(numbers) == [1, 90]
+    for outside in (0, 91, -1):
+        assert outside not in numbers
+        with pytest.raises(ValueError):
+            numbers.add(outside)
+    with pytest.raises(ValueError):
+        NumberSet([91])
+    assert len(NumberSet(range(1, 91))) == 90
+    assert list(NumberSet([1, 90]).complement()) == list(range(2, 90))
+
+
+def test_iteration_is_ascending_whatever_the_order_added():
+    numbers = NumberSet()
+    for number in (90, 3, 45, 1, 12):
+        numbers.add(number)
+    assert list(numbers) == [1, 3, 12, 45, 90]
+
+
+def test_set_operations_and_copies():
+    a = NumberSet([1, 2, 3])
+    b = a.copy()
+    b.add(4)
+    assert list(a) == [1, 2, 3]
+    assert list(b - a) == [4]
+    assert list(a | [80]) == [1, 2, 3, 80]
+    assert list(b & [2, 4, 9]) == [2, 4]
+    assert NumberSet.from_bits(bits_of([5, 6])) == NumberSet([6, 5])
+
+
+def test_json_round_trip():
+    numbers = NumberSet([90, 1, 33, 47])
+    assert NumberSet(json.loads(json.dumps(list(numbers)))) == numbers
@@ -0,0 +1,32 @@
+from src.tombola_manager.game_journal import GameJournal
+from src.tombola_manager.game_log import LogEntry
+from src.tombola_manager.game_service import GameService
+from src.tombola_manager.save_writer import SaveWriter
+from src.tombola_manager.tombola_game import TombolaGame
+
+
+def test_snapshot_keeps_its_log_while_the_game_goes_on():
+    game = TombolaGame("test")
+    for number in (1, 2, 3):
+        game.log_action('added_number', number)
+    snapshot = game.snapshot()
+    game.log_action('added_number', 4)
+    # Scrolling back to an older entry that was still on disk
+    game.log_base = 1
+    game.restore_log([LogEntry.now('game_created')])
+
+    assert len(snapshot.log) == 3
+    assert [entry.args for entry in snapshot.log] == [(1,), (2,), (3,)]
+    assert [entry.args for entry in snapshot.log[1:]] == [(2,), (3,)]
+    assert snapshot.log[-1].args == (3,)
+
+
+def test_closed_game_status_is_forgotten(games_dir):
+    writer = SaveWriter()
+    service = GameService(TombolaGame("test"), GameJournal("test", games_dir), writer)
+    service.add_number("7")
+    service.close()
+    assert service.flush(timeout=5)
+
+    assert service.journal not in writer._statuses
+    assert GameJournal("test", games_dir).load().last_number == 7
@@ -0,0 +1,90 @@
+import os
+
+from src.tombola_manager.sqlite_storage import GAME_SIZE, SqliteStorage
+from src.tombola_manager.tombola_game import TombolaGame
+
+from conftest import assert_same_game, call, play_game
+
+
+def _storage(games_dir):
+    return SqliteStorage(os.path.join(games_dir, "test.db"), migrate_from=None)
+
+
+def test_filter_takes_wildcards_literally(games_dir):
+    storage = _storage(games_dir)
+    for name in ("sagra", "sagra_2024", "100% fun"):
+        storage.journal(name).record(TombolaGame(name))
+
+    assert [info.name for info in storage.games("name", text_filter="_")] == ["sagra_2024"]
+    assert [info.name for info in storage.games("name", text_filter="%")] == ["100% fun"]
+    assert [info.name for info in storage.games("name", text_filter="SAGRA")] == ["sagra", "sagra_2024"]
+
+
+def test_size_follows_the_saves(games_dir):
+    storage = _storage(games_dir)
+    game = TombolaGame("test")
+    journal = storage.journal("test")
+    journal.record(game)
+    for number in (4, 8, 15, 16):
+        game.add_number(number)
+        game.log_action('added_number', number)
+        journal.record(game)
+    game.remove_number(16)
+    game.step_back()
+    game.add_number(42)
+    journal.record(game)
+
+    recounted = storage.connection.execute(f"SELECT {GAME_SIZE} FROM games WHERE name = 'test'").fetchone()[0]
+    assert storage.get("test").size == recounted > 0
+
+
+def test_round_trip(games_dir):
+    storage = _storage(games_dir)
+    game = TombolaGame("test")
+    journal = storage.journal("test")
+    journal.record(game)
+    play_game(game, journal)
+
+    assert_same_game(_storage(games_dir).journal("test").load(), game)
+
+
+def test_log_tail_and_saving_after_it(games_dir):
+    storage = _storage(games_dir)
+    game = TombolaGame("test")
+    journal = storage.journal("test")
+    for number in range(1, 21):
+        call(game, journal, number)
+
+    journal = _storage(games_dir).journal("test")
+    loaded = journal.load(log_tail=5)
+    assert loaded.log_base == 15
+    assert loaded.log == game.log[15:]
+    assert journal.load_log(0, 15) == game.log[:15]
+
+    call(loaded, journal, 21)
+    reloaded = _storage(games_dir).journal("test").load()
+    assert [entry.args for entry in reloaded.log] == [(number,) for number in range(1, 22)]
+    assert list(reloaded.numbers) == list(range(1, 22))
+
+
+def test_history_started_again_on_load_is_saved(games_dir):
+    storage = _storage(games_dir)
+    game = TombolaGame("test")
+    journal = storage.journal("test")
+    for number in (4, 8):
+        call(game, journal, number)
+    # A history base that does not lead to the board, as left by an older version
+    storage.connection.execute("UPDATE games SET history_base = '[[5], 5, \"Ambo\"]' WHERE name = 'test'")
+
+    journal = _storage(games_dir).journal("test")
+    loaded = journal.load()
+    assert len(loaded.history) == 0
+    call(loaded, journal, 15)
+
+    reloaded = _storage(games_dir).journal("test").load()
+    assert_same_game(reloaded, loaded)
+    assert [move.value for move in reloaded.history.moves] == [15]
+    assert reloaded.step_back().value == 15
+    assert list(reloaded.numbers) == [4, 8]
+    recounted = storage.connection.execute(f"SELECT {GAME_SIZE} FROM games WHERE name = 'test'").fetchone()[0]
+    assert storage.get("test").size == recounted
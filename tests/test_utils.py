@@ -0,0 +1,27 @@
+import pytest
+
+from src.tombola_manager.utils import (BROADCAST_PORT_ENV, DEFAULT_LOG_WINDOW, LOG_WINDOW_ENV, broadcast_port,
+                                      log_window)
+
+
+@pytest.mark.parametrize("value, expected", [
+    (None, DEFAULT_LOG_WINDOW), ("200", 200), ("lots", DEFAULT_LOG_WINDOW), ("", DEFAULT_LOG_WINDOW),
+    ("0", 1), ("-5", 1),
+])
+def test_log_window(monkeypatch, value, expected):
+    if value is None:
+        monkeypatch.delenv(LOG_WINDOW_ENV, raising=False)
+    else:
+        monkeypatch.setenv(LOG_WINDOW_ENV, value)
+    assert log_window() == expected
+
+
+@pytest.mark.parametrize("value, expected", [
+    (None, None), ("", None), ("8090", 8090), ("0", 0), ("port", None), ("70000", None), ("-1", None),
+])
+def test_broadcast_port(monkeypatch, value, expected):
+    if value is None:
+        monkeypatch.delenv(BROADCAST_PORT_ENV, raising=False)
+    else:
+        monkeypatch.setenv(BROADCAST_PORT_ENV, value)
+    assert broadcast_port() == expected